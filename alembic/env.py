@@ -33,7 +33,9 @@ if config.config_file_name is not None:
 from app.core.database import Base
 from app.models import (  # noqa: F401
     User, Address, Category, Product, ProductImage,
-    Bid, Favorite, Order, Payment
+    Bid, Favorite, Order, Payment,
+    ProductFavoriteStats, UserBidStats, RollupState,
+    RefreshToken, ProxyBid,
 )
 
 target_metadata = Base.metadata
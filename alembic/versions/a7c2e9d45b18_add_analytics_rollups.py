@@ -0,0 +1,68 @@
+"""add analytics rollups
+
+Revision ID: a7c2e9d45b18
+Revises: f2b7d4c81a06
+Create Date: 2026-10-17 15:31:08.274415
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c2e9d45b18'
+down_revision: Union[str, None] = 'f2b7d4c81a06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_favorite_stats',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('favorite_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id')
+    )
+    op.create_index('ix_product_favorite_stats_count', 'product_favorite_stats', ['favorite_count', 'product_id'], unique=False)
+    op.create_table('user_bid_stats',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('bid_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_index('ix_user_bid_stats_count', 'user_bid_stats', ['bid_count', 'user_id'], unique=False)
+    op.create_table('rollup_state',
+    sa.Column('name', sa.String(length=64), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Backfill from the source tables
+    op.execute(
+        """
+        INSERT INTO product_favorite_stats (product_id, favorite_count)
+        SELECT product_id, COUNT(*) FROM favorites GROUP BY product_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO user_bid_stats (user_id, bid_count)
+        SELECT bidder_id, COUNT(*) FROM bids GROUP BY bidder_id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO rollup_state (name, refreshed_at)
+        VALUES ('product_favorite_stats', CURRENT_TIMESTAMP), ('user_bid_stats', CURRENT_TIMESTAMP)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rollup_state')
+    op.drop_index('ix_user_bid_stats_count', table_name='user_bid_stats')
+    op.drop_table('user_bid_stats')
+    op.drop_index('ix_product_favorite_stats_count', table_name='product_favorite_stats')
+    op.drop_table('product_favorite_stats')
@@ -0,0 +1,29 @@
+"""add timeseries indexes
+
+Revision ID: b3e81f6d2c94
+Revises: a7c2e9d45b18
+Create Date: 2026-10-17 15:31:08.214377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e81f6d2c94'
+down_revision: Union[str, None] = 'a7c2e9d45b18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_bids_product_created', 'bids', ['product_id', 'created_at'], unique=False)
+    op.create_index('ix_bids_created', 'bids', ['created_at'], unique=False)
+    op.create_index('ix_orders_created', 'orders', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_created', table_name='orders')
+    op.drop_index('ix_bids_created', table_name='bids')
+    op.drop_index('ix_bids_product_created', table_name='bids')
@@ -0,0 +1,33 @@
+"""add pagination indexes
+
+Revision ID: c3d91f2a7e10
+Revises: ebb88ff1e32f
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d91f2a7e10'
+down_revision: Union[str, None] = 'ebb88ff1e32f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_status_created', 'products', ['status', 'created_at'], unique=False)
+    op.create_index('ix_products_seller_created', 'products', ['seller_id', 'created_at'], unique=False)
+    op.create_index('ix_bids_bidder_created', 'bids', ['bidder_id', 'created_at'], unique=False)
+    op.create_index('ix_orders_buyer_created', 'orders', ['buyer_id', 'created_at'], unique=False)
+    op.create_index('ix_orders_seller_created', 'orders', ['seller_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_seller_created', table_name='orders')
+    op.drop_index('ix_orders_buyer_created', table_name='orders')
+    op.drop_index('ix_bids_bidder_created', table_name='bids')
+    op.drop_index('ix_products_seller_created', table_name='products')
+    op.drop_index('ix_products_status_created', table_name='products')
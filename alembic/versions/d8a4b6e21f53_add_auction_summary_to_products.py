@@ -0,0 +1,62 @@
+"""add auction summary columns to products
+
+Revision ID: d8a4b6e21f53
+Revises: c3d91f2a7e10
+Create Date: 2026-10-17 11:05:48.771920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a4b6e21f53'
+down_revision: Union[str, None] = 'c3d91f2a7e10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_STATUSES = "('PENDING', 'OUTBID', 'ACCEPTED')"
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('current_price', sa.Numeric(precision=12, scale=2), nullable=True))
+    op.add_column('products', sa.Column('bid_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('products', sa.Column('highest_bid_id', sa.Integer(), nullable=True))
+    op.add_column('products', sa.Column('last_bid_at', sa.DateTime(), nullable=True))
+
+    # Backfill from the bids table
+    op.execute(
+        """
+        UPDATE products SET
+            bid_count = (SELECT COUNT(*) FROM bids WHERE bids.product_id = products.id),
+            last_bid_at = (SELECT MAX(bids.created_at) FROM bids WHERE bids.product_id = products.id),
+            highest_bid_id = (
+                SELECT bids.id FROM bids
+                WHERE bids.product_id = products.id AND bids.status IN """ + LIVE_STATUSES + """
+                ORDER BY bids.amount DESC, bids.id ASC
+                LIMIT 1
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE products SET highest_bid_id = accepted_bid_id
+        WHERE accepted_bid_id IS NOT NULL
+        """
+    )
+    op.execute(
+        """
+        UPDATE products SET
+            current_price = (SELECT bids.amount FROM bids WHERE bids.id = products.highest_bid_id)
+        WHERE highest_bid_id IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'last_bid_at')
+    op.drop_column('products', 'highest_bid_id')
+    op.drop_column('products', 'bid_count')
+    op.drop_column('products', 'current_price')
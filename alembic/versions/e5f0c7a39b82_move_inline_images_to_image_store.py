@@ -0,0 +1,87 @@
+"""move inline base64 images to the image store
+
+Revision ID: e5f0c7a39b82
+Revises: d8a4b6e21f53
+Create Date: 2026-10-17 12:20:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+from app.core.image_store import InvalidImageError, image_store
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f0c7a39b82'
+down_revision: Union[str, None] = 'd8a4b6e21f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+
+def extract_column(table: str, column: str, invalid_sql: str) -> None:
+    """Write every data URL in table.column to the image store and replace it with its URL."""
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, {column} FROM {table} "
+                f"WHERE id > :last_id AND {column} LIKE 'data:%' ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).fetchall()
+        if not rows:
+            return
+
+        for row_id, value in rows:
+            try:
+                url = image_store.put_data_url(value)
+            except InvalidImageError:
+                print(f"  {table}.{column} id={row_id}: unreadable image dropped")
+                bind.execute(sa.text(invalid_sql), {"id": row_id})
+                continue
+            bind.execute(sa.text(f"UPDATE {table} SET {column} = :url WHERE id = :id"), {"url": url, "id": row_id})
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    extract_column("product_images", "image_url", "DELETE FROM product_images WHERE id = :id")
+    extract_column("users", "profile_image", "UPDATE users SET profile_image = NULL WHERE id = :id")
+
+    op.alter_column(
+        "users",
+        "profile_image",
+        existing_type=mysql.LONGTEXT(),
+        type_=sa.String(length=500),
+        existing_nullable=True,
+    )
+    op.alter_column(
+        "product_images",
+        "image_url",
+        existing_type=mysql.LONGTEXT(),
+        type_=sa.String(length=500),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    # Images stay in the store; rows keep pointing at /images/{hash}
+    op.alter_column(
+        "users",
+        "profile_image",
+        existing_type=sa.String(length=500),
+        type_=mysql.LONGTEXT(),
+        existing_nullable=True,
+    )
+    op.alter_column(
+        "product_images",
+        "image_url",
+        existing_type=sa.String(length=500),
+        type_=mysql.LONGTEXT(),
+        existing_nullable=False,
+    )
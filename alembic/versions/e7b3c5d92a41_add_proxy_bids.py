@@ -0,0 +1,41 @@
+"""add proxy bids
+
+Revision ID: e7b3c5d92a41
+Revises: d4f8a2c61e37
+Create Date: 2026-10-17 15:31:08.327914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3c5d92a41'
+down_revision: Union[str, None] = 'd4f8a2c61e37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('proxy_bids',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('bidder_id', sa.Integer(), nullable=False),
+    sa.Column('max_amount', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('max_set_at', sa.DateTime().with_variant(mysql.DATETIME(fsp=6), 'mysql'), nullable=False),
+    sa.CheckConstraint('max_amount > 0', name='ck_proxy_bids_max_amount_positive'),
+    sa.ForeignKeyConstraint(['bidder_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'bidder_id')
+    )
+    op.create_index(op.f('ix_proxy_bids_bidder_id'), 'proxy_bids', ['bidder_id'], unique=False)
+    op.create_index('ix_proxy_bids_rank', 'proxy_bids', ['product_id', sa.text('max_amount DESC'), 'max_set_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proxy_bids_rank', table_name='proxy_bids')
+    op.drop_index(op.f('ix_proxy_bids_bidder_id'), table_name='proxy_bids')
+    op.drop_table('proxy_bids')
@@ -0,0 +1,25 @@
+"""add product fulltext index
+
+Revision ID: f2b7d4c81a06
+Revises: e5f0c7a39b82
+Create Date: 2026-10-17 15:10:42.581930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d4c81a06'
+down_revision: Union[str, None] = 'e5f0c7a39b82'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ft_products_title_description', 'products', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade() -> None:
+    op.drop_index('ft_products_title_description', table_name='products')
@@ -1,4 +1,6 @@
-from app.api import auth, addresses, analytics, bids, categories, favorites, orders, payments, products
+from app.api import (
+    auth, addresses, analytics, bids, categories, exports, favorites, images, orders, payments, products, timeseries,
+)
 
 __all__ = [
     "auth",
@@ -6,8 +8,11 @@ __all__ = [
     "analytics",
     "bids",
     "categories",
+    "exports",
     "favorites",
+    "images",
     "orders",
     "payments",
     "products",
+    "timeseries",
 ]
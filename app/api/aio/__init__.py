@@ -0,0 +1,14 @@
+"""Async (DB_MODE=async) versions of the hot read endpoints and bid placement.
+
+These routers are registered ahead of the sync ones in ``app.main`` so their
+routes take precedence; everything they do not cover is still served by the
+sync routers. Queries are awaited on an ``AsyncSession``; the shared helpers
+written against a sync ``Session`` run through ``AsyncSession.run_sync``.
+"""
+from app.api.aio import bids, categories, products
+
+__all__ = [
+    "bids",
+    "categories",
+    "products",
+]
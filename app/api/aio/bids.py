@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.bids import (
+    MY_BID_PAGE_KEYS,
+    PRODUCT_BID_PAGE_KEYS,
+    auction_event,
+    my_bid_response,
+    my_bids_query,
+    product_bid_response,
+    product_bids_query,
+    publish_auction_events,
+    submit_bid,
+)
+from app.api.deps import AsyncCurrentUser
+from app.core.cache import catalog_cache
+from app.core.database import get_async_db
+from app.core.pagination import PageParams, apply_keyset, finish_page
+from app.models import Product
+from app.schemas import BidCreate, BidResponse, BidWithBidderResponse, MyBidResponse
+
+router = APIRouter(prefix="/bids", tags=["Bids"])
+
+
+@router.post("/", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
+async def place_bid(
+    bid_in: BidCreate,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+):
+    bid = await db.run_sync(submit_bid, bid_in.product_id, current_user.id, bid_in.amount)
+    catalog_cache.invalidate("top-bidders", "active-without-bids")
+    product = await db.get(Product, bid.product_id, populate_existing=True)
+    publish_auction_events([auction_event(product)])
+    return bid
+
+
+@router.get("/me", response_model=list[MyBidResponse])
+async def list_my_bids(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+):
+    """Get all bids placed by the current user with product and seller info"""
+    stmt = apply_keyset(my_bids_query(current_user.id), MY_BID_PAGE_KEYS, page)
+    rows, _ = finish_page((await db.execute(stmt)).all(), page, lambda row: (row.created_at, row.id), response)
+    return [my_bid_response(row) for row in rows]
+
+
+@router.get("/product/{product_id}", response_model=list[BidWithBidderResponse])
+async def list_product_bids(
+    product_id: int,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+):
+    """Get all bids on a product (only for the product owner)"""
+    seller_id = await db.scalar(select(Product.seller_id).filter(Product.id == product_id))
+    if seller_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    if seller_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view bids")
+
+    stmt = apply_keyset(product_bids_query(product_id), PRODUCT_BID_PAGE_KEYS, page)
+    rows, _ = finish_page((await db.execute(stmt)).all(), page, lambda row: (row.amount, row.id), response)
+    return [product_bid_response(row) for row in rows]
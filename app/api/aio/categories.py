@@ -0,0 +1,22 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import catalog_cache
+from app.core.database import get_async_read_db
+from app.models import Category
+from app.schemas import CategoryResponse
+
+router = APIRouter(prefix="/categories", tags=["Categories"])
+
+
+@router.get("/", response_model=list[CategoryResponse])
+async def list_categories(db: Annotated[AsyncSession, Depends(get_async_read_db)]):
+    categories = catalog_cache.get("categories")
+    if categories is None:
+        rows = await db.scalars(select(Category).order_by(Category.name.asc()))
+        categories = [CategoryResponse.model_validate(category) for category in rows]
+        catalog_cache.set("categories", categories)
+    return categories
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.api.deps import AsyncCurrentUser
+from app.api.products import (
+    PRODUCT_PAGE_KEYS,
+    apply_text_search,
+    enrich_products_with_details,
+    product_page_key,
+    search_products,
+)
+from app.core.database import get_async_db, get_async_read_db
+from app.core.pagination import PageParams, apply_keyset, finish_page
+from app.models import Favorite, Product, ProductStatus
+from app.schemas import ProductResponse, ProductSearchResponse, ProductWithDetailsResponse
+
+router = APIRouter(prefix="/products", tags=["Products"])
+
+# Every GET route of the sync router is mirrored here: this router is matched
+# first, so a missing static path would fall through to "/{product_id}".
+
+
+async def get_product_or_404(db: AsyncSession, product_id: int) -> Product:
+    product = await db.get(Product, product_id, options=[selectinload(Product.images)])
+    if not product:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    return product
+
+
+async def fetch_page(db: AsyncSession, stmt, page: PageParams, response: Response) -> list[Product]:
+    rows = (await db.scalars(apply_keyset(stmt, PRODUCT_PAGE_KEYS, page))).all()
+    products, _ = finish_page(rows, page, product_page_key, response)
+    return products
+
+
+async def enrich(db: AsyncSession, products: list[Product], current_user_id: int) -> list[dict]:
+    return await db.run_sync(enrich_products_with_details, products, current_user_id)
+
+
+@router.get("/", response_model=list[ProductResponse])
+async def list_products(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+    status_filter: Optional[ProductStatus] = Query(None, alias="status"),
+    category_id: Optional[int] = None,
+    seller_id: Optional[int] = None,
+    q: Optional[str] = None,
+):
+    stmt = select(Product).options(selectinload(Product.images))
+    if status_filter:
+        stmt = stmt.filter(Product.status == status_filter)
+    if category_id:
+        stmt = stmt.filter(Product.category_id == category_id)
+    if seller_id:
+        stmt = stmt.filter(Product.seller_id == seller_id)
+    stmt = apply_text_search(stmt, q)
+    return await fetch_page(db, stmt, page, response)
+
+
+@router.get("/feed", response_model=list[ProductWithDetailsResponse])
+async def get_feed(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    current_user: AsyncCurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+    q: Optional[str] = None,
+):
+    """Get all products from other users (not current user's products)"""
+    stmt = select(Product).filter(
+        Product.seller_id != current_user.id,
+        Product.status == ProductStatus.ACTIVE,
+    )
+    stmt = apply_text_search(stmt, q)
+    products = await fetch_page(db, stmt, page, response)
+    return await enrich(db, products, current_user.id)
+
+
+@router.get("/my-products", response_model=list[ProductWithDetailsResponse])
+async def get_my_products(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+):
+    """Get current user's products"""
+    stmt = select(Product).filter(Product.seller_id == current_user.id)
+    products = await fetch_page(db, stmt, page, response)
+    return await enrich(db, products, current_user.id)
+
+
+@router.get("/favorites", response_model=list[ProductWithDetailsResponse])
+async def get_favorite_products(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+):
+    """Get products favorited by current user"""
+    stmt = select(Product).join(Favorite, Favorite.product_id == Product.id).filter(
+        Favorite.user_id == current_user.id
+    )
+    products = await fetch_page(db, stmt, page, response)
+    return await enrich(db, products, current_user.id)
+
+
+@router.get("/search", response_model=ProductSearchResponse)
+async def search(
+    db: Annotated[AsyncSession, Depends(get_async_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = None,
+    status_filter: Optional[ProductStatus] = Query(None, alias="status"),
+):
+    """Full-text search over title and description, best matches first"""
+    return await db.run_sync(search_products, q, page, response, category_id, status_filter)
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(product_id: int, db: Annotated[AsyncSession, Depends(get_async_db)]):
+    return await get_product_or_404(db, product_id)
+
+
+@router.get("/{product_id}/details", response_model=ProductWithDetailsResponse)
+async def get_product_details(
+    product_id: int,
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    current_user: AsyncCurrentUser,
+):
+    """Get product with full details including seller info and highest bid"""
+    product = await get_product_or_404(db, product_id)
+    return (await enrich(db, [product], current_user.id))[0]
@@ -1,111 +1,302 @@
 from __future__ import annotations
 
-from typing import Annotated
+import time
+from datetime import datetime, timedelta
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import desc, exists, func, select
+from fastapi import APIRouter, Depends, Query, Response
+from loguru import logger
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser
-from app.core.database import get_db
-from app.models import Bid, Favorite, Product, ProductStatus, User
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from app.core.database import SessionLocal, get_read_db
+from app.core.pagination import PageParams, apply_keyset, finish_page, set_page_headers
+from app.core.scheduler import DeadlineScheduler
+from app.models import Bid, Favorite, Product, ProductFavoriteStats, ProductStatus, RollupState, User, UserBidStats
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
+ROLLUP_REFRESHED_HEADER = "X-Rollup-Refreshed-At"
+ROLLUP_JOB = "analytics-rollups"
+
+# Rollup table -> the source column whose rows it counts
+ROLLUP_SOURCES = {
+    ProductFavoriteStats: Favorite.product_id,
+    UserBidStats: Bid.bidder_id,
+}
+
+UPSERT_DIALECTS = {"mysql": mysql.insert, "postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def _increment(db: Session, model, key: int, delta: int) -> None:
+    """Add ``delta`` to a rollup counter in one upsert, creating the row on first use."""
+    table = model.__table__
+    key_column, count_column = table.c
+    upsert = UPSERT_DIALECTS[db.get_bind().dialect.name](table).values(
+        {key_column.name: key, count_column.name: max(delta, 0)}
+    )
+    if db.get_bind().dialect.name == "mysql":
+        stmt = upsert.on_duplicate_key_update({count_column.name: count_column + delta})
+    else:
+        stmt = upsert.on_conflict_do_update(index_elements=[key_column], set_={count_column.name: count_column + delta})
+    db.execute(stmt)
+
+
+def record_favorite(db: Session, product_id: int, delta: int) -> None:
+    _increment(db, ProductFavoriteStats, product_id, delta)
+
+
+def record_bid(db: Session, bidder_id: int) -> None:
+    _increment(db, UserBidStats, bidder_id, 1)
+
+
+def _reconcile_range(db: Session, model, source, low: int, high: int) -> None:
+    """Overwrite the rollup rows for keys in ``[low, high)`` with counts taken from the source."""
+    table = model.__table__
+    key_column, count_column = table.c
+    in_range = source.between(low, high - 1)
+    counts = select(source, func.count()).where(in_range).group_by(source)
+    upsert = UPSERT_DIALECTS[db.get_bind().dialect.name](table).from_select([key_column.name, count_column.name], counts)
+    if db.get_bind().dialect.name == "mysql":
+        stmt = upsert.on_duplicate_key_update({count_column.name: upsert.inserted[count_column.name]})
+    else:
+        stmt = upsert.on_conflict_do_update(
+            index_elements=[key_column], set_={count_column.name: upsert.excluded[count_column.name]}
+        )
+    db.execute(stmt)
+    db.execute(
+        delete(model).where(key_column.between(low, high - 1), key_column.not_in(select(source).where(in_range)))
+    )
+
+
+def refresh_rollups(db: Session, max_age: Optional[float] = None) -> bool:
+    """Rebuild every rollup table from its source table.
+
+    The incremental updates keep the rollups current; this corrects any drift
+    (rows removed outside the API, failed requests). Keys are reconciled in
+    ranges of ANALYTICS_ROLLUP_BATCH_SIZE, each in its own short transaction,
+    so concurrent bids and favorites only ever wait on one range. With
+    ``max_age`` the rebuild is skipped when another worker did one more
+    recently than that.
+    """
+    names = [model.__tablename__ for model in ROLLUP_SOURCES]
+    states = db.query(RollupState).filter(RollupState.name.in_(names)).with_for_update().all()
+    if max_age is not None and len(states) == len(names):
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+        if all(state.refreshed_at > cutoff for state in states):
+            db.rollback()
+            return False
+    # Claim the rebuild before releasing the lock, so other workers skip it
+    now = datetime.utcnow()
+    for name in names:
+        db.merge(RollupState(name=name, refreshed_at=now))
+    db.commit()
+
+    batch = settings.ANALYTICS_ROLLUP_BATCH_SIZE
+    for model, source in ROLLUP_SOURCES.items():
+        key_column = model.__table__.c[0]
+        last_key = max(db.scalar(select(func.max(source))) or 0, db.scalar(select(func.max(key_column))) or 0)
+        db.rollback()
+        for low in range(0, last_key + 1, batch):
+            _reconcile_range(db, model, source, low, low + batch)
+            db.commit()
+
+    now = datetime.utcnow()
+    for name in names:
+        db.merge(RollupState(name=name, refreshed_at=now))
+    db.commit()
+    catalog_cache.invalidate("trending-products", "top-bidders")
+    return True
+
+
+def _refresh_rollups_job(due: list) -> None:
+    if ROLLUP_JOB not in due:
+        return
+    db = SessionLocal()
+    try:
+        if refresh_rollups(db, max_age=settings.ANALYTICS_ROLLUP_REFRESH_SECONDS / 2):
+            logger.info("Refreshed analytics rollups")
+    finally:
+        db.close()
+        schedule_rollup_refresh()
+
+
+def schedule_rollup_refresh() -> None:
+    rollup_refresher.schedule(
+        ROLLUP_JOB, datetime.utcnow() + timedelta(seconds=settings.ANALYTICS_ROLLUP_REFRESH_SECONDS)
+    )
+
+
+# Periodic full rebuild; only the single ROLLUP_JOB deadline is ever scheduled
+rollup_refresher = DeadlineScheduler(
+    on_due=_refresh_rollups_job,
+    load=lambda horizon: [],
+    reload_interval=settings.ANALYTICS_ROLLUP_REFRESH_SECONDS,
+    name="rollup-refresher",
+)
+
+
+def rollup_refreshed_at(db: Session, model) -> Optional[datetime]:
+    return db.scalar(select(RollupState.refreshed_at).where(RollupState.name == model.__tablename__))
+
+
+def cached_page(
+    db: Session,
+    response: Response,
+    page: PageParams,
+    cache_key: tuple,
+    stmt,
+    key,
+    rollup=None,
+) -> list[dict]:
+    """Run a paginated analytics query through the catalog cache.
+
+    ``Age`` tells how long ago the page was computed and, for pages read from a
+    rollup table, ``X-Rollup-Refreshed-At`` when that table was last rebuilt.
+    """
+    def load():
+        rows, next_cursor = finish_page(db.execute(stmt).all(), page, key)
+        refreshed_at = rollup_refreshed_at(db, rollup) if rollup is not None else None
+        return [dict(row._mapping) for row in rows], next_cursor, time.time(), refreshed_at
+
+    items, next_cursor, computed_at, refreshed_at = catalog_cache.get_or_load(
+        (*cache_key, page.limit, page.cursor), load
+    )
+    set_page_headers(response, page, next_cursor)
+    response.headers["Age"] = str(int(time.time() - computed_at))
+    if refreshed_at is not None:
+        response.headers[ROLLUP_REFRESHED_HEADER] = refreshed_at.isoformat()
+    return items
+
+
+@router.get("/rollups")
+def rollup_status(db: Annotated[Session, Depends(get_read_db)]):
+    """Last full rebuild of each rollup table."""
+    now = datetime.utcnow()
+    return [
+        {
+            "name": state.name,
+            "refreshed_at": state.refreshed_at,
+            "age_seconds": int((now - state.refreshed_at).total_seconds()),
+        }
+        for state in db.query(RollupState).order_by(RollupState.name)
+    ]
+
 
 @router.get("/trending-products")
 def trending_products(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
     min_favorites: int = Query(2, ge=1),
 ):
     stmt = (
         select(
             Product.id,
             Product.title,
-            func.count(Favorite.product_id).label("favorite_count"),
+            ProductFavoriteStats.favorite_count,
         )
-        .join(Favorite, Favorite.product_id == Product.id)
-        .group_by(Product.id)
-        .having(func.count(Favorite.product_id) >= min_favorites)
-        .order_by(desc("favorite_count"))
+        .join(Product, Product.id == ProductFavoriteStats.product_id)
+        .where(ProductFavoriteStats.favorite_count >= min_favorites)
+    )
+    # Seeks along ix_product_favorite_stats_count
+    keys = [(ProductFavoriteStats.favorite_count, True), (ProductFavoriteStats.product_id, True)]
+    stmt = apply_keyset(stmt, keys, page)
+    return cached_page(
+        db, response, page, ("trending-products", min_favorites), stmt, lambda r: (r.favorite_count, r.id),
+        rollup=ProductFavoriteStats,
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
 
 
 @router.get("/seller-bid-stats")
 def seller_bid_stats(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
+    bid_count = func.count(Bid.id)
     stmt = (
         select(
             Product.id.label("product_id"),
             Product.title,
-            func.count(Bid.id).label("bid_count"),
+            bid_count.label("bid_count"),
             func.max(Bid.amount).label("max_bid"),
             func.avg(Bid.amount).label("avg_bid"),
         )
         .join(Bid, Bid.product_id == Product.id)
         .where(Product.seller_id == current_user.id)
         .group_by(Product.id)
-        .having(func.count(Bid.id) >= 1)
-        .order_by(desc("bid_count"))
-        
+        .having(bid_count >= 1)
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    stmt = apply_keyset(stmt, [(bid_count, True), (Product.id, True)], page, having=True)
+    rows, _ = finish_page(db.execute(stmt).all(), page, lambda r: (r.bid_count, r.product_id), response)
+    return [dict(row._mapping) for row in rows]
 
 
 @router.get("/outbid-bids")
 def outbid_bids(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
-    max_bid_subq = (
-        select(Bid.product_id, func.max(Bid.amount).label("max_amount"))
-        .group_by(Bid.product_id)
-        .subquery()
-    )
+    # The product's denormalized current_price is its top live bid
     stmt = (
         select(
             Bid.id,
             Bid.product_id,
             Bid.amount,
-            max_bid_subq.c.max_amount,
+            Product.current_price.label("max_amount"),
         )
-        .join(max_bid_subq, Bid.product_id == max_bid_subq.c.product_id)
-        .where(Bid.bidder_id == current_user.id, Bid.amount < max_bid_subq.c.max_amount)
-        .order_by(desc(max_bid_subq.c.max_amount))
+        .join(Product, Product.id == Bid.product_id)
+        .where(Bid.bidder_id == current_user.id, Bid.amount < Product.current_price)
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
+    stmt = apply_keyset(stmt, [(Product.current_price, True), (Bid.id, True)], page)
+    rows, _ = finish_page(db.execute(stmt).all(), page, lambda r: (r.max_amount, r.id), response)
+    return [dict(row._mapping) for row in rows]
 
 
 @router.get("/active-without-bids")
 def active_without_bids(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
-    has_bids = exists(select(Bid.id).where(Bid.product_id == Product.id))
     stmt = (
         select(Product.id, Product.title, Product.auction_end_at)
-        .where(Product.status == ProductStatus.ACTIVE, ~has_bids)
-        .order_by(Product.auction_end_at.asc())
+        .where(Product.status == ProductStatus.ACTIVE, Product.bid_count == 0)
+    )
+    # Soonest ending first, seeking along ix_products_status_auction_end
+    stmt = apply_keyset(stmt, [(Product.auction_end_at, False), (Product.id, False)], page)
+    return cached_page(
+        db, response, page, ("active-without-bids",), stmt, lambda r: (r.auction_end_at, r.id)
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
 
 
 @router.get("/top-bidders")
 def top_bidders(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
     min_bids: int = Query(2, ge=1),
 ):
     stmt = (
         select(
             User.id.label("user_id"),
             User.email,
-            func.count(Bid.id).label("bid_count"),
+            UserBidStats.bid_count,
         )
-        .join(Bid, Bid.bidder_id == User.id)
-        .group_by(User.id)
-        .having(func.count(Bid.id) >= min_bids)
-        .order_by(desc("bid_count"))
+        .join(User, User.id == UserBidStats.user_id)
+        .where(UserBidStats.bid_count >= min_bids)
+    )
+    # Seeks along ix_user_bid_stats_count
+    stmt = apply_keyset(stmt, [(UserBidStats.bid_count, True), (UserBidStats.user_id, True)], page)
+    return cached_page(
+        db, response, page, ("top-bidders", min_bids), stmt, lambda r: (r.bid_count, r.user_id),
+        rollup=UserBidStats,
     )
-    return [dict(row._mapping) for row in db.execute(stmt).all()]
@@ -1,65 +1,202 @@
-from typing import Annotated
+from datetime import datetime, timedelta
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, undefer
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, get_password_hash, verify_password
-from app.models import User
-from app.schemas import Token, UserCreate, UserResponse, UserUpdate
-from app.api.deps import CurrentUser
+from app.core.image_store import InvalidImageError, image_store
+from app.core.security import (
+    create_access_token,
+    get_password_hash_async,
+    new_refresh_token,
+    password_needs_rehash,
+    token_digest,
+    verify_password_async,
+)
+from app.models import RefreshToken, User
+from app.schemas import Token, TokenRefresh, UserCreate, UserResponse, UserUpdate
+from app.api.deps import CurrentUserFull
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(
-    user_in: UserCreate,
-    db: Annotated[Session, Depends(get_db)],
-):
-    """Register a new user."""
-    # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_in.email).first()
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered",
-        )
+def store_profile_image(value: Optional[str]) -> Optional[str]:
+    """Move an uploaded data URL into the image store and return its URL."""
+    try:
+        return image_store.externalize(value)
+    except InvalidImageError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+def email_taken() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Email already registered",
+    )
+
+
+def check_email_available(db: Session, email: str) -> None:
+    if db.query(User.id).filter(User.email == email).first():
+        raise email_taken()
 
-    # Create new user
+
+def create_user(db: Session, user_in: UserCreate, password_hash: str) -> UserResponse:
     user = User(
         email=user_in.email,
-        password_hash=get_password_hash(user_in.password),
+        password_hash=password_hash,
         full_name=user_in.full_name,
         phone_number=user_in.phone_number,
+        profile_image=store_profile_image(user_in.profile_image),
     )
     db.add(user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Registered concurrently since check_email_available
+        db.rollback()
+        raise email_taken()
     db.refresh(user)
-    return user
+    # Serialized here: profile_image is deferred and would load on the event loop
+    return UserResponse.model_validate(user)
+
+
+def find_login_user(db: Session, email: str) -> Optional[User]:
+    return (
+        db.query(User)
+        .options(undefer(User.password_hash))
+        .filter(User.email == email)
+        .first()
+    )
+
+
+def access_token_for(user) -> str:
+    return create_access_token(data={"sub": user.id, "email": user.email, "name": user.full_name})
+
+
+def issue_refresh_token(db: Session, user_id: int, family_id: Optional[int] = None) -> str:
+    """Add a refresh token for ``user_id`` to the session and return its value (commit is up to the caller)."""
+    token = new_refresh_token()
+    db.add(RefreshToken(
+        token_hash=token_digest(token),
+        user_id=user_id,
+        family_id=family_id,
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+    ))
+    return token
+
+
+def revoke_family(db: Session, token: RefreshToken) -> None:
+    """Revoke every token of the session ``token`` belongs to."""
+    db.execute(
+        update(RefreshToken)
+        .where(
+            or_(RefreshToken.id == token.root_id, RefreshToken.family_id == token.root_id),
+            RefreshToken.revoked_at.is_(None),
+        )
+        .values(revoked_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def start_session(db: Session, user: User, new_password_hash: Optional[str] = None) -> Token:
+    """Open a refresh token family for a successful login and return the tokens it starts with."""
+    # Built before the commit expires ``user``, which would otherwise reload it wherever it is read next
+    access_token = access_token_for(user)
+    if new_password_hash is not None:
+        user.password_hash = new_password_hash
+    # Expired tokens are no longer useful for reuse detection either
+    db.query(RefreshToken).filter(
+        RefreshToken.user_id == user.id,
+        RefreshToken.expires_at <= datetime.utcnow(),
+    ).delete(synchronize_session=False)
+    refresh_token = issue_refresh_token(db, user.id)
+    db.commit()
+    return Token(access_token=access_token, refresh_token=refresh_token)
+
+
+def find_refresh_token(db: Session, token: str, lock: bool = False) -> Optional[RefreshToken]:
+    query = db.query(RefreshToken).filter(RefreshToken.token_hash == token_digest(token))
+    if lock:
+        query = query.with_for_update()
+    return query.first()
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(
+    user_in: UserCreate,
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Register a new user."""
+    # Refuse a taken email before spending a bcrypt round on it
+    await run_in_threadpool(check_email_available, db, user_in.email)
+    # bcrypt runs on its own pool, so the request threadpool only does the DB work
+    password_hash = await get_password_hash_async(user_in.password)
+    return await run_in_threadpool(create_user, db, user_in, password_hash)
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Annotated[Session, Depends(get_db)],
 ):
     """Login and get access token."""
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.password_hash):
+    user = await run_in_threadpool(find_login_user, db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = create_access_token(data={"sub": user.id})
-    return Token(access_token=access_token)
+    new_hash = None
+    if password_needs_rehash(user.password_hash):
+        # The plain password is only available now; re-hash it at the current cost
+        new_hash = await get_password_hash_async(form_data.password)
+    return await run_in_threadpool(start_session, db, user, new_hash)
+
+
+@router.post("/refresh", response_model=Token)
+def refresh(
+    token_in: TokenRefresh,
+    db: Annotated[Session, Depends(get_db)],
+):
+    """Exchange a refresh token for a new access token and a new refresh token.
+
+    The presented token is revoked. Presenting an already rotated token again
+    means it was copied, so the whole session is revoked.
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    # Locked so two concurrent refreshes with the same token cannot both rotate it
+    stored = find_refresh_token(db, token_in.refresh_token, lock=True)
+    if stored is None or stored.expires_at <= datetime.utcnow():
+        raise invalid
+    if stored.revoked_at is not None:
+        revoke_family(db, stored)
+        db.commit()
+        raise invalid
+
+    user = db.query(User.id, User.email, User.full_name).filter(User.id == stored.user_id).first()
+    if user is None:
+        raise invalid
+
+    stored.revoked_at = datetime.utcnow()
+    refresh_token = issue_refresh_token(db, user.id, family_id=stored.root_id)
+    db.commit()
+    return Token(access_token=access_token_for(user), refresh_token=refresh_token)
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: CurrentUser):
+def get_current_user_info(current_user: CurrentUserFull):
     """Get current authenticated user info."""
     return current_user
 
@@ -68,10 +205,12 @@ def get_current_user_info(current_user: CurrentUser):
 def update_current_user(
     user_in: UserUpdate,
     db: Annotated[Session, Depends(get_db)],
-    current_user: CurrentUser,
+    current_user: CurrentUserFull,
 ):
     """Update current user's profile."""
     for field, value in user_in.model_dump(exclude_unset=True).items():
+        if field == "profile_image":
+            value = store_profile_image(value)
         setattr(current_user, field, value)
 
     db.commit()
@@ -80,6 +219,14 @@ def update_current_user(
 
 
 @router.post("/logout")
-def logout():
-    """Logout (client should discard the token)."""
+def logout(
+    db: Annotated[Session, Depends(get_db)],
+    token_in: Optional[TokenRefresh] = None,
+):
+    """Logout: revokes the session of the given refresh token (client should discard the access token)."""
+    if token_in is not None:
+        stored = find_refresh_token(db, token_in.refresh_token)
+        if stored is not None:
+            revoke_family(db, stored)
+            db.commit()
     return {"message": "Successfully logged out"}
@@ -1,21 +1,45 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Annotated
+from decimal import Decimal
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from loguru import logger
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.orm import Session
 
+from app.api.analytics import record_bid
 from app.api.deps import CurrentUser
-from app.core.database import get_db
-from app.models import Bid, BidStatus, Order, OrderStatus, Product, ProductStatus, User
-from app.schemas import BidCreate, BidResponse, BidWithBidderResponse, BidderInfo, MyBidResponse, OrderResponse
+from app.api.timeseries import price_series_namespace
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db
+from app.core.metrics import auctions_closed, bid_rows_written, bids_rejected, orders_created
+from app.core.pagination import PageParams, apply_keyset, finish_page
+from app.core.pubsub import hub
+from app.core.scheduler import DeadlineScheduler
+from app.core.timeseries import window_cache
+from app.models import Bid, BidStatus, Order, OrderStatus, Product, ProductStatus, ProxyBid, User
+from app.schemas import (
+    BidCreate,
+    BidResponse,
+    BidWithBidderResponse,
+    BidderInfo,
+    MyBidResponse,
+    OrderResponse,
+    ProxyBidCreate,
+    ProxyBidResponse,
+)
 
 router = APIRouter(prefix="/bids", tags=["Bids"])
 
 
 
+# Bids that still count towards an auction's current price
+LIVE_BID_STATUSES = (BidStatus.PENDING, BidStatus.OUTBID, BidStatus.ACCEPTED)
+
+
 def get_bid_or_404(db: Session, bid_id: int) -> Bid:
     bid = db.query(Bid).filter(Bid.id == bid_id).first()
     if not bid:
@@ -23,101 +47,558 @@ def get_bid_or_404(db: Session, bid_id: int) -> Bid:
     return bid
 
 
-@router.post("/", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
-def place_bid(
-    bid_in: BidCreate,
-    db: Annotated[Session, Depends(get_db)],
-    current_user: CurrentUser,
-):
-    product = db.query(Product).filter(Product.id == bid_in.product_id).first()
-    
-    from datetime import datetime, timezone
+def compute_auction_summaries(db: Session, product_ids: list[int]) -> dict[int, dict]:
+    """Recompute current_price, bid_count, highest_bid_id and last_bid_at from the bids table.
+
+    The highest live bid sets the price (earliest bid wins a tie); once a bid has
+    been accepted the price is pinned to that bid.
+    """
+    summaries = {
+        product_id: {"current_price": None, "bid_count": 0, "highest_bid_id": None, "last_bid_at": None}
+        for product_id in product_ids
+    }
+    if not product_ids:
+        return summaries
+
+    for row in (
+        db.query(Bid.product_id, func.count(Bid.id).label("bid_count"), func.max(Bid.created_at).label("last_bid_at"))
+        .filter(Bid.product_id.in_(product_ids))
+        .group_by(Bid.product_id)
+    ):
+        summaries[row.product_id]["bid_count"] = row.bid_count
+        summaries[row.product_id]["last_bid_at"] = row.last_bid_at
+
+    top = (
+        select(Bid.product_id, func.max(Bid.amount).label("amount"))
+        .where(Bid.product_id.in_(product_ids), Bid.status.in_(LIVE_BID_STATUSES))
+        .group_by(Bid.product_id)
+        .subquery()
+    )
+    stmt = (
+        select(top.c.product_id, top.c.amount, func.min(Bid.id).label("bid_id"))
+        .join(Bid, and_(Bid.product_id == top.c.product_id, Bid.amount == top.c.amount))
+        .where(Bid.status.in_(LIVE_BID_STATUSES))
+        .group_by(top.c.product_id, top.c.amount)
+    )
+    for row in db.execute(stmt):
+        summaries[row.product_id]["current_price"] = row.amount
+        summaries[row.product_id]["highest_bid_id"] = row.bid_id
+
+    for row in (
+        db.query(Product.id, Bid.id.label("bid_id"), Bid.amount)
+        .join(Bid, Bid.id == Product.accepted_bid_id)
+        .filter(Product.id.in_(product_ids))
+    ):
+        summaries[row.id]["current_price"] = row.amount
+        summaries[row.id]["highest_bid_id"] = row.bid_id
+
+    return summaries
+
+
+def refresh_auction_summary(db: Session, product: Product) -> None:
+    """Reload the denormalized auction columns of a single product from its bids."""
+    for field, value in compute_auction_summaries(db, [product.id])[product.id].items():
+        setattr(product, field, value)
+
+
+def auction_topic(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def auction_event(product: Product) -> dict:
+    """Compact snapshot of an auction's live state, as pushed to stream subscribers."""
+    return {
+        "product_id": product.id,
+        "status": product.status.value,
+        "current_price": str(product.current_price) if product.current_price is not None else None,
+        "bid_count": product.bid_count,
+        "highest_bid_id": product.highest_bid_id,
+        "last_bid_at": product.last_bid_at.isoformat() if product.last_bid_at else None,
+    }
+
+
+def publish_auction_events(events: list[dict]) -> None:
+    for event in events:
+        hub.publish(auction_topic(event["product_id"]), event)
+
 
+def bid_timestamp() -> datetime:
+    """One timestamp for a bid's created_at and the product's last_bid_at, at the columns' precision.
+
+    Taking both from the database clock in separate statements could put them
+    on different sides of a second boundary.
+    """
+    return datetime.utcnow().replace(microsecond=0)
+
+
+def auction_is_open(product: Product) -> bool:
     auction_end_at = product.auction_end_at
 
     # If DB value is naive, assume UTC and fix it
     if auction_end_at.tzinfo is None:
         auction_end_at = auction_end_at.replace(tzinfo=timezone.utc)
-    
+
+    return product.status == ProductStatus.ACTIVE and auction_end_at > datetime.now(timezone.utc)
+
+
+def submit_bid(db: Session, product_id: int, bidder_id: int, amount: Decimal) -> Bid:
+    """Place a bid, serialized per product by an atomic compare-and-set on the product row.
+
+    The conditional UPDATE only succeeds while the auction is still open and
+    ``amount`` still clears the current price, so two racing bidders can never both win the same price level. The
+    statement locks only that product's row, so bids on different products do
+    not contend. Proxies that can still outbid ``amount`` answer it in the same
+    transaction, so the returned bid may already be OUTBID.
+    """
+    product = db.query(Product).filter(Product.id == product_id).first()
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    if product.status != ProductStatus.ACTIVE or auction_end_at <= datetime.now(timezone.utc):
+
+    if not auction_is_open(product):
+        bids_rejected.inc("inactive")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active")
-    if product.seller_id == current_user.id:
+    if product.seller_id == bidder_id:
+        bids_rejected.inc("own_product")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot bid on your own product")
 
-    highest = (
-        db.query(Bid)
-        .filter(Bid.product_id == product.id)
-        .order_by(desc(Bid.amount))
-        .first()
+    # Cheap early rejection against the price we just read
+    check_min_required(product, amount)
+
+    placed_at = bid_timestamp()
+    claimed = db.execute(
+        update(Product)
+        .where(
+            Product.id == product_id,
+            Product.status == ProductStatus.ACTIVE,
+            # The end time may pass between the read above and this statement
+            Product.auction_end_at > datetime.utcnow(),
+            or_(
+                and_(Product.current_price.is_(None), Product.starting_price <= amount),
+                Product.current_price + Product.min_increment <= amount,
+            ),
+        )
+        .values(current_price=amount, bid_count=Product.bid_count + 1, last_bid_at=placed_at)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        # Someone else got there first; report against the fresh price
+        db.rollback()
+        db.refresh(product)
+        if not auction_is_open(product):
+            bids_rejected.inc("inactive")
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active")
+        check_min_required(product, amount)
+        bids_rejected.inc("conflict")
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Bid could not be placed, please retry")
+
+    # The product row stays locked until commit, so the rest of the work is serialized
+    bid = Bid(product_id=product_id, bidder_id=bidder_id, amount=amount, created_at=placed_at)
+    db.add(bid)
+    db.flush()
+
+    db.execute(
+        update(Product)
+        .where(Product.id == product_id)
+        .values(highest_bid_id=bid.id)
+        .execution_options(synchronize_session=False)
     )
-    min_required = product.starting_price if not highest else highest.amount + product.min_increment
-    if bid_in.amount < min_required:
+    db.query(Bid).filter(
+        Bid.product_id == product_id,
+        Bid.id != bid.id,
+        Bid.status == BidStatus.PENDING,
+    ).update({Bid.status: BidStatus.OUTBID}, synchronize_session=False)
+    record_bid(db, bidder_id)
+    proxy_bids = resolve_proxy_bids(db, product, amount, bidder_id)
+
+    db.commit()
+    bid_rows_written.inc("manual")
+    bid_rows_written.inc("proxy", amount=len(proxy_bids))
+    db.refresh(bid)
+    return bid
+
+
+def next_min_bid(product: Product, price: Optional[Decimal]) -> Decimal:
+    """Smallest amount that beats ``price`` on ``product`` (the starting price while there are no bids)."""
+    return product.starting_price if price is None else price + product.min_increment
+
+
+def resolve_proxy_bids(db: Session, product: Product, price: Optional[Decimal], leader_id: Optional[int]) -> list[Bid]:
+    """Let the proxies on ``product`` bid against each other and the current leader.
+
+    Must run in the transaction that holds the product row lock, with ``price``
+    and ``leader_id`` describing the current highest bid. Only the two highest
+    maximums matter: the top proxy wins at the runner-up's maximum plus one
+    increment (never above its own maximum), and the runner-up is recorded as
+    outbid at its maximum. So however many proxies compete, this is one range
+    scan on ix_proxy_bids_rank and at most two Bid rows. Returns the new bids.
+    """
+    floor = next_min_bid(product, price)
+    top = (
+        db.query(ProxyBid)
+        .filter(ProxyBid.product_id == product.id, ProxyBid.max_amount >= floor)
+        .order_by(ProxyBid.max_amount.desc(), ProxyBid.max_set_at, ProxyBid.bidder_id)
+        .limit(2)
+        .all()
+    )
+    if not top or (len(top) == 1 and top[0].bidder_id == leader_id):
+        return []
+
+    winner = top[0]
+    placed_at = bid_timestamp()
+    if len(top) == 1:
+        winning_bid = Bid(product_id=product.id, bidder_id=winner.bidder_id, amount=floor, created_at=placed_at)
+        bids = [winning_bid]
+    else:
+        runner_up = top[1]
+        amount = min(winner.max_amount, runner_up.max_amount + product.min_increment)
+        winning_bid = Bid(product_id=product.id, bidder_id=winner.bidder_id, amount=amount, created_at=placed_at)
+        losing_bid = Bid(
+            product_id=product.id,
+            bidder_id=runner_up.bidder_id,
+            amount=runner_up.max_amount,
+            status=BidStatus.OUTBID,
+            created_at=placed_at,
+        )
+        # On equal maximums the earlier proxy wins, so its bid must also be stored
+        # first: the earliest of equal bids is the highest one (compute_auction_summaries)
+        bids = [winning_bid, losing_bid] if amount == runner_up.max_amount else [losing_bid, winning_bid]
+
+    db.add_all(bids)
+    db.flush()
+    db.execute(
+        update(Product)
+        .where(Product.id == product.id)
+        .values(
+            current_price=winning_bid.amount,
+            bid_count=Product.bid_count + len(bids),
+            highest_bid_id=winning_bid.id,
+            last_bid_at=placed_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.query(Bid).filter(
+        Bid.product_id == product.id,
+        Bid.id != winning_bid.id,
+        Bid.status == BidStatus.PENDING,
+    ).update({Bid.status: BidStatus.OUTBID}, synchronize_session=False)
+    for new_bid in bids:
+        record_bid(db, new_bid.bidder_id)
+    return bids
+
+
+def check_min_required(product: Product, amount: Decimal) -> None:
+    min_required = next_min_bid(product, product.current_price)
+    if amount < min_required:
+        bids_rejected.inc("too_low")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Bid must be at least {min_required}",
         )
 
-    bid = Bid(product_id=product.id, bidder_id=current_user.id, amount=bid_in.amount)
-    db.add(bid)
-    db.flush()
 
-    if highest and highest.status == BidStatus.PENDING:
-        highest.status = BidStatus.OUTBID
+def create_order_for_bid(db: Session, product: Product, bid: Bid) -> Order:
+    """Sell ``product`` to ``bid``: accept it, reject the other pending bids and open an order."""
+    bid.status = BidStatus.ACCEPTED
+    product.accepted_bid_id = bid.id
+    product.status = ProductStatus.SOLD
+    product.current_price = bid.amount
+    product.highest_bid_id = bid.id
 
-    db.commit()
-    db.refresh(bid)
+    db.query(Bid).filter(
+        Bid.product_id == product.id,
+        Bid.id != bid.id,
+        Bid.status == BidStatus.PENDING,
+    ).update({Bid.status: BidStatus.REJECTED})
+
+    order = Order(
+        product_id=product.id,
+        buyer_id=bid.bidder_id,
+        seller_id=product.seller_id,
+        bid_id=bid.id,
+        total_amount=bid.amount,
+        status=OrderStatus.AWAITING_PAYMENT,
+    )
+    db.add(order)
+    return order
+
+
+def close_due_auctions(db: Session, batch_size: int = 100) -> int:
+    """Close every ACTIVE auction whose end time has passed, one batch per transaction.
+
+    Auctions without bids become EXPIRED; otherwise the top bid wins and an order
+    is created. Rows are claimed with FOR UPDATE SKIP LOCKED, so several workers
+    can run this concurrently without closing the same auction twice.
+    """
+    closed = 0
+    while True:
+        products = (
+            db.query(Product)
+            .filter(
+                Product.status == ProductStatus.ACTIVE,
+                Product.auction_end_at <= datetime.utcnow(),
+            )
+            .order_by(Product.auction_end_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not products:
+            return closed
+
+        winning_ids = [p.highest_bid_id for p in products if p.highest_bid_id is not None]
+        winning_bids = {
+            bid.id: bid for bid in db.query(Bid).filter(Bid.id.in_(winning_ids))
+        } if winning_ids else {}
+
+        sold = 0
+        for product in products:
+            winning_bid = winning_bids.get(product.highest_bid_id)
+            if winning_bid is None:
+                product.status = ProductStatus.EXPIRED
+            else:
+                create_order_for_bid(db, product, winning_bid)
+                sold += 1
+
+        # Proxies only matter while an auction is open
+        db.query(ProxyBid).filter(
+            ProxyBid.product_id.in_([p.id for p in products])
+        ).delete(synchronize_session=False)
+        events = [auction_event(product) for product in products]
+        db.commit()
+        auctions_closed.inc("sold", amount=sold)
+        auctions_closed.inc("expired", amount=len(products) - sold)
+        orders_created.inc("auction_end", amount=sold)
+        publish_auction_events(events)
+        closed += len(products)
+        if len(products) < batch_size:
+            return closed
+
+
+def _close_due_auctions_job(due_product_ids: list) -> None:
+    db = SessionLocal()
+    try:
+        closed = close_due_auctions(db, settings.AUCTION_CLOSER_BATCH_SIZE)
+        if closed:
+            logger.info(f"Closed {closed} auctions")
+    finally:
+        db.close()
+
+
+def _load_auction_deadlines(horizon: datetime) -> list[tuple[int, datetime]]:
+    db = SessionLocal()
+    try:
+        return [
+            (row.id, row.auction_end_at)
+            for row in db.query(Product.id, Product.auction_end_at).filter(
+                Product.status == ProductStatus.ACTIVE,
+                Product.auction_end_at <= horizon,
+            )
+        ]
+    finally:
+        db.close()
+
+
+auction_closer = DeadlineScheduler(
+    on_due=_close_due_auctions_job,
+    load=_load_auction_deadlines,
+    reload_interval=settings.AUCTION_CLOSER_RELOAD_SECONDS,
+    name="auction-closer",
+)
+
+
+@router.post("/", response_model=BidResponse, status_code=status.HTTP_201_CREATED)
+def place_bid(
+    bid_in: BidCreate,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: CurrentUser,
+):
+    bid = submit_bid(db, bid_in.product_id, current_user.id, bid_in.amount)
+    catalog_cache.invalidate("top-bidders", "active-without-bids")
+    publish_auction_events([auction_event(db.get(Product, bid.product_id))])
     return bid
 
 
-@router.get("/me", response_model=list[MyBidResponse])
-def list_my_bids(
+def proxy_bid_response(proxy: ProxyBid, product: Product, leader_id: Optional[int]) -> ProxyBidResponse:
+    return ProxyBidResponse(
+        product_id=proxy.product_id,
+        bidder_id=proxy.bidder_id,
+        max_amount=proxy.max_amount,
+        created_at=proxy.created_at,
+        current_price=product.current_price,
+        is_leading=leader_id == proxy.bidder_id,
+    )
+
+
+def leading_bidder_id(db: Session, product: Product) -> Optional[int]:
+    if product.highest_bid_id is None:
+        return None
+    return db.query(Bid.bidder_id).filter(Bid.id == product.highest_bid_id).scalar()
+
+
+@router.post("/proxy", response_model=ProxyBidResponse, status_code=status.HTTP_201_CREATED)
+def place_proxy_bid(
+    proxy_in: ProxyBidCreate,
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
 ):
-    """Get all bids placed by the current user with product and seller info"""
-    bids = (
-        db.query(Bid)
-        .filter(Bid.bidder_id == current_user.id)
-        .order_by(Bid.created_at.desc())
-        .all()
+    """Register (or raise) a maximum bid; the engine outbids others for the user up to it.
+
+    Competing proxies are resolved immediately, in this transaction, so bidders
+    no longer need to re-bid by hand each time they are outbid.
+    """
+    # Lock the product row so proxy resolution is serialized with concurrent bids
+    product = db.query(Product).filter(Product.id == proxy_in.product_id).with_for_update().first()
+    if not product:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    if not auction_is_open(product):
+        bids_rejected.inc("inactive")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction is not active")
+    if product.seller_id == current_user.id:
+        bids_rejected.inc("own_product")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot bid on your own product")
+
+    proxy = db.get(ProxyBid, (product.id, current_user.id))
+    if proxy is not None and proxy_in.max_amount <= proxy.max_amount:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Maximum bid can only be raised")
+    leader_id = leading_bidder_id(db, product)
+    if leader_id == current_user.id:
+        if proxy_in.max_amount <= product.current_price:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maximum bid must be above {product.current_price}",
+            )
+    else:
+        check_min_required(product, proxy_in.max_amount)
+
+    if proxy is None:
+        proxy = ProxyBid(
+            product_id=product.id,
+            bidder_id=current_user.id,
+            max_amount=proxy_in.max_amount,
+            max_set_at=datetime.utcnow(),
+        )
+        db.add(proxy)
+    else:
+        # A raised maximum ranks behind anyone who reached that amount before
+        proxy.max_amount = proxy_in.max_amount
+        proxy.max_set_at = datetime.utcnow()
+    db.flush()
+
+    new_bids = resolve_proxy_bids(db, product, product.current_price, leader_id)
+    db.commit()
+    bid_rows_written.inc("proxy", amount=len(new_bids))
+    if new_bids:
+        catalog_cache.invalidate("top-bidders", "active-without-bids")
+        publish_auction_events([auction_event(product)])
+        leader_id = next(bid.bidder_id for bid in new_bids if bid.id == product.highest_bid_id)
+    return proxy_bid_response(proxy, product, leader_id)
+
+
+@router.get("/proxy/{product_id}", response_model=ProxyBidResponse)
+def get_my_proxy_bid(
+    product_id: int,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: CurrentUser,
+):
+    """The current user's maximum bid on a product and whether it is leading."""
+    proxy = db.get(ProxyBid, (product_id, current_user.id))
+    if proxy is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No maximum bid on this product")
+    product = db.get(Product, product_id)
+    return proxy_bid_response(proxy, product, leading_bidder_id(db, product))
+
+
+# Newest first for a bidder, highest first on a product; id breaks ties
+MY_BID_PAGE_KEYS = [(Bid.created_at, True), (Bid.id, True)]
+PRODUCT_BID_PAGE_KEYS = [(Bid.amount, True), (Bid.id, True)]
+
+
+def my_bids_query(bidder_id: int):
+    """One SELECT projecting exactly the columns MyBidResponse needs."""
+    return (
+        select(
+            Bid.id,
+            Bid.product_id,
+            Bid.bidder_id,
+            Bid.amount,
+            Bid.status,
+            Bid.created_at,
+            Product.title.label("product_title"),
+            User.id.label("seller_id"),
+            User.full_name.label("seller_name"),
+            User.phone_number.label("seller_phone"),
+            Order.status.label("order_status"),
+        )
+        .select_from(Bid)
+        .outerjoin(Product, Product.id == Bid.product_id)
+        .outerjoin(User, User.id == Product.seller_id)
+        # Only accepted bids have an order
+        .outerjoin(Order, and_(Order.bid_id == Bid.id, Bid.status == BidStatus.ACCEPTED))
+        .where(Bid.bidder_id == bidder_id)
     )
 
-    result = []
-    for bid in bids:
-        product = db.query(Product).filter(Product.id == bid.product_id).first()
-        seller = db.query(User).filter(User.id == product.seller_id).first() if product else None
 
+def my_bid_response(row) -> MyBidResponse:
+    return MyBidResponse(
+        id=row.id,
+        product_id=row.product_id,
+        bidder_id=row.bidder_id,
+        amount=row.amount,
+        status=row.status,
+        created_at=row.created_at,
+        product_title=row.product_title,
         # Only show seller phone if bid is accepted
-        seller_info = None
-        if seller:
-            seller_info = BidderInfo(
-                id=seller.id,
-                full_name=seller.full_name,
-                phone_number=seller.phone_number if bid.status == BidStatus.ACCEPTED else None
-            )
+        seller=BidderInfo(
+            id=row.seller_id,
+            full_name=row.seller_name,
+            phone_number=row.seller_phone if row.status == BidStatus.ACCEPTED else None,
+        ) if row.seller_id is not None else None,
+        order_status=row.order_status.value if row.order_status else None,
+    )
+
 
-        # Get order status if bid is accepted
-        order_status = None
-        if bid.status == BidStatus.ACCEPTED:
-            order = db.query(Order).filter(Order.bid_id == bid.id).first()
-            if order:
-                order_status = order.status.value
+def product_bids_query(product_id: int):
+    """One SELECT projecting exactly the columns BidWithBidderResponse needs."""
+    return (
+        select(
+            Bid.id,
+            Bid.product_id,
+            Bid.bidder_id,
+            Bid.amount,
+            Bid.status,
+            Bid.created_at,
+            User.full_name.label("bidder_name"),
+            User.phone_number.label("bidder_phone"),
+        )
+        .select_from(Bid)
+        .join(User, User.id == Bid.bidder_id)
+        .where(Bid.product_id == product_id)
+    )
 
-        result.append(MyBidResponse(
-            id=bid.id,
-            product_id=bid.product_id,
-            bidder_id=bid.bidder_id,
-            amount=bid.amount,
-            status=bid.status,
-            created_at=bid.created_at,
-            product_title=product.title if product else None,
-            seller=seller_info,
-            order_status=order_status,
-        ))
 
-    return result
+def product_bid_response(row) -> BidWithBidderResponse:
+    return BidWithBidderResponse(
+        id=row.id,
+        product_id=row.product_id,
+        bidder_id=row.bidder_id,
+        amount=row.amount,
+        status=row.status,
+        created_at=row.created_at,
+        bidder=BidderInfo(id=row.bidder_id, full_name=row.bidder_name, phone_number=row.bidder_phone),
+    )
+
+
+@router.get("/me", response_model=list[MyBidResponse])
+def list_my_bids(
+    db: Annotated[Session, Depends(get_db)],
+    current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+):
+    """Get all bids placed by the current user with product and seller info"""
+    rows = db.execute(apply_keyset(my_bids_query(current_user.id), MY_BID_PAGE_KEYS, page)).all()
+    rows, _ = finish_page(rows, page, lambda row: (row.created_at, row.id), response)
+    return [my_bid_response(row) for row in rows]
 
 
 @router.get("/product/{product_id}", response_model=list[BidWithBidderResponse])
@@ -125,39 +606,20 @@ def list_product_bids(
     product_id: int,
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
     """Get all bids on a product (only for the product owner)"""
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
+    seller_id = db.scalar(select(Product.seller_id).where(Product.id == product_id))
+    if seller_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
-    if product.seller_id != current_user.id:
+    if seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to view bids")
 
-    bids = (
-        db.query(Bid)
-        .filter(Bid.product_id == product_id)
-        .order_by(desc(Bid.amount))
-        .all()
-    )
-
-    result = []
-    for bid in bids:
-        bidder = db.query(User).filter(User.id == bid.bidder_id).first()
-        result.append(BidWithBidderResponse(
-            id=bid.id,
-            product_id=bid.product_id,
-            bidder_id=bid.bidder_id,
-            amount=bid.amount,
-            status=bid.status,
-            created_at=bid.created_at,
-            bidder=BidderInfo(
-                id=bidder.id,
-                full_name=bidder.full_name,
-                phone_number=bidder.phone_number
-            ) if bidder else None,
-        ))
-
-    return result
+    # Seeks along ix_bids_product_amount (product_id, amount)
+    rows = db.execute(apply_keyset(product_bids_query(product_id), PRODUCT_BID_PAGE_KEYS, page)).all()
+    rows, _ = finish_page(rows, page, lambda row: (row.amount, row.id), response)
+    return [product_bid_response(row) for row in rows]
 
 
 @router.post("/{bid_id}/accept", response_model=OrderResponse)
@@ -167,7 +629,8 @@ def accept_bid(
     current_user: CurrentUser,
 ):
     bid = get_bid_or_404(db, bid_id)
-    product = db.query(Product).filter(Product.id == bid.product_id).first()
+    # Lock the product row so the decision is serialized with concurrent bids
+    product = db.query(Product).filter(Product.id == bid.product_id).with_for_update().first()
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     if product.seller_id != current_user.id:
@@ -179,26 +642,14 @@ def accept_bid(
     if existing_order:
         return existing_order
 
-    bid.status = BidStatus.ACCEPTED
-    product.accepted_bid_id = bid.id
-    product.status = ProductStatus.SOLD
-
-    db.query(Bid).filter(
-        Bid.product_id == product.id,
-        Bid.id != bid.id,
-        Bid.status == BidStatus.PENDING,
-    ).update({Bid.status: BidStatus.REJECTED})
-
-    order = Order(
-        product_id=product.id,
-        buyer_id=bid.bidder_id,
-        seller_id=product.seller_id,
-        bid_id=bid.id,
-        total_amount=bid.amount,
-        status=OrderStatus.AWAITING_PAYMENT,
-    )
-    db.add(order)
+    order = create_order_for_bid(db, product, bid)
+    db.query(ProxyBid).filter(ProxyBid.product_id == product.id).delete(synchronize_session=False)
+    event = auction_event(product)
     db.commit()
+    # Accepting an outbid bid rejects the leading one, which leaves the price curve
+    window_cache.invalidate(price_series_namespace(product.id))
+    orders_created.inc("accepted")
+    publish_auction_events([event])
     db.refresh(order)
     return order
 
@@ -210,13 +661,29 @@ def reject_bid(
     current_user: CurrentUser,
 ):
     bid = get_bid_or_404(db, bid_id)
-    product = db.query(Product).filter(Product.id == bid.product_id).first()
+    # Lock the product row so the decision is serialized with concurrent bids
+    product = db.query(Product).filter(Product.id == bid.product_id).with_for_update().first()
     if not product:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
     if product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to reject bids")
 
     bid.status = BidStatus.REJECTED
+
+    # Rejecting the leading bid hands the lead back to the next live bid
+    events = []
+    if product.highest_bid_id == bid.id:
+        db.flush()
+        refresh_auction_summary(db, product)
+        if product.status == ProductStatus.ACTIVE and product.highest_bid_id is not None:
+            db.query(Bid).filter(
+                Bid.id == product.highest_bid_id,
+                Bid.status == BidStatus.OUTBID,
+            ).update({Bid.status: BidStatus.PENDING})
+        events.append(auction_event(product))
+
     db.commit()
+    window_cache.invalidate(price_series_namespace(product.id))
+    publish_auction_events(events)
     db.refresh(bid)
     return bid
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser
-from app.core.database import get_db
+from app.core.cache import catalog_cache
+from app.core.database import get_db, get_read_db
 from app.models import Category
 from app.schemas import CategoryCreate, CategoryResponse
 
@@ -12,8 +13,14 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 
 
 @router.get("/", response_model=list[CategoryResponse])
-def list_categories(db: Annotated[Session, Depends(get_db)]):
-    return db.query(Category).order_by(Category.name.asc()).all()
+def list_categories(db: Annotated[Session, Depends(get_read_db)]):
+    return catalog_cache.get_or_load(
+        "categories",
+        lambda: [
+            CategoryResponse.model_validate(category)
+            for category in db.query(Category).order_by(Category.name.asc())
+        ],
+    )
 
 
 @router.post("/", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
@@ -30,4 +37,5 @@ def create_category(
     db.add(category)
     db.commit()
     db.refresh(category)
+    catalog_cache.invalidate("categories")
     return category
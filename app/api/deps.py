@@ -1,24 +1,43 @@
 from __future__ import annotations
 
+import time
+from dataclasses import dataclass
 from typing import Annotated, Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, undefer
 
+from app.core.cache import named_cache
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.security import token_digest
+from app.core.database import get_async_db, get_db
 from app.models import User
 from app.schemas import TokenPayload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def get_current_user(
-    db: Annotated[Session, Depends(get_db)],
-    token: Annotated[str, Depends(oauth2_scheme)],
-) -> User:
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user as carried by the access token.
+
+    Email and name come from the token claims, so they reflect the user at login
+    time; endpoints that need current profile data should use CurrentUserFull.
+    """
+    id: int
+    email: str
+    full_name: str
+
+
+# Verified tokens, keyed by their digest so the cache never holds usable credentials
+principal_cache = named_cache("principals", maxsize=10_000, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def resolve_principal(db: Session, token: str) -> Principal:
+    """Verify and decode the token into a Principal and cache it until the token expires."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -33,17 +52,65 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == token_data.sub).first()
-    if user is None:
-        raise credentials_exception
-    return user
+    # The signature cannot change, so claims-only principals stay valid as long as the token
+    ttl = payload.get("exp", 0) - time.time()
+    if payload.get("email") and payload.get("name"):
+        principal = Principal(id=token_data.sub, email=payload["email"], full_name=payload["name"])
+    else:
+        # Tokens issued before the claims were added: look up the slim columns only
+        row = db.query(User.id, User.email, User.full_name).filter(User.id == token_data.sub).first()
+        if row is None:
+            raise credentials_exception
+        principal = Principal(id=row.id, email=row.email, full_name=row.full_name)
+        ttl = min(settings.PRINCIPAL_CACHE_TTL_SECONDS, ttl)
+
+    principal_cache.set(token_digest(token), principal, ttl=ttl)
+    return principal
+
+
+def get_current_user(
+    db: Annotated[Session, Depends(get_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> Principal:
+    principal = principal_cache.get(token_digest(token))
+    if principal is not None:
+        return principal
+    return resolve_principal(db, token)
+
+
+async def get_current_user_async(
+    db: Annotated[AsyncSession, Depends(get_async_db)],
+    token: Annotated[str, Depends(oauth2_scheme)],
+) -> Principal:
+    principal = principal_cache.get(token_digest(token))
+    if principal is not None:
+        return principal
+    return await db.run_sync(resolve_principal, token)
 
 
 def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)],
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)],
+) -> Principal:
     return current_user
 
 
+def get_current_user_full(
+    db: Annotated[Session, Depends(get_db)],
+    principal: Annotated[Principal, Depends(get_current_active_user)],
+) -> User:
+    user = db.query(User).options(undefer(User.profile_image)).filter(User.id == principal.id).first()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+
 # Convenience dependency - all users have same permissions
-CurrentUser = Annotated[User, Depends(get_current_active_user)]
+CurrentUser = Annotated[Principal, Depends(get_current_active_user)]
+# Full User row, for the few endpoints that read or edit the profile
+CurrentUserFull = Annotated[User, Depends(get_current_user_full)]
+# Same principal, resolved without blocking the event loop (DB_MODE=async)
+AsyncCurrentUser = Annotated[Principal, Depends(get_current_user_async)]
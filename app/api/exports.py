@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import csv
+import enum
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterator, Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from sqlalchemy import select
+
+from app.api.deps import CurrentUser, Principal
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.scheduler import to_naive_utc
+from app.models import Bid, Order, Payment, Product
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+ExportFormat = Literal["csv", "ndjson"]
+MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_scope(current_user: Principal, seller_id: Optional[int]) -> Optional[int]:
+    """The seller whose history is exported; None means every seller.
+
+    Sellers can only export their own history, EXPORT_ADMIN_EMAILS accounts any
+    seller's (or everything when no seller_id is given).
+    """
+    if current_user.email in settings.EXPORT_ADMIN_EMAILS:
+        return seller_id
+    if seller_id is not None and seller_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to export this seller")
+    return current_user.id
+
+
+def within(stmt, column, start: Optional[datetime], end: Optional[datetime]):
+    if start and end and to_naive_utc(start) >= to_naive_utc(end):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if start:
+        stmt = stmt.where(column >= to_naive_utc(start))
+    if end:
+        stmt = stmt.where(column < to_naive_utc(end))
+    return stmt
+
+
+def plain(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def export_rows(stmt, fmt: ExportFormat) -> Iterator[str]:
+    """Stream ``stmt`` as CSV or NDJSON, one chunk per EXPORT_BATCH_SIZE rows.
+
+    ``yield_per`` makes the driver use a server-side cursor, so only one batch
+    is ever held in memory. The session is opened here rather than injected:
+    dependency sessions are closed before the response body is sent.
+    """
+    db = SessionLocal(info={"read_only": True})
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def drain() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    try:
+        result = db.execute(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        columns = list(result.keys())
+        if fmt == "csv":
+            writer.writerow(columns)
+        for batch in result.partitions():
+            for row in batch:
+                values = [plain(value) for value in row]
+                if fmt == "csv":
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(columns, values)), separators=(",", ":")) + "\n")
+            yield drain()
+        yield drain()
+    except Exception:
+        # Headers are already sent; the client sees a truncated file
+        logger.exception("Export failed mid-stream")
+        raise
+    finally:
+        db.close()
+
+
+def export_response(name: str, stmt, fmt: ExportFormat) -> StreamingResponse:
+    filename = f"{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{fmt}"
+    return StreamingResponse(
+        export_rows(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/bids")
+def export_bids(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query("csv", alias="format"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    seller_id: Optional[int] = Query(None),
+):
+    """Bids received on a seller's products, oldest first."""
+    seller_id = export_scope(current_user, seller_id)
+    stmt = (
+        select(
+            Bid.id,
+            Bid.product_id,
+            Product.title.label("product_title"),
+            Product.seller_id,
+            Bid.bidder_id,
+            Bid.amount,
+            Bid.status,
+            Bid.created_at,
+        )
+        .join(Product, Product.id == Bid.product_id)
+        .order_by(Bid.id)
+    )
+    stmt = within(stmt, Bid.created_at, start, end)
+    if seller_id is not None:
+        stmt = stmt.where(Product.seller_id == seller_id)
+    return export_response("bids", stmt, fmt)
+
+
+@router.get("/orders")
+def export_orders(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query("csv", alias="format"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    seller_id: Optional[int] = Query(None),
+):
+    """A seller's orders, oldest first."""
+    seller_id = export_scope(current_user, seller_id)
+    stmt = (
+        select(
+            Order.id,
+            Order.product_id,
+            Product.title.label("product_title"),
+            Order.seller_id,
+            Order.buyer_id,
+            Order.bid_id,
+            Order.total_amount,
+            Order.status,
+            Order.created_at,
+        )
+        .outerjoin(Product, Product.id == Order.product_id)
+        .order_by(Order.id)
+    )
+    stmt = within(stmt, Order.created_at, start, end)
+    if seller_id is not None:
+        stmt = stmt.where(Order.seller_id == seller_id)
+    return export_response("orders", stmt, fmt)
+
+
+@router.get("/payments")
+def export_payments(
+    current_user: CurrentUser,
+    fmt: ExportFormat = Query("csv", alias="format"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    seller_id: Optional[int] = Query(None),
+):
+    """Payments for a seller's orders, oldest first."""
+    seller_id = export_scope(current_user, seller_id)
+    stmt = (
+        select(
+            Payment.id,
+            Payment.order_id,
+            Order.product_id,
+            Order.seller_id,
+            Order.buyer_id,
+            Order.total_amount.label("amount"),
+            Payment.provider,
+            Payment.payment_ref,
+            Payment.status,
+            Payment.paid_at,
+            Payment.created_at,
+        )
+        .join(Order, Order.id == Payment.order_id)
+        .order_by(Payment.id)
+    )
+    stmt = within(stmt, Payment.created_at, start, end)
+    if seller_id is not None:
+        stmt = stmt.where(Order.seller_id == seller_id)
+    return export_response("payments", stmt, fmt)
@@ -3,7 +3,9 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.api.analytics import record_favorite
 from app.api.deps import CurrentUser
+from app.core.cache import catalog_cache
 from app.core.database import get_db
 from app.models import Favorite, Product, ProductStatus
 from app.schemas import FavoriteCreate, FavoriteResponse
@@ -50,8 +52,10 @@ def add_favorite(
 
     favorite = Favorite(user_id=current_user.id, product_id=favorite_in.product_id)
     db.add(favorite)
+    record_favorite(db, favorite.product_id, 1)
     db.commit()
     db.refresh(favorite)
+    catalog_cache.invalidate("trending-products")
     return favorite
 
 
@@ -78,8 +82,10 @@ def add_favorite_by_id(
 
     favorite = Favorite(user_id=current_user.id, product_id=product_id)
     db.add(favorite)
+    record_favorite(db, favorite.product_id, 1)
     db.commit()
     db.refresh(favorite)
+    catalog_cache.invalidate("trending-products")
     return favorite
 
 
@@ -100,5 +106,7 @@ def remove_favorite(
     if not favorite:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Favorite not found")
     db.delete(favorite)
+    record_favorite(db, product_id, -1)
     db.commit()
+    catalog_cache.invalidate("trending-products")
     return None
@@ -0,0 +1,35 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from fastapi.responses import FileResponse
+
+from app.core.image_store import HASH_PATTERN, image_store
+
+router = APIRouter(prefix="/images", tags=["Images"])
+
+# Content-addressed: a URL always maps to the same bytes
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/{image_hash}")
+def get_image(
+    image_hash: str,
+    size: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+):
+    if not HASH_PATTERN.match(image_hash) or not image_store.exists(image_hash):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Image not found")
+    if size is not None and size not in image_store.thumbnail_sizes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Size must be one of {image_store.thumbnail_sizes}",
+        )
+
+    etag = f'"{image_hash}"' if size is None else f'"{image_hash}-{size}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if size is None:
+        return FileResponse(image_store.path_for(image_hash), media_type=image_store.media_type(image_hash), headers=headers)
+    return FileResponse(image_store.path_for(image_hash, size), media_type="image/webp", headers=headers)
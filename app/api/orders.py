@@ -1,63 +1,98 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased
 
 from app.api.deps import CurrentUser
 from app.core.database import get_db
+from app.core.pagination import PageParams, apply_keyset, finish_page
 from app.models import Order, Product, User
 from app.schemas import OrderResponse
 from app.schemas.order import SellerInfo
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
+ORDER_PAGE_KEYS = [(Order.created_at, True), (Order.id, True)]
+
+Seller = aliased(User, name="seller")
+Buyer = aliased(User, name="buyer")
+
+
+def order_page_key(order) -> tuple:
+    return order.created_at, order.id
+
+
+def orders_query():
+    """One SELECT projecting the OrderResponse columns, with product title, seller and buyer joined in.
+
+    Only the few user columns the response shows are read, never whole User rows.
+    """
+    return (
+        select(
+            Order.id,
+            Order.product_id,
+            Order.buyer_id,
+            Order.seller_id,
+            Order.bid_id,
+            Order.total_amount,
+            Order.status,
+            Order.created_at,
+            Product.title.label("product_title"),
+            Seller.full_name.label("seller_name"),
+            Seller.phone_number.label("seller_phone"),
+            Buyer.full_name.label("buyer_name"),
+            Buyer.phone_number.label("buyer_phone"),
+        )
+        .select_from(Order)
+        .outerjoin(Product, Product.id == Order.product_id)
+        .outerjoin(Seller, Seller.id == Order.seller_id)
+        .outerjoin(Buyer, Buyer.id == Order.buyer_id)
+    )
+
+
+def order_response(row) -> OrderResponse:
+    return OrderResponse(
+        id=row.id,
+        product_id=row.product_id,
+        buyer_id=row.buyer_id,
+        seller_id=row.seller_id,
+        bid_id=row.bid_id,
+        total_amount=row.total_amount,
+        status=row.status,
+        created_at=row.created_at,
+        product_title=row.product_title,
+        seller=SellerInfo(
+            id=row.seller_id, full_name=row.seller_name, phone_number=row.seller_phone
+        ) if row.seller_name is not None else None,
+        buyer=SellerInfo(
+            id=row.buyer_id, full_name=row.buyer_name, phone_number=row.buyer_phone
+        ) if row.buyer_name is not None else None,
+    )
+
+
+def list_orders_page(db: Session, condition, page: PageParams, response: Response) -> list[OrderResponse]:
+    # Seeks along ix_orders_buyer_created / ix_orders_seller_created
+    rows = db.execute(apply_keyset(orders_query().where(condition), ORDER_PAGE_KEYS, page)).all()
+    rows, _ = finish_page(rows, page, order_page_key, response)
+    return [order_response(row) for row in rows]
+
 
 @router.get("/me", response_model=list[OrderResponse])
 def list_my_orders(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
-    orders_list = (
-        db.query(Order)
-        .filter(Order.buyer_id == current_user.id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
-
-    result = []
-    for order in orders_list:
-        product = db.query(Product).filter(Product.id == order.product_id).first()
-        seller = db.query(User).filter(User.id == order.seller_id).first()
-
-        order_dict = {
-            "id": order.id,
-            "product_id": order.product_id,
-            "buyer_id": order.buyer_id,
-            "seller_id": order.seller_id,
-            "bid_id": order.bid_id,
-            "total_amount": order.total_amount,
-            "status": order.status,
-            "created_at": order.created_at,
-            "product_title": product.title if product else None,
-            "seller": SellerInfo(
-                id=seller.id,
-                full_name=seller.full_name,
-                phone_number=seller.phone_number
-            ) if seller else None
-        }
-        result.append(order_dict)
-
-    return result
+    return list_orders_page(db, Order.buyer_id == current_user.id, page, response)
 
 
 @router.get("/sales", response_model=list[OrderResponse])
 def list_my_sales(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
-    return (
-        db.query(Order)
-        .filter(Order.seller_id == current_user.id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
+    return list_orders_page(db, Order.seller_id == current_user.id, page, response)
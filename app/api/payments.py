@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.api.deps import CurrentUser
 from app.core.database import get_db
+from app.core.metrics import payments_succeeded
 from app.models import Order, OrderStatus, Payment, PaymentStatus, Product, ProductStatus
 from app.schemas import PaymentCreate, PaymentResponse
 
@@ -43,5 +44,6 @@ def create_payment(
 
     db.add(payment)
     db.commit()
+    payments_succeeded.inc()
     db.refresh(payment)
     return payment
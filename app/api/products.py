@@ -1,19 +1,129 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 from datetime import datetime, timezone
-from typing import Annotated, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-
+from typing import Annotated, AsyncIterator, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+
+from app.api.bids import auction_closer, auction_event, auction_topic
 from app.api.deps import CurrentUser
-from app.core.database import get_db
-from app.models import Bid, Favorite, Order, Product, ProductImage, ProductStatus, User
-from app.schemas import ProductCreate, ProductImageCreate, ProductImageResponse, ProductResponse, ProductUpdate, ProductWithDetailsResponse, SellerInfo
+from app.api.timeseries import forget_buckets, sell_through_keys
+from app.core.cache import catalog_cache
+from app.core.config import settings
+from app.core.database import SessionLocal, get_db, get_read_db
+from app.core.image_store import InvalidImageError, image_store
+from app.core.metrics import feed_enrichment
+from app.core.pagination import PageParams, apply_keyset, finish_page, set_page_headers
+from app.core.pubsub import Subscription, hub
+from app.core.scheduler import to_naive_utc
+from app.core.search import make_search_backend, parse_query
+from app.models import Category, Favorite, Order, Product, ProductImage, ProductStatus, User
+from app.schemas import (
+    CategoryFacet,
+    ProductBulkItem,
+    ProductBulkResponse,
+    ProductBulkResult,
+    ProductCreate,
+    ProductImageCreate,
+    ProductImageResponse,
+    ProductResponse,
+    ProductSearchHit,
+    ProductSearchResponse,
+    ProductUpdate,
+    ProductWithDetailsResponse,
+    SearchFacets,
+    SellerInfo,
+    StatusFacet,
+)
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
+# Newest first; id breaks ties between products created in the same second
+PRODUCT_PAGE_KEYS = [(Product.created_at, True), (Product.id, True)]
+
+
+def product_page_key(product: Product) -> tuple:
+    return product.created_at, product.id
+
+
+product_search = make_search_backend(Product.title, Product.description)
+
+
+def apply_text_search(query, q: Optional[str]):
+    """Filter a product query by the search terms in ``q`` (all must match)."""
+    terms = parse_query(q) if q else []
+    return query.filter(product_search.condition(terms)) if terms else query
+
+
+def search_facets(
+    db: Session,
+    condition,
+    category_id: Optional[int],
+    status_filter: Optional[ProductStatus],
+) -> SearchFacets:
+    """Match counts per category and per status; each facet ignores its own filter."""
+    categories = (
+        db.query(Category.id, Category.name, func.count(Product.id).label("count"))
+        .join(Product, Product.category_id == Category.id)
+        .filter(condition)
+    )
+    if status_filter:
+        categories = categories.filter(Product.status == status_filter)
+    categories = categories.group_by(Category.id, Category.name).order_by(func.count(Product.id).desc(), Category.name)
+
+    statuses = db.query(Product.status, func.count(Product.id).label("count")).filter(condition)
+    if category_id:
+        statuses = statuses.filter(Product.category_id == category_id)
+    statuses = statuses.group_by(Product.status)
+
+    return SearchFacets(
+        category=[CategoryFacet(id=row.id, name=row.name, count=row.count) for row in categories],
+        status=[StatusFacet(status=row.status, count=row.count) for row in statuses],
+    )
+
+
+def search_products(
+    db: Session,
+    q: str,
+    page: PageParams,
+    response: Response,
+    category_id: Optional[int] = None,
+    status_filter: Optional[ProductStatus] = None,
+) -> ProductSearchResponse:
+    terms = parse_query(q)
+    if not terms:
+        set_page_headers(response, page, None)
+        return ProductSearchResponse(items=[], facets=SearchFacets())
+
+    condition = product_search.condition(terms)
+    relevance = product_search.relevance(terms)
+    query = db.query(Product, relevance.label("relevance")).options(selectinload(Product.images)).filter(condition)
+    if category_id:
+        query = query.filter(Product.category_id == category_id)
+    if status_filter:
+        query = query.filter(Product.status == status_filter)
+
+    rows = apply_keyset(query, [(relevance, True), (Product.id, True)], page).all()
+    rows, _ = finish_page(rows, page, lambda row: (row.relevance, row.Product.id), response)
+
+    return ProductSearchResponse(
+        items=[
+            ProductSearchHit(**ProductResponse.model_validate(product).model_dump(), relevance=score)
+            for product, score in rows
+        ],
+        facets=None if page.cursor else search_facets(db, condition, category_id, status_filter),
+    )
+
 
 def get_product_or_404(db: Session, product_id: int) -> Product:
     product = db.query(Product).filter(Product.id == product_id).first()
@@ -22,69 +132,107 @@ def get_product_or_404(db: Session, product_id: int) -> Product:
     return product
 
 
+def enrich_products_with_details(db: Session, products: list[Product], current_user_id: int) -> list[dict]:
+    """Add seller info, highest bid, favorite status, order status and images to a list of products.
+
+    Everything is resolved with a fixed number of set-based queries, so the cost
+    does not grow with the number of products. Highest bid and bid count come
+    from the denormalized columns on Product.
+    """
+    if not products:
+        return []
+
+    started = time.perf_counter()
+    product_ids = [p.id for p in products]
+    seller_ids = {p.seller_id for p in products}
+
+    # Sellers (only the columns SellerInfo needs)
+    sellers = {
+        row.id: row
+        for row in db.query(User.id, User.full_name, User.phone_number).filter(User.id.in_(seller_ids))
+    }
+
+    # Products favorited by current user
+    favorited_ids = {
+        row.product_id
+        for row in db.query(Favorite.product_id).filter(
+            Favorite.user_id == current_user_id,
+            Favorite.product_id.in_(product_ids),
+        )
+    }
+
+    # Order status for sold products (for sellers)
+    sold_ids = [
+        p.id for p in products
+        if p.status == ProductStatus.SOLD and p.seller_id == current_user_id
+    ]
+    order_statuses = {}
+    if sold_ids:
+        for row in db.query(Order.product_id, Order.status).filter(Order.product_id.in_(sold_ids)):
+            order_statuses.setdefault(row.product_id, row.status.value)
+
+    # Images, grouped by product
+    images: dict[int, list[ProductImage]] = {product_id: [] for product_id in product_ids}
+    for image in (
+        db.query(ProductImage)
+        .filter(ProductImage.product_id.in_(product_ids))
+        .order_by(ProductImage.product_id, ProductImage.position, ProductImage.id)
+    ):
+        images[image.product_id].append(image)
+
+    result = []
+    for product in products:
+        seller = sellers.get(product.seller_id)
+        result.append({
+            **{c.name: getattr(product, c.name) for c in product.__table__.columns},
+            "images": images[product.id],
+            "seller": SellerInfo(
+                id=seller.id,
+                full_name=seller.full_name,
+                phone_number=seller.phone_number
+            ) if seller else None,
+            "highest_bid": product.current_price,
+            "is_favorited": product.id in favorited_ids,
+            "order_status": order_statuses.get(product.id),
+        })
+    feed_enrichment.observe(time.perf_counter() - started)
+    return result
+
+
 def enrich_product_with_details(db: Session, product: Product, current_user_id: int) -> dict:
     """Add seller info, highest bid, favorite status, and order status to product"""
-    # Get seller info
-    seller = db.query(User).filter(User.id == product.seller_id).first()
-
-    # Get highest bid
-    highest_bid_result = db.query(func.max(Bid.amount)).filter(Bid.product_id == product.id).scalar()
-
-    # Get bid count
-    bid_count = db.query(func.count(Bid.id)).filter(Bid.product_id == product.id).scalar()
-
-    # Check if favorited by current user
-    is_favorited = db.query(Favorite).filter(
-        Favorite.user_id == current_user_id,
-        Favorite.product_id == product.id
-    ).first() is not None
-
-    # Get order status if product is sold (for sellers)
-    order_status = None
-    if product.status == ProductStatus.SOLD and product.seller_id == current_user_id:
-        order = db.query(Order).filter(Order.product_id == product.id).first()
-        if order:
-            order_status = order.status.value
-
-    return {
-        **{c.name: getattr(product, c.name) for c in product.__table__.columns},
-        "images": product.images,
-        "seller": SellerInfo(
-            id=seller.id,
-            full_name=seller.full_name,
-            phone_number=seller.phone_number
-        ) if seller else None,
-        "highest_bid": highest_bid_result,
-        "bid_count": bid_count or 0,
-        "is_favorited": is_favorited,
-        "order_status": order_status,
-    }
+    return enrich_products_with_details(db, [product], current_user_id)[0]
 
 
 @router.get("/", response_model=list[ProductResponse])
 def list_products(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
     status_filter: Optional[ProductStatus] = Query(None, alias="status"),
     category_id: Optional[int] = None,
     seller_id: Optional[int] = None,
     q: Optional[str] = None,
 ):
-    query = db.query(Product)
+    query = db.query(Product).options(selectinload(Product.images))
     if status_filter:
         query = query.filter(Product.status == status_filter)
     if category_id:
         query = query.filter(Product.category_id == category_id)
     if seller_id:
         query = query.filter(Product.seller_id == seller_id)
-    if q:
-        query = query.filter(Product.title.ilike(f"%{q}%"))
-    return query.order_by(Product.created_at.desc()).all()
+    query = apply_text_search(query, q)
+    rows = apply_keyset(query, PRODUCT_PAGE_KEYS, page).all()
+    products, _ = finish_page(rows, page, product_page_key, response)
+    return products
 
 
 @router.get("/feed", response_model=list[ProductWithDetailsResponse])
 def get_feed(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[Session, Depends(get_read_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
     q: Optional[str] = None,
 ):
     """Get all products from other users (not current user's products)"""
@@ -92,39 +240,58 @@ def get_feed(
         Product.seller_id != current_user.id,
         Product.status == ProductStatus.ACTIVE,
     )
-    if q:
-        query = query.filter(Product.title.ilike(f"%{q}%"))
+    query = apply_text_search(query, q)
 
-    products = query.order_by(Product.created_at.desc()).all()
-    return [enrich_product_with_details(db, p, current_user.id) for p in products]
+    rows = apply_keyset(query, PRODUCT_PAGE_KEYS, page).all()
+    products, _ = finish_page(rows, page, product_page_key, response)
+    return enrich_products_with_details(db, products, current_user.id)
 
 
 @router.get("/my-products", response_model=list[ProductWithDetailsResponse])
 def get_my_products(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
     """Get current user's products"""
-    products = db.query(Product).filter(
-        Product.seller_id == current_user.id
-    ).order_by(Product.created_at.desc()).all()
+    query = db.query(Product).filter(Product.seller_id == current_user.id)
+    rows = apply_keyset(query, PRODUCT_PAGE_KEYS, page).all()
+    products, _ = finish_page(rows, page, product_page_key, response)
 
-    return [enrich_product_with_details(db, p, current_user.id) for p in products]
+    return enrich_products_with_details(db, products, current_user.id)
 
 
 @router.get("/favorites", response_model=list[ProductWithDetailsResponse])
 def get_favorite_products(
     db: Annotated[Session, Depends(get_db)],
     current_user: CurrentUser,
+    response: Response,
+    page: Annotated[PageParams, Depends()],
 ):
     """Get products favorited by current user"""
-    products = db.query(Product).join(
+    query = db.query(Product).join(
         Favorite, Favorite.product_id == Product.id
     ).filter(
         Favorite.user_id == current_user.id
-    ).order_by(Product.created_at.desc()).all()
+    )
+    rows = apply_keyset(query, PRODUCT_PAGE_KEYS, page).all()
+    products, _ = finish_page(rows, page, product_page_key, response)
+
+    return enrich_products_with_details(db, products, current_user.id)
+
 
-    return [enrich_product_with_details(db, p, current_user.id) for p in products]
+@router.get("/search", response_model=ProductSearchResponse)
+def search(
+    db: Annotated[Session, Depends(get_read_db)],
+    response: Response,
+    page: Annotated[PageParams, Depends()],
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = None,
+    status_filter: Optional[ProductStatus] = Query(None, alias="status"),
+):
+    """Full-text search over title and description, best matches first"""
+    return search_products(db, q, page, response, category_id, status_filter)
 
 
 @router.get("/{product_id}", response_model=ProductResponse)
@@ -143,6 +310,55 @@ def get_product_details(
     return enrich_product_with_details(db, product, current_user.id)
 
 
+def load_auction_event(product_id: int) -> Optional[dict]:
+    with SessionLocal() as db:
+        product = db.get(Product, product_id)
+        return auction_event(product) if product else None
+
+
+async def auction_event_stream(subscription: Subscription, snapshot: dict) -> AsyncIterator[str]:
+    try:
+        event = snapshot
+        while True:
+            yield f"event: auction\ndata: {json.dumps(event)}\n\n"
+            if event["status"] != ProductStatus.ACTIVE.value:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.get(), settings.STREAM_KEEPALIVE_SECONDS)
+                    break
+                except asyncio.TimeoutError:
+                    # Comment line; keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("/{product_id}/stream")
+async def stream_product(product_id: int):
+    """Server-sent events with the auction's price, bid count and status as they change.
+
+    The first event is the current state; the stream ends once the auction is
+    no longer active.
+    """
+    # Subscribe before reading the snapshot so no update falls in between
+    subscription = hub.subscribe(auction_topic(product_id))
+    try:
+        snapshot = await run_in_threadpool(load_auction_event, product_id)
+    except BaseException:
+        hub.unsubscribe(subscription)
+        raise
+    if snapshot is None:
+        hub.unsubscribe(subscription)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+
+    return StreamingResponse(
+        auction_event_stream(subscription, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 def create_product(
     product_in: ProductCreate,
@@ -165,9 +381,161 @@ def create_product(
     db.add(product)
     db.commit()
     db.refresh(product)
+    auction_closer.schedule(product.id, product.auction_end_at)
+    catalog_cache.invalidate("active-without-bids")
     return product
 
 
+BulkItem = tuple[Optional[ProductBulkItem], list[str]]
+
+
+def parse_bulk_item(raw, from_json: bool = False) -> BulkItem:
+    try:
+        item = ProductBulkItem.model_validate_json(raw) if from_json else ProductBulkItem.model_validate(raw)
+    except ValidationError as exc:
+        return None, [f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors()]
+    return item, []
+
+
+async def read_bulk_items(request: Request) -> list[BulkItem]:
+    """Parse a bulk body: a JSON array, or NDJSON parsed line by line as it streams in."""
+    items: list[BulkItem] = []
+
+    def add(item: BulkItem) -> None:
+        if len(items) >= settings.PRODUCT_BULK_MAX_ITEMS:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"At most {settings.PRODUCT_BULK_MAX_ITEMS} items per request",
+            )
+        items.append(item)
+
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        pending = b""
+        async for chunk in request.stream():
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                if line.strip():
+                    add(parse_bulk_item(line, from_json=True))
+        if pending.strip():
+            add(parse_bulk_item(pending, from_json=True))
+        return items
+
+    try:
+        body = json.loads(await request.body())
+    except ValueError:
+        body = None
+    if not isinstance(body, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Body must be a JSON array or NDJSON")
+    for raw in body:
+        add(parse_bulk_item(raw))
+    return items
+
+
+def import_products(db: Session, seller_id: int, items: list[BulkItem]) -> ProductBulkResponse:
+    """Validate every item, then insert the valid ones PRODUCT_BULK_CHUNK_SIZE per transaction.
+
+    Products are added through one flush per chunk, which the dialect turns into
+    batched INSERTs where it can return the new ids (RETURNING); their images go
+    in as a single executemany. A chunk that fails is rolled back and reported
+    without affecting the others. Inline images are only checked while
+    validating and written to the image store with their chunk, just before it
+    commits: invalid items store nothing, and the blobs of a chunk that fails
+    are unreferenced copies that a retry of the same images reuses.
+    """
+    started = time.perf_counter()
+    results = [ProductBulkResult(index=index, errors=errors) for index, (_, errors) in enumerate(items)]
+
+    category_ids = {item.category_id for item, _ in items if item is not None}
+    known_categories = set(db.scalars(select(Category.id).where(Category.id.in_(category_ids)))) if category_ids else set()
+    now = datetime.utcnow()
+    valid = []
+    for result, (item, _) in zip(results, items):
+        if item is None:
+            continue
+        if to_naive_utc(item.auction_end_at) <= now:
+            result.errors.append("auction_end_at: Auction end must be in the future")
+        if item.category_id not in known_categories:
+            result.errors.append("category_id: Category not found")
+        try:
+            staged = [image_store.stage(image.image_url) for image in item.images]
+        except InvalidImageError as exc:
+            result.errors.append(f"images: {exc}")
+        if not result.errors:
+            valid.append((result, item, staged))
+
+    for start in range(0, len(valid), settings.PRODUCT_BULK_CHUNK_SIZE):
+        chunk = valid[start:start + settings.PRODUCT_BULK_CHUNK_SIZE]
+        products = [
+            Product(
+                seller_id=seller_id,
+                category_id=item.category_id,
+                title=item.title,
+                description=item.description,
+                starting_price=item.starting_price,
+                min_increment=item.min_increment,
+                auction_end_at=to_naive_utc(item.auction_end_at),
+                status=ProductStatus.ACTIVE,
+            )
+            for _, item, _ in chunk
+        ]
+        try:
+            db.add_all(products)
+            db.flush()
+            # Read the ids now: after commit they would each cost a reload
+            product_ids = [product.id for product in products]
+            image_rows = [
+                {"product_id": product_id, "image_url": image_url, "position": image.position}
+                for product_id, (_, item, staged) in zip(product_ids, chunk)
+                for image, (image_url, _) in zip(item.images, staged)
+            ]
+            if image_rows:
+                db.execute(insert(ProductImage), image_rows)
+            # Committed rows must never point at a blob that is not there yet
+            for _, _, staged in chunk:
+                for _, data in staged:
+                    if data is not None:
+                        image_store.store(data)
+            db.commit()
+        except (SQLAlchemyError, OSError):
+            db.rollback()
+            logger.exception(f"Bulk import: chunk of {len(chunk)} products failed")
+            for result, _, _ in chunk:
+                result.errors.append("Could not be saved, please retry")
+            continue
+
+        for product_id, (result, item, _) in zip(product_ids, chunk):
+            result.id = product_id
+            auction_closer.schedule(product_id, item.auction_end_at)
+
+    created = sum(1 for result in results if result.id is not None)
+    if created:
+        catalog_cache.invalidate("active-without-bids")
+    elapsed = time.perf_counter() - started
+    return ProductBulkResponse(
+        created=created,
+        failed=len(results) - created,
+        elapsed_ms=round(elapsed * 1000, 1),
+        rows_per_second=round(created / elapsed, 1) if elapsed else 0.0,
+        results=results,
+    )
+
+
+@router.post("/bulk", response_model=ProductBulkResponse)
+async def bulk_create_products(
+    request: Request,
+    db: Annotated[Session, Depends(get_db)],
+    current_user: CurrentUser,
+):
+    """Create many products, with their images, in one request.
+
+    Send a JSON array of items, or ``application/x-ndjson`` with one item per
+    line for large imports. Each result carries the item's index and either the
+    new product id or the reasons it was rejected.
+    """
+    items = await read_bulk_items(request)
+    return await run_in_threadpool(import_products, db, current_user.id, items)
+
+
 @router.patch("/{product_id}", response_model=ProductResponse)
 def update_product(
     product_id: int,
@@ -182,11 +550,17 @@ def update_product(
     if product_in.auction_end_at is not None and product_in.auction_end_at <= datetime.now(timezone.utc):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Auction end must be in the future")
 
+    stale_buckets = sell_through_keys(db, product)
     for field, value in product_in.model_dump(exclude_unset=True).items():
         setattr(product, field, value)
 
     db.commit()
     db.refresh(product)
+    forget_buckets(stale_buckets | sell_through_keys(db, product))
+    if product.status == ProductStatus.ACTIVE:
+        auction_closer.schedule(product.id, product.auction_end_at)
+    else:
+        auction_closer.cancel(product.id)
     return product
 
 
@@ -200,8 +574,11 @@ def delete_product(
     if product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this product")
 
+    stale_buckets = sell_through_keys(db, product)
     db.delete(product)
     db.commit()
+    forget_buckets(stale_buckets)
+    auction_closer.cancel(product_id)
     return None
 
 
@@ -216,9 +593,14 @@ def add_product_image(
     if product.seller_id != current_user.id:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to add images")
 
+    try:
+        image_url = image_store.externalize(image_in.image_url)
+    except InvalidImageError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
     image = ProductImage(
         product_id=product_id,
-        image_url=image_in.image_url,
+        image_url=image_url,
         position=image_in.position,
     )
     db.add(image)
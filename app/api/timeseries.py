@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Annotated, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import get_read_db
+from app.core.scheduler import to_naive_utc
+from app.core.timeseries import (
+    BUCKET_SECONDS, bucket_starts, epoch_bucket, floor_to_bucket, grouped, load_series, window_cache,
+)
+from app.models import Bid, BidStatus, Order, Product, ProductStatus
+
+router = APIRouter(prefix="/analytics/timeseries", tags=["Analytics"])
+
+Bucket = Literal["minute", "hour", "day"]
+DEFAULT_BUCKETS = 60
+
+
+def window(bucket: Bucket, start: Optional[datetime], end: Optional[datetime]) -> tuple[int, list[datetime]]:
+    """Resolve the requested range into bucket starts; defaults to the last DEFAULT_BUCKETS buckets."""
+    seconds = BUCKET_SECONDS[bucket]
+    end = to_naive_utc(end) if end else datetime.utcnow()
+    start = to_naive_utc(start) if start else end - timedelta(seconds=seconds * DEFAULT_BUCKETS)
+    if start >= end:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start must be before end")
+    if (end - start).total_seconds() / seconds > settings.TIMESERIES_MAX_BUCKETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range spans more than {settings.TIMESERIES_MAX_BUCKETS} buckets, use a wider bucket",
+        )
+    return seconds, bucket_starts(start, end, seconds)
+
+
+@router.get("/bids")
+def bid_rate(
+    db: Annotated[Session, Depends(get_read_db)],
+    bucket: Bucket = Query("minute"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    category_id: Optional[int] = Query(None),
+):
+    """Bids placed per bucket, optionally for one category."""
+    seconds, starts = window(bucket, start, end)
+
+    def compute(lo: datetime, hi: datetime):
+        bucket_start = epoch_bucket(Bid.created_at, seconds).label("bucket")
+        stmt = (
+            select(bucket_start, func.count(Bid.id).label("bid_count"), func.sum(Bid.amount).label("volume"))
+            .where(Bid.created_at >= lo, Bid.created_at < hi)
+            .group_by(bucket_start)
+        )
+        if category_id is not None:
+            stmt = stmt.join(Product, Product.id == Bid.product_id).where(Product.category_id == category_id)
+        return grouped(db.execute(stmt), lambda row: (row.bid_count, row.volume))
+
+    series = load_series(("timeseries-bids", category_id), starts, seconds, compute, (0, None))
+    return [
+        {"bucket_start": bucket_start, "bid_count": bid_count, "volume": volume or 0}
+        for bucket_start, (bid_count, volume) in series
+    ]
+
+
+def price_series_namespace(product_id: int) -> tuple:
+    """Cache namespace of one product's price curve; bids rejected later must invalidate it."""
+    return ("timeseries-price", product_id)
+
+
+def sell_through_keys(db: Session, product: Product) -> set[tuple]:
+    """Cache keys of the sell-through buckets ``product`` is counted in, as it is now.
+
+    Closed buckets are otherwise never recomputed, so a change to a product's
+    end time, status or category, or its deletion, must drop the keys taken
+    before the change and, for an update, after it (see forget_buckets).
+    """
+    times = [product.auction_end_at]
+    times.extend(db.scalars(select(Order.created_at).where(Order.product_id == product.id)))
+    return {
+        ("timeseries-sell-through", category_id, seconds, start)
+        for seconds in BUCKET_SECONDS.values()
+        for start in {floor_to_bucket(to_naive_utc(value), seconds) for value in times}
+        for category_id in (None, product.category_id)
+    }
+
+
+def forget_buckets(keys: set[tuple]) -> None:
+    """Drop cached buckets; call after the commit, so a concurrent request cannot cache the old counts again."""
+    for key in keys:
+        window_cache.delete(key)
+
+
+@router.get("/products/{product_id}/price")
+def price_curve(
+    product_id: int,
+    db: Annotated[Session, Depends(get_read_db)],
+    bucket: Bucket = Query("hour"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+):
+    """Highest live bid per bucket and the running highest offer of one product over time.
+
+    Rejected bids were never a price the product could sell at, so they are left out.
+    """
+    if db.scalar(select(Product.id).where(Product.id == product_id)) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Product not found")
+    seconds, starts = window(bucket, start, end)
+
+    def compute(lo: datetime, hi: datetime):
+        bucket_start = epoch_bucket(Bid.created_at, seconds).label("bucket")
+        stmt = (
+            select(bucket_start, func.count(Bid.id).label("bid_count"), func.max(Bid.amount).label("high"))
+            .where(
+                Bid.product_id == product_id,
+                Bid.status != BidStatus.REJECTED,
+                Bid.created_at >= lo,
+                Bid.created_at < hi,
+            )
+            .group_by(bucket_start)
+        )
+        return grouped(db.execute(stmt), lambda row: (row.bid_count, row.high))
+
+    series = load_series((price_series_namespace(product_id),), starts, seconds, compute, (0, None))
+    # Seek along ix_bids_product_created for the price the range opens at
+    price = db.scalar(
+        select(func.max(Bid.amount)).where(
+            Bid.product_id == product_id, Bid.status != BidStatus.REJECTED, Bid.created_at < starts[0]
+        )
+    )
+    points = []
+    for bucket_start, (bid_count, high) in series:
+        if high is not None and (price is None or high > price):
+            price = high
+        points.append({"bucket_start": bucket_start, "bid_count": bid_count, "high": high, "price": price})
+    return points
+
+
+@router.get("/sell-through")
+def sell_through(
+    db: Annotated[Session, Depends(get_read_db)],
+    bucket: Bucket = Query("day"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    category_id: Optional[int] = Query(None),
+):
+    """Auctions ending vs orders created per bucket, and their ratio.
+
+    ``sold`` counts orders by creation time, ``ended`` auctions by their end
+    time, so a bucket's ratio can run above 1 when sellers accept late.
+    Auctions the seller withdrew (CLOSED) did not end and are not counted.
+    """
+    seconds, starts = window(bucket, start, end)
+
+    def compute(lo: datetime, hi: datetime):
+        ended_bucket = epoch_bucket(Product.auction_end_at, seconds).label("bucket")
+        ended_stmt = (
+            select(ended_bucket, func.count(Product.id).label("count"))
+            .where(
+                Product.status != ProductStatus.CLOSED,
+                Product.auction_end_at >= lo,
+                Product.auction_end_at < hi,
+            )
+            .group_by(ended_bucket)
+        )
+        sold_bucket = epoch_bucket(Order.created_at, seconds).label("bucket")
+        sold_stmt = (
+            select(sold_bucket, func.count(Order.id).label("count"))
+            .where(Order.created_at >= lo, Order.created_at < hi)
+            .group_by(sold_bucket)
+        )
+        if category_id is not None:
+            ended_stmt = ended_stmt.where(Product.category_id == category_id)
+            sold_stmt = sold_stmt.join(Product, Product.id == Order.product_id).where(Product.category_id == category_id)
+
+        ended = grouped(db.execute(ended_stmt), lambda row: row.count)
+        sold = grouped(db.execute(sold_stmt), lambda row: row.count)
+        return {key: (ended.get(key, 0), sold.get(key, 0)) for key in ended.keys() | sold.keys()}
+
+    series = load_series(("timeseries-sell-through", category_id), starts, seconds, compute, (0, 0))
+    return [
+        {
+            "bucket_start": bucket_start,
+            "ended": ended,
+            "sold": sold,
+            "sell_through": round(sold / ended, 4) if ended else None,
+        }
+        for bucket_start, (ended, sold) in series
+    ]
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+class _Flight:
+    """A load in progress that concurrent callers wait on instead of loading again."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        # Bumped when the key is invalidated mid-load; the loaded value is then not stored
+        self.generation = 0
+
+
+class TTLCache:
+    """Thread-safe in-process cache with a size bound (LRU eviction) and per-entry expiry.
+
+    ``get_or_load`` is single-flight: when many requests miss the same key at
+    once, only one of them runs the loader and the rest wait for its result.
+    A result whose key was invalidated while it loaded is returned but not stored.
+    Keys may be tuples whose first element is a namespace, which ``invalidate``
+    uses to drop every entry of that namespace at once.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._inflight: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._data[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._data.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def _store(self, key: Hashable, value: Any, ttl: Optional[float]) -> None:
+        # Caller holds the lock
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            generation = flight.generation
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+            with self._lock:
+                if flight.generation == generation:
+                    self._store(key, flight.value, ttl)
+            return flight.value
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._bump([key])
+
+    def invalidate(self, *namespaces: Hashable) -> None:
+        """Drop the given keys and every tuple key whose first element is one of them."""
+        def matches(key: Hashable) -> bool:
+            return key in namespaces or (isinstance(key, tuple) and bool(key) and key[0] in namespaces)
+
+        with self._lock:
+            stale = [key for key in self._data if matches(key)]
+            for key in stale:
+                del self._data[key]
+            self.invalidations += len(stale)
+            self._bump([key for key in self._inflight if matches(key)])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bump(list(self._inflight))
+
+    def _bump(self, keys) -> None:
+        # Caller holds the lock; loads already running for these keys read the old data
+        for key in keys:
+            flight = self._inflight.get(key)
+            if flight is not None:
+                flight.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_registry: dict[str, TTLCache] = {}
+
+
+def named_cache(name: str, maxsize: int = 1024, ttl: float = 60.0) -> TTLCache:
+    """Return the process-wide cache called ``name``, creating it on first use."""
+    if name not in _registry:
+        _registry[name] = TTLCache(maxsize=maxsize, ttl=ttl)
+    return _registry[name]
+
+
+def cache_stats() -> dict[str, dict]:
+    return {name: cache.stats() for name, cache in _registry.items()}
+
+
+# Read-mostly catalog data: categories and analytics leaderboards
+catalog_cache = named_cache("catalog", maxsize=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL_SECONDS)
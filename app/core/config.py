@@ -1,16 +1,99 @@
+from typing import List, Literal, Optional
+
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # "sync" runs handlers on the threadpool; "async" serves the hot read/bid
+    # endpoints from an async engine (mysql+aiomysql by default)
+    DB_MODE: Literal["sync", "async"] = "sync"
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Optional read replica for the list, feed and analytics endpoints
+    DATABASE_REPLICA_URL: Optional[str] = None
+
+    # Connection pool; the defaults cover uvicorn's 40 worker threads
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: float = 10
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    # "always" pings on every checkout, "idle" only after DB_PRE_PING_IDLE_SECONDS unused
+    DB_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_PRE_PING_IDLE_SECONDS: int = 30
+
+    # SQL profiling: share of requests that get a Server-Timing header and a
+    # per-request log line (1.0 while developing), and the slow-query log threshold
+    SQL_PROFILE_SAMPLE_RATE: float = 0.01
+    SQL_PROFILE_KEEP_SLOWEST: int = 3
+    SQL_SLOW_QUERY_MS: float = 200
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     ALGORITHM: str = "HS256"
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    # Cache lifetime for tokens without email/name claims (others are cached until they expire)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # bcrypt cost for new hashes (older hashes are upgraded on login) and the
+    # number of threads hashing runs on, outside the request threadpool
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # In-process cache for categories and analytics
+    CACHE_TTL_SECONDS: int = 30
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Content-addressed image store; thumbnail_url in responses points at the default size
+    IMAGE_STORE_DIR: str = "media/images"
+    IMAGE_THUMBNAIL_SIZES: List[int] = [128, 256, 512]
+    IMAGE_THUMBNAIL_DEFAULT_SIZE: int = 256
+
+    # Background auction closing
+    AUCTION_CLOSER_ENABLED: bool = True
+    AUCTION_CLOSER_RELOAD_SECONDS: int = 30
+    AUCTION_CLOSER_BATCH_SIZE: int = 100
+
+    # Live auction updates; set a redis:// URL to fan out across workers
+    PUBSUB_BROKER_URL: Optional[str] = None
+    PUBSUB_QUEUE_SIZE: int = 100
+    STREAM_KEEPALIVE_SECONDS: int = 15
+
+    # Product search: "fulltext" needs the MySQL FULLTEXT index, "like" scans
+    SEARCH_BACKEND: Literal["auto", "fulltext", "like"] = "auto"
+    SEARCH_MIN_TOKEN_SIZE: int = 3  # innodb_ft_min_token_size
+    SEARCH_MAX_TERMS: int = 8
+
+    # Full rebuild of the analytics rollup tables; 0 disables the job. The
+    # rebuild commits once per range of this many keys to keep its locks short
+    ANALYTICS_ROLLUP_REFRESH_SECONDS: int = 3600
+    ANALYTICS_ROLLUP_BATCH_SIZE: int = 1000
+
+    # Time-series analytics: closed buckets are cached and never recomputed; a
+    # bucket counts as closed once it ended more than the grace period ago
+    TIMESERIES_MAX_BUCKETS: int = 1440
+    TIMESERIES_CLOSE_GRACE_SECONDS: int = 60
+    TIMESERIES_CACHE_MAX_ENTRIES: int = 100_000
+    TIMESERIES_CACHE_TTL_SECONDS: int = 86400
+
+    # Accounts (e.g. finance) allowed to export every seller's history from /exports
+    EXPORT_ADMIN_EMAILS: List[str] = []
+
+    # POST /products/bulk: items per request and per transaction
+    PRODUCT_BULK_MAX_ITEMS: int = 10_000
+    PRODUCT_BULK_CHUNK_SIZE: int = 500
 
     class Config:
         env_file = ".env"
 
+    @model_validator(mode="after")
+    def check_thumbnail_default_size(self) -> "Settings":
+        if self.IMAGE_THUMBNAIL_DEFAULT_SIZE not in self.IMAGE_THUMBNAIL_SIZES:
+            raise ValueError(
+                f"IMAGE_THUMBNAIL_DEFAULT_SIZE {self.IMAGE_THUMBNAIL_DEFAULT_SIZE} "
+                f"must be one of IMAGE_THUMBNAIL_SIZES {self.IMAGE_THUMBNAIL_SIZES}"
+            )
+        return self
+
 
 @lru_cache()
 def get_settings() -> Settings:
@@ -1,11 +1,94 @@
+from typing import Optional
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.sql.dml import UpdateBase
 
 from app.core.config import settings
+from app.core.pool import engine_options, instrument
+from app.core.query_profiler import profile_queries
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options("primary"))
+instrument(engine, "primary")
+profile_queries(engine)
+
+replica_engine = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_engine(settings.DATABASE_REPLICA_URL, **engine_options("replica"))
+    instrument(replica_engine, "replica")
+    profile_queries(replica_engine)
+
+
+class RoutingSession(Session):
+    """Session that sends the reads of a read-only session to the replica.
+
+    Sessions opened with ``info={"read_only": True}`` (see ``get_read_db``) read
+    from the replica when one is configured. Flushes, DML and locking reads
+    always go to the primary, and once a session has touched the primary it
+    stays there so it keeps reading its own writes.
+    """
+
+    def __init__(self, *args, replica: Optional[Engine] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.replica is not None and self.info.get("read_only"):
+            writes = (
+                self._flushing
+                or isinstance(clause, UpdateBase)
+                or getattr(clause, "_for_update_arg", None) is not None
+            )
+            if not writes:
+                return self.replica
+            self.info["read_only"] = False
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+SessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, bind=engine, class_=RoutingSession, replica=replica_engine
+)
+
+# Async drivers for the sync URLs we support
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+}
+
 
+def async_database_url(url: Optional[str] = None) -> str:
+    if url is None and settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(url or settings.DATABASE_URL)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername)).render_as_string(
+        hide_password=False
+    )
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Only built when DB_MODE=async so the sync deployment does not need an async driver
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+if settings.DB_MODE == "async":
+    async_engine = create_async_engine(async_database_url(), **engine_options("async-primary", is_async=True))
+    instrument(async_engine.sync_engine, "async-primary")
+    profile_queries(async_engine.sync_engine)
+    if settings.DATABASE_REPLICA_URL:
+        async_replica_engine = create_async_engine(
+            async_database_url(settings.DATABASE_REPLICA_URL), **engine_options("async-replica", is_async=True)
+        )
+        instrument(async_replica_engine.sync_engine, "async-replica")
+        profile_queries(async_replica_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        sync_session_class=RoutingSession,
+        replica=async_replica_engine.sync_engine if async_replica_engine is not None else None,
+    )
 
 
 class Base(DeclarativeBase):
@@ -18,3 +101,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Session for read-only endpoints; served by the replica when one is configured."""
+    db = SessionLocal(info={"read_only": True})
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncSessionLocal(info={"read_only": True}) as db:
+        yield db
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import io
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+from app.core.config import settings
+
+IMAGE_URL_PREFIX = "/images/"
+HASH_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+DATA_URL_PATTERN = re.compile(r"^data:(?P<mime>[\w.+-]+/[\w.+-]+)?;base64,(?P<data>.*)$", re.DOTALL)
+
+MIME_TYPES = {
+    "JPEG": "image/jpeg",
+    "PNG": "image/png",
+    "GIF": "image/gif",
+    "WEBP": "image/webp",
+    "BMP": "image/bmp",
+}
+# Only these PIL plugins may parse uploads; others (EPS runs Ghostscript) never see them
+ALLOWED_FORMATS = list(MIME_TYPES)
+# File signatures of the allowed formats: (offset, bytes) -> MIME type
+SIGNATURES = [
+    ((0, b"\xff\xd8\xff"), "image/jpeg"),
+    ((0, b"\x89PNG\r\n\x1a\n"), "image/png"),
+    ((0, b"GIF8"), "image/gif"),
+    ((8, b"WEBP"), "image/webp"),
+    ((0, b"BM"), "image/bmp"),
+]
+
+
+class InvalidImageError(ValueError):
+    pass
+
+
+class ImageStore:
+    """Content-addressed image store on the local filesystem.
+
+    Originals are stored under their SHA-256 digest, so uploading the same image
+    twice keeps a single copy. WebP thumbnails for each configured size are
+    written next to the original when it is first stored.
+    """
+
+    def __init__(self, root: str, thumbnail_sizes: list[int]):
+        self.root = Path(root)
+        self.thumbnail_sizes = sorted(thumbnail_sizes)
+
+    def path_for(self, image_hash: str, size: Optional[int] = None) -> Path:
+        name = image_hash if size is None else f"{image_hash}_{size}.webp"
+        return self.root / image_hash[:2] / image_hash[2:4] / name
+
+    def exists(self, image_hash: str) -> bool:
+        return self.path_for(image_hash).is_file()
+
+    def verify(self, data: bytes) -> None:
+        try:
+            with Image.open(io.BytesIO(data), formats=ALLOWED_FORMATS) as image:
+                image.verify()
+            # verify() does not decode the pixels; load() catches truncated data
+            with Image.open(io.BytesIO(data), formats=ALLOWED_FORMATS) as image:
+                image.load()
+        except Image.DecompressionBombError as exc:
+            raise InvalidImageError("Image is too large") from exc
+        except (UnidentifiedImageError, OSError, SyntaxError, ValueError) as exc:
+            raise InvalidImageError("Not a supported image") from exc
+
+    def put(self, data: bytes) -> str:
+        """Store raw image bytes and return their hash."""
+        self.verify(data)
+        return self.store(data)
+
+    def store(self, data: bytes) -> str:
+        """Store image bytes already checked by ``verify`` and return their hash."""
+        image_hash = hashlib.sha256(data).hexdigest()
+        if not self.exists(image_hash):
+            self._write(self.path_for(image_hash), data)
+            self._write_thumbnails(image_hash, data)
+        return image_hash
+
+    def put_data_url(self, value: str) -> str:
+        """Store a base64 data URL and return the URL it is now served from."""
+        return image_url(self.put(decode_data_url(value)))
+
+    def externalize(self, value: Optional[str]) -> Optional[str]:
+        """Move inline data URLs into the store; plain URLs are returned unchanged."""
+        if value and value.startswith("data:"):
+            return self.put_data_url(value)
+        return value
+
+    def stage(self, value: str) -> tuple[str, Optional[bytes]]:
+        """Check an image URL like ``externalize`` without storing anything.
+
+        Returns the URL the image will be served from and, for an inline data
+        URL, the bytes to pass to ``store`` before that URL is saved anywhere.
+        """
+        if value.startswith("data:"):
+            data = decode_data_url(value)
+            self.verify(data)
+            return image_url(hashlib.sha256(data).hexdigest()), data
+        return value, None
+
+    def media_type(self, image_hash: str) -> str:
+        """MIME type of a stored original, from its file signature rather than a PIL parse."""
+        with open(self.path_for(image_hash), "rb") as f:
+            header = f.read(12)
+        for (offset, signature), mime_type in SIGNATURES:
+            if header[offset:offset + len(signature)] == signature:
+                return mime_type
+        return "application/octet-stream"
+
+    def _write_thumbnails(self, image_hash: str, data: bytes) -> None:
+        with Image.open(io.BytesIO(data), formats=ALLOWED_FORMATS) as image:
+            image.load()
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA")
+            for size in self.thumbnail_sizes:
+                thumbnail = image.copy()
+                thumbnail.thumbnail((size, size))
+                buffer = io.BytesIO()
+                thumbnail.save(buffer, format="WEBP", quality=80)
+                self._write(self.path_for(image_hash, size), buffer.getvalue())
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        # Write to a temp file and rename so readers never see a partial image
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def image_url(image_hash: str) -> str:
+    return f"{IMAGE_URL_PREFIX}{image_hash}"
+
+
+def decode_data_url(value: str) -> bytes:
+    match = DATA_URL_PATTERN.match(value)
+    if not match:
+        raise InvalidImageError("Not a base64 data URL")
+    try:
+        return base64.b64decode(match.group("data"), validate=True)
+    except (binascii.Error, ValueError) as exc:
+        raise InvalidImageError("Invalid base64 image data") from exc
+
+
+image_store = ImageStore(settings.IMAGE_STORE_DIR, settings.IMAGE_THUMBNAIL_SIZES)
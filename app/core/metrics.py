@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Sequence
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import cache_stats
+from app.core.pool import pool_stats
+from app.core.pubsub import hub
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry: list = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _PerThread:
+    """One shard of state per thread, so writers never share a lock or a cache line.
+
+    Only the owning thread writes to its shard; a scrape reads every shard and
+    sums them. Shards of finished threads are kept so totals never go down.
+    """
+
+    def __init__(self, factory: Callable[[], dict]):
+        self._factory = factory
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        self._lock = threading.Lock()
+
+    def shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = self._factory()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def shards(self) -> list[dict]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels.
+
+    ``initial`` lists label values to export as 0 before they are first
+    incremented, so rates over them are defined from the start.
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), initial: Sequence[tuple] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._initial = [tuple(labels) for labels in initial]
+        self._values = _PerThread(dict)
+        _registry.append(self)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        shard = self._values.shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def collect(self) -> dict[tuple, float]:
+        totals = dict.fromkeys(self._initial, 0)
+        for shard in self._values.shards():
+            # items() is copied in one step under the GIL, so the owner may keep writing
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.collect().items())
+        ]
+
+
+class Histogram:
+    """Distribution of observed values (seconds, by convention) over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values = _PerThread(dict)
+        _registry.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._values.shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # Per-bucket counts (the last one is +Inf), then sum and count
+            entry = shard[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def collect(self) -> dict[tuple, tuple[list[int], float, int]]:
+        totals: dict[tuple, tuple[list[int], float, int]] = {}
+        for shard in self._values.shards():
+            for labels, (counts, total, count) in list(shard.items()):
+                counts = list(counts)
+                if labels in totals:
+                    merged, merged_total, merged_count = totals[labels]
+                    counts = [a + b for a, b in zip(merged, counts)]
+                    total, count = total + merged_total, count + merged_count
+                totals[labels] = (counts, total, count)
+        return totals
+
+    def render(self) -> list[str]:
+        lines = []
+        for labels, (counts, total, count) in sorted(self.collect().items()):
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Collected:
+    """Gauge or counter whose values are read from elsewhere at scrape time."""
+
+    def __init__(self, name: str, help: str, kind: str, labelnames: Sequence[str], collect: Callable[[], dict]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        _registry.append(self)
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self.collect().items())
+            if value is not None
+        ]
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _route_label(scope: Scope) -> str:
+    # Route templates keep the label set bounded; unmatched paths share one value
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class RequestMetricsMiddleware:
+    """Record the latency of every HTTP request by method, route template and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code: Optional[int] = None
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - started,
+                scope["method"],
+                _route_label(scope),
+                str(status_code or 500),
+            )
+
+
+def _stat(source: Callable[[], dict], key: str) -> Callable[[], dict]:
+    return lambda: {(name,): stats[key] for name, stats in source().items()}
+
+
+# HTTP
+request_duration = Histogram(
+    "bidbay_http_request_duration_seconds",
+    "Time to serve an HTTP request, including a streamed body",
+    ("method", "route", "status"),
+)
+
+# Auction domain
+bid_rows_written = Counter(
+    "bidbay_bid_rows_written_total",
+    "Bid rows stored, by who placed them; proxy rows include bids recorded as outbid at a proxy's maximum",
+    ("source",),
+    initial=[("manual",), ("proxy",)],
+)
+bids_rejected = Counter(
+    "bidbay_bids_rejected_total",
+    "Bids refused, by reason",
+    ("reason",),
+    initial=[("too_low",), ("inactive",), ("own_product",), ("conflict",)],
+)
+auctions_closed = Counter(
+    "bidbay_auctions_closed_total",
+    "Auctions closed by the background closer, by outcome",
+    ("outcome",),
+    initial=[("sold",), ("expired",)],
+)
+orders_created = Counter(
+    "bidbay_orders_created_total",
+    "Orders opened, by how the winning bid was chosen",
+    ("source",),
+    initial=[("accepted",), ("auction_end",)],
+)
+payments_succeeded = Counter("bidbay_payments_succeeded_total", "Successful order payments")
+feed_enrichment = Histogram(
+    "bidbay_feed_enrichment_seconds",
+    "Time to add sellers, favorites, order status and images to a product list",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+# Database pools
+for _key in ("size", "checked_out", "checked_in", "overflow"):
+    Collected(f"bidbay_db_pool_{_key}", f"Connection pool {_key.replace('_', ' ')}", "gauge", ("pool",), _stat(pool_stats, _key))
+for _key in ("connects", "checkouts", "timeouts", "invalidations", "pings"):
+    Collected(f"bidbay_db_pool_{_key}_total", f"Connection pool {_key}", "counter", ("pool",), _stat(pool_stats, _key))
+
+# In-process caches
+Collected("bidbay_cache_entries", "Entries held by an in-process cache", "gauge", ("cache",), _stat(cache_stats, "size"))
+for _key in ("hits", "misses", "evictions", "invalidations"):
+    Collected(f"bidbay_cache_{_key}_total", f"In-process cache {_key}", "counter", ("cache",), _stat(cache_stats, _key))
+
+# Live auction streams
+Collected("bidbay_pubsub_subscribers", "Open live auction streams", "gauge", (), lambda: {(): hub.stats()["subscribers"]})
+for _key in ("published", "delivered", "dropped"):
+    Collected(
+        f"bidbay_pubsub_{_key}_total", f"Live auction events {_key}", "counter", (),
+        lambda key=_key: {(): hub.stats()[key]},
+    )
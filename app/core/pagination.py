@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response, status
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last row of a page into an opaque cursor."""
+    raw = json.dumps([_dump_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    return [_load_value(v) for v in values]
+
+
+class PageParams:
+    """Query parameters shared by all keyset-paginated list endpoints."""
+
+    def __init__(
+        self,
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+
+def apply_keyset(query, keys: Sequence[tuple[Any, bool]], page: PageParams, having: bool = False):
+    """Restrict a query (or select) to the rows after ``page.cursor`` and order it by ``keys``.
+
+    ``keys`` is a list of ``(column, descending)`` pairs, the last one being a unique
+    tie-breaker such as the primary key. The seek predicate is spelled out as
+    ``a < x OR (a = x AND b < y)`` so MySQL can range-scan the matching index.
+    Pass ``having=True`` when the keys are aggregates.
+    """
+    if page.cursor:
+        values = decode_cursor(page.cursor, len(keys))
+        clauses = []
+        for i, (column, descending) in enumerate(keys):
+            equal = [keys[j][0] == values[j] for j in range(i)]
+            after = column < values[i] if descending else column > values[i]
+            clauses.append(and_(*equal, after))
+        predicate = or_(*clauses)
+        query = query.having(predicate) if having else query.filter(predicate)
+
+    order_by = [column.desc() if descending else column.asc() for column, descending in keys]
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(*order_by).limit(page.limit + 1)
+
+
+def finish_page(
+    rows: Sequence[Any],
+    page: PageParams,
+    key: Callable[[Any], Sequence[Any]],
+    response: Optional[Response] = None,
+) -> tuple[list[Any], Optional[str]]:
+    """Trim the look-ahead row and compute the next cursor.
+
+    When a ``response`` is given the cursor is also exposed in the
+    ``X-Next-Cursor`` header, which keeps list bodies unchanged for clients.
+    """
+    items = list(rows[:page.limit])
+    next_cursor = encode_cursor(key(items[-1])) if len(rows) > page.limit else None
+    if response is not None:
+        set_page_headers(response, page, next_cursor)
+    return items, next_cursor
+
+
+def set_page_headers(response: Response, page: PageParams, next_cursor: Optional[str]) -> None:
+    response.headers["X-Page-Limit"] = str(page.limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
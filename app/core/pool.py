@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """Checkout counters and wait times of one connection pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self, pool: QueuePool) -> dict:
+        with self._lock:
+            return {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "pings": self.pings,
+                "wait_ms_avg": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+_metrics: dict[str, PoolMetrics] = {}
+_pools: dict[str, Engine] = {}
+
+
+class _TimedCheckout:
+    """Times ``Pool.connect``: waiting for a free slot, connecting and pinging."""
+
+    def connect(self):
+        metrics = _metrics[self.logging_name]
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record_checkout(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def engine_options(name: str, is_async: bool = False) -> dict:
+    """Pool keyword arguments for ``create_engine`` built from the DB_POOL_* settings.
+
+    ``name`` identifies the pool in ``pool_stats()``; call ``instrument`` on the
+    engine afterwards.
+    """
+    _metrics.setdefault(name, PoolMetrics(name))
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_logging_name": name,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_PRE_PING == "always",
+    }
+
+
+def instrument(engine: Engine, name: str) -> None:
+    """Attach the pool event listeners (counters and idle pre-ping) to an engine."""
+    metrics = _metrics[name]
+    _pools[name] = engine
+
+    @event.listens_for(engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine, "invalidate")
+    def on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    if settings.DB_PRE_PING != "idle":
+        return
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy):
+        # Only ping connections that sat idle long enough for the server to drop them
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_PRE_PING_IDLE_SECONDS:
+            return
+        metrics.incr("pings")
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as ping_error:
+            # The pool discards this connection and retries with a fresh one
+            raise exc.DisconnectionError() from ping_error
+
+
+def pool_stats() -> dict[str, dict]:
+    return {name: _metrics[name].stats(engine.pool) for name, engine in _pools.items()}
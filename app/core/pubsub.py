@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Callable, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+Deliver = Callable[[str, dict], None]
+
+
+class Subscription:
+    """One listener's bounded queue on a topic.
+
+    Events are state snapshots, so when a slow consumer's queue is full the
+    oldest event is dropped: the consumer skips intermediate states but always
+    ends up on the latest one.
+    """
+
+    def __init__(self, topic: str, loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.topic = topic
+        self.dropped = 0
+        self._loop = loop
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize)
+
+    async def get(self) -> dict:
+        return await self._queue.get()
+
+    def _push(self, message: dict) -> None:
+        # Runs on the subscriber's event loop
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(message)
+
+
+class Broker(ABC):
+    """Carries published messages to the hub of every worker process.
+
+    ``publish`` may be called from any thread and must not block for long;
+    the broker calls ``deliver(topic, message)`` once per message and worker.
+    """
+
+    @abstractmethod
+    def start(self, deliver: Deliver) -> None:
+        ...
+
+    @abstractmethod
+    def publish(self, topic: str, message: dict) -> None:
+        ...
+
+    def stop(self) -> None:
+        pass
+
+
+class LocalBroker(Broker):
+    """In-process broker: a single worker, or tests."""
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def publish(self, topic: str, message: dict) -> None:
+        if self._deliver is not None:
+            self._deliver(topic, message)
+
+    def stop(self) -> None:
+        self._deliver = None
+
+
+class RedisBroker(Broker):
+    """Fans messages out to every worker through Redis pub/sub (needs the ``redis`` package)."""
+
+    def __init__(self, url: str, prefix: str = "bidbay:"):
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, deliver: Deliver) -> None:
+        def handle(raw: dict[str, Any]) -> None:
+            topic = raw["channel"].decode()[len(self._prefix):]
+            deliver(topic, json.loads(raw["data"]))
+
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.psubscribe(**{f"{self._prefix}*": handle})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def publish(self, topic: str, message: dict) -> None:
+        self._client.publish(f"{self._prefix}{topic}", json.dumps(message))
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+        if self._pubsub is not None:
+            self._pubsub.close()
+            self._pubsub = None
+
+
+def make_broker(url: Optional[str]) -> Broker:
+    if not url:
+        return LocalBroker()
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBroker(url)
+    raise ValueError(f"Unsupported PUBSUB_BROKER_URL: {url}")
+
+
+class PubSubHub:
+    """Topic-based fan-out from publishers on any thread to asyncio subscribers.
+
+    ``publish`` hands the message to the broker, which delivers it back to the
+    hub of every worker; the hub then copies it into each local subscriber's
+    queue on that subscriber's event loop.
+    """
+
+    def __init__(self, broker: Broker, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._broker = broker
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    def start(self) -> None:
+        self._broker.start(self._deliver)
+
+    def stop(self) -> None:
+        self._broker.stop()
+
+    def subscribe(self, topic: str) -> Subscription:
+        subscription = Subscription(topic, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers[topic].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.topic]
+
+    def publish(self, topic: str, message: dict) -> None:
+        self.published += 1
+        try:
+            self._broker.publish(topic, message)
+        except Exception:
+            # Live updates are best effort; never fail the write that triggered them
+            logger.exception(f"pubsub: failed to publish to {topic}")
+
+    def _deliver(self, topic: str, message: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        for subscription in subscribers:
+            try:
+                subscription._loop.call_soon_threadsafe(subscription._push, message)
+                self.delivered += 1
+            except RuntimeError:
+                # The subscriber's loop is gone
+                self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            subscriptions = [s for subscribers in self._subscribers.values() for s in subscribers]
+            return {
+                "broker": type(self._broker).__name__,
+                "topics": len(self._subscribers),
+                "subscribers": len(subscriptions),
+                "published": self.published,
+                "delivered": self.delivered,
+                "dropped": sum(s.dropped for s in subscriptions),
+            }
+
+
+hub = PubSubHub(make_broker(settings.PUBSUB_BROKER_URL), queue_size=settings.PUBSUB_QUEUE_SIZE)
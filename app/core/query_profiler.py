@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import hashlib
+import heapq
+import random
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+_NORMALIZE = [
+    (re.compile(r"'(?:[^'\\]|\\.|'')*'"), "?"),                    # string literals
+    (re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+"), "?"),                 # bind placeholders of any paramstyle
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),                       # numeric literals
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),           # IN lists of any length
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(statement: str) -> str:
+    """Statement with literals and placeholders folded, so its variants group together."""
+    for pattern, replacement in _NORMALIZE:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+def fingerprint_id(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+class QueryProfile:
+    """SQL statistics of one request: count, total DB time and the slowest statements."""
+
+    def __init__(self, keep: int):
+        self.keep = keep
+        self.count = 0
+        self.seconds = 0.0
+        self._slowest: list[tuple[float, int, str]] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        entry = (seconds, self.count, statement)
+        if len(self._slowest) < self.keep:
+            heapq.heappush(self._slowest, entry)
+        elif seconds > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self) -> list[dict]:
+        return [
+            {"ms": round(seconds * 1000, 2), "fingerprint": fingerprint(statement)}
+            for seconds, _, statement in sorted(self._slowest, reverse=True)
+        ]
+
+
+_current: ContextVar[Optional[QueryProfile]] = ContextVar("query_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    seconds = time.perf_counter() - conn.info["query_started"].pop()
+    profile = _current.get()
+    if profile is not None:
+        profile.record(statement, seconds)
+    if seconds * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        normalized = fingerprint(statement)
+        logger.bind(
+            fingerprint_id=fingerprint_id(normalized),
+            fingerprint=normalized,
+            ms=round(seconds * 1000, 2),
+            executemany=executemany,
+        ).warning(f"Slow query ({seconds * 1000:.0f}ms): {normalized[:200]}")
+
+
+def _handle_error(context) -> None:
+    # A failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("query_started") if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def profile_queries(engine: Engine) -> None:
+    """Time every statement on ``engine`` for the request profiles and the slow-query log."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryProfilerMiddleware:
+    """Profile the SQL of a sample of requests.
+
+    Sampled requests get a ``Server-Timing`` header (DB time and query count,
+    no statements) and one structured log line with their slowest statements.
+    Others only pay for the per-statement timing the slow-query log needs.
+    Queries run after the response headers (streamed bodies) only show in the log.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.01, keep: int = 3):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.keep = keep
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile(self.keep)
+        token = _current.set(profile)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                elapsed = time.perf_counter() - started
+                MutableHeaders(scope=message).append(
+                    "Server-Timing",
+                    f'db;dur={profile.seconds * 1000:.1f};desc="{profile.count} queries", '
+                    f"app;dur={elapsed * 1000:.1f}",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            logger.bind(
+                method=scope["method"],
+                path=scope["path"],
+                status=status_code,
+                ms=round(elapsed * 1000, 2),
+                queries=profile.count,
+                db_ms=round(profile.seconds * 1000, 2),
+                slowest=profile.slowest(),
+            ).info(
+                f"{scope['method']} {scope['path']} {status_code}: "
+                f"{profile.count} queries, {profile.seconds * 1000:.1f}ms in DB of {elapsed * 1000:.1f}ms"
+            )
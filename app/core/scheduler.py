@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import heapq
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Hashable, Iterable, Optional
+
+from loguru import logger
+
+
+def to_naive_utc(value: datetime) -> datetime:
+    """Normalize a datetime to naive UTC, the way DateTime columns store it."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class DeadlineScheduler:
+    """Runs ``on_due`` on a background thread whenever a scheduled deadline passes.
+
+    Deadlines live in a min-heap keyed by time; rescheduling a key leaves the old
+    heap entry behind and it is skipped when popped. ``load`` is called every
+    ``reload_interval`` to pick up deadlines created by other processes, and
+    ``on_due`` is also run then so nothing is missed if a worker was down.
+    """
+
+    def __init__(
+        self,
+        on_due: Callable[[list[Hashable]], None],
+        load: Callable[[datetime], Iterable[tuple[Hashable, datetime]]],
+        reload_interval: float = 60.0,
+        name: str = "deadline-scheduler",
+    ):
+        self._on_due = on_due
+        self._load = load
+        self._reload_interval = reload_interval
+        self._name = name
+        self._heap: list[tuple[datetime, Hashable]] = []
+        self._deadlines: dict[Hashable, datetime] = {}
+        self._wakeup = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, key: Hashable, deadline: datetime) -> None:
+        deadline = to_naive_utc(deadline)
+        with self._wakeup:
+            if self._deadlines.get(key) == deadline:
+                return
+            self._deadlines[key] = deadline
+            heapq.heappush(self._heap, (deadline, key))
+            if self._heap[0][1] == key:
+                self._wakeup.notify()
+
+    def cancel(self, key: Hashable) -> None:
+        with self._wakeup:
+            self._deadlines.pop(key, None)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        with self._wakeup:
+            self._stopping = True
+            self._wakeup.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _pop_due(self, now: datetime) -> list[Hashable]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, key = heapq.heappop(self._heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                due.append(key)
+        return due
+
+    def _reload(self) -> None:
+        horizon = datetime.utcnow() + timedelta(seconds=self._reload_interval)
+        for key, deadline in self._load(horizon):
+            self.schedule(key, deadline)
+
+    def _run(self) -> None:
+        next_reload = datetime.utcnow()
+        while True:
+            try:
+                due: list[Hashable] = []
+                if datetime.utcnow() >= next_reload:
+                    self._reload()
+                    next_reload = datetime.utcnow() + timedelta(seconds=self._reload_interval)
+                    due = [None]  # sweep for anything already overdue
+
+                with self._wakeup:
+                    if self._stopping:
+                        return
+                    now = datetime.utcnow()
+                    due.extend(self._pop_due(now))
+                    if not due:
+                        wait_until = next_reload
+                        if self._heap:
+                            wait_until = min(wait_until, self._heap[0][0])
+                        self._wakeup.wait(max((wait_until - now).total_seconds(), 0))
+                        continue
+
+                self._on_due([key for key in due if key is not None])
+            except Exception:
+                logger.exception(f"{self._name}: iteration failed")
+                with self._wakeup:
+                    if self._stopping:
+                        return
+                    self._wakeup.wait(1.0)
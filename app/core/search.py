@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import re
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from sqlalchemy import and_, case, literal, or_
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.sql import ColumnElement
+
+from app.core.config import settings
+from app.core.database import engine
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def parse_query(q: str) -> list[str]:
+    """Split free text into lower-case search terms, dropping boolean-mode operators."""
+    return [token.lower() for token in TOKEN_PATTERN.findall(q)][:settings.SEARCH_MAX_TERMS]
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class SearchBackend(ABC):
+    """Builds the filter and relevance expressions for a product text search.
+
+    Every term must match, and terms match as word prefixes so results
+    narrow as the user types.
+    """
+
+    def __init__(self, title: ColumnElement, description: ColumnElement):
+        self.title = title
+        self.description = description
+
+    @abstractmethod
+    def condition(self, terms: list[str]) -> ColumnElement[bool]:
+        ...
+
+    @abstractmethod
+    def relevance(self, terms: list[str]) -> ColumnElement[float]:
+        ...
+
+
+class FullTextSearch(SearchBackend):
+    """MySQL FULLTEXT search over ``(title, description)`` in boolean mode.
+
+    Terms shorter than ``innodb_ft_min_token_size`` are not in the index; they
+    are matched as a title prefix instead (which can use the title index).
+    """
+
+    def _split(self, terms: list[str]) -> tuple[list[str], list[str]]:
+        indexed = [t for t in terms if len(t) >= settings.SEARCH_MIN_TOKEN_SIZE]
+        short = [t for t in terms if len(t) < settings.SEARCH_MIN_TOKEN_SIZE]
+        return indexed, short
+
+    def _match(self, indexed: list[str]) -> ColumnElement:
+        against = " ".join(f"+{term}*" for term in indexed)
+        return match(self.title, self.description, against=against).in_boolean_mode()
+
+    def condition(self, terms: list[str]) -> ColumnElement[bool]:
+        indexed, short = self._split(terms)
+        clauses = [self.title.like(f"{_escape_like(term)}%") for term in short]
+        if indexed:
+            clauses.append(self._match(indexed))
+        return and_(*clauses)
+
+    def relevance(self, terms: list[str]) -> ColumnElement[float]:
+        indexed, _ = self._split(terms)
+        return self._match(indexed) if indexed else literal(0.0)
+
+
+class LikeSearch(SearchBackend):
+    """Portable fallback (SQLite, tests): LIKE on title and description.
+
+    Scans the table; the title hits rank above description-only hits.
+    """
+
+    def _patterns(self, terms: list[str]) -> list[str]:
+        return [f"%{_escape_like(term)}%" for term in terms]
+
+    def condition(self, terms: list[str]) -> ColumnElement[bool]:
+        return and_(*(
+            or_(self.title.ilike(pattern, escape="\\"), self.description.ilike(pattern, escape="\\"))
+            for pattern in self._patterns(terms)
+        ))
+
+    def relevance(self, terms: list[str]) -> ColumnElement[float]:
+        score = literal(0.0)
+        for pattern in self._patterns(terms):
+            score = score + case((self.title.ilike(pattern, escape="\\"), 2.0), else_=1.0)
+        return score
+
+
+def make_search_backend(title: ColumnElement, description: ColumnElement, backend: Optional[str] = None) -> SearchBackend:
+    backend = backend or settings.SEARCH_BACKEND
+    if backend == "auto":
+        backend = "fulltext" if engine.dialect.name == "mysql" else "like"
+    return FullTextSearch(title, description) if backend == "fulltext" else LikeSearch(title, description)
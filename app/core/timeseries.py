@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Hashable
+
+from sqlalchemy import BigInteger, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core.cache import named_cache
+from app.core.config import settings
+
+EPOCH = datetime(1970, 1, 1)
+BUCKET_SECONDS = {"minute": 60, "hour": 3600, "day": 86400}
+
+_MISSING = object()
+
+# Values of closed buckets; they cannot change any more, so entries only leave by eviction
+window_cache = named_cache(
+    "timeseries", maxsize=settings.TIMESERIES_CACHE_MAX_ENTRIES, ttl=settings.TIMESERIES_CACHE_TTL_SECONDS
+)
+
+
+class epoch_bucket(FunctionElement):
+    """Start of the ``seconds``-wide bucket a naive UTC DateTime falls in, as Unix seconds.
+
+    Buckets are aligned to the epoch, so day buckets are UTC days. The width is
+    rendered as a literal so SELECT and GROUP BY spell the same expression.
+    """
+
+    type = BigInteger()
+    inherit_cache = True
+
+    def __init__(self, column, seconds: int):
+        super().__init__(column, literal_column(str(int(seconds))))
+
+
+@compiles(epoch_bucket)
+def _epoch_bucket_default(element, compiler, **kw):
+    column, seconds = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CAST(FLOOR(EXTRACT(EPOCH FROM {column}) / {seconds}) * {seconds} AS BIGINT)"
+
+
+@compiles(epoch_bucket, "mysql")
+def _epoch_bucket_mysql(element, compiler, **kw):
+    # TIMESTAMPDIFF ignores the session time zone, unlike UNIX_TIMESTAMP()
+    column, seconds = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(TIMESTAMPDIFF(SECOND, '1970-01-01 00:00:00', {column}) DIV {seconds}) * {seconds}"
+
+
+@compiles(epoch_bucket, "sqlite")
+def _epoch_bucket_sqlite(element, compiler, **kw):
+    column, seconds = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"(CAST(strftime('%s', {column}) AS INTEGER) / {seconds}) * {seconds}"
+
+
+def from_epoch(seconds: int) -> datetime:
+    return EPOCH + timedelta(seconds=int(seconds))
+
+
+def floor_to_bucket(value: datetime, seconds: int) -> datetime:
+    return from_epoch(int((value - EPOCH).total_seconds()) // seconds * seconds)
+
+
+def bucket_starts(start: datetime, end: datetime, seconds: int) -> list[datetime]:
+    """Start of every bucket overlapping [start, end)."""
+    step = timedelta(seconds=seconds)
+    starts = []
+    current = floor_to_bucket(start, seconds)
+    while current < end:
+        starts.append(current)
+        current += step
+    return starts
+
+
+def load_series(
+    key: tuple,
+    starts: list[datetime],
+    seconds: int,
+    compute: Callable[[datetime, datetime], dict[datetime, Any]],
+    empty: Any,
+) -> list[tuple[datetime, Any]]:
+    """Return ``(bucket_start, value)`` for each of ``starts``, computing only what is not cached.
+
+    ``compute(lo, hi)`` aggregates [lo, hi) in one query and returns the values
+    of its non-empty buckets; the others get ``empty``. Values must be
+    immutable since closed buckets are shared through the cache. ``key``'s
+    first element is the cache namespace.
+    """
+    values: dict[datetime, Any] = {}
+    missing = []
+    for start in starts:
+        value = window_cache.get((*key, seconds, start), _MISSING)
+        if value is _MISSING:
+            missing.append(start)
+        else:
+            values[start] = value
+
+    if missing:
+        step = timedelta(seconds=seconds)
+        computed = compute(missing[0], missing[-1] + step)
+        closed_before = datetime.utcnow() - timedelta(seconds=settings.TIMESERIES_CLOSE_GRACE_SECONDS)
+        for start in missing:
+            values[start] = computed.get(start, empty)
+            if start + step <= closed_before:
+                window_cache.set((*key, seconds, start), values[start])
+
+    return [(start, values[start]) for start in starts]
+
+
+def grouped(rows, value: Callable[[Any], Hashable]) -> dict[datetime, Any]:
+    """Map ``(bucket, ...)`` result rows to ``{bucket_start: value(row)}``."""
+    return {from_epoch(row.bucket): value(row) for row in rows}
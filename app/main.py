@@ -1,12 +1,45 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import auth, addresses, analytics, bids, categories, favorites, orders, payments, products
+from app.api import (
+    auth, addresses, analytics, bids, categories, exports, favorites, images, orders, payments, products, timeseries,
+)
+from app.api import aio
+from app.api.analytics import ROLLUP_REFRESHED_HEADER, rollup_refresher, schedule_rollup_refresh
+from app.api.bids import auction_closer
+from app.core.cache import cache_stats
+from app.core.config import settings
+from app.core.database import async_engine, async_replica_engine
+from app.core.metrics import CONTENT_TYPE, RequestMetricsMiddleware, render
+from app.core.pool import pool_stats
+from app.core.pubsub import hub
+from app.core.query_profiler import QueryProfilerMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    hub.start()
+    if settings.AUCTION_CLOSER_ENABLED:
+        auction_closer.start()
+    if settings.ANALYTICS_ROLLUP_REFRESH_SECONDS > 0:
+        schedule_rollup_refresh()
+        rollup_refresher.start()
+    yield
+    rollup_refresher.stop()
+    auction_closer.stop()
+    hub.stop()
+    for async_db_engine in (async_engine, async_replica_engine):
+        if async_db_engine is not None:
+            await async_db_engine.dispose()
+
 
 app = FastAPI(
     title="BidBay API",
     description="Auction & Bidding Marketplace API",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -15,18 +48,33 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Page-Limit", "Age", ROLLUP_REFRESHED_HEADER, "Server-Timing"],
+)
+app.add_middleware(
+    QueryProfilerMiddleware,
+    sample_rate=settings.SQL_PROFILE_SAMPLE_RATE,
+    keep=settings.SQL_PROFILE_KEEP_SLOWEST,
 )
+app.add_middleware(RequestMetricsMiddleware)
 
 # Include routers
+if settings.DB_MODE == "async":
+    # Registered first so they shadow the sync handlers for the same paths
+    app.include_router(aio.categories.router)
+    app.include_router(aio.products.router)
+    app.include_router(aio.bids.router)
 app.include_router(auth.router)
 app.include_router(addresses.router)
 app.include_router(analytics.router)
+app.include_router(timeseries.router)
 app.include_router(categories.router)
 app.include_router(products.router)
 app.include_router(bids.router)
 app.include_router(favorites.router)
 app.include_router(orders.router)
 app.include_router(payments.router)
+app.include_router(exports.router)
+app.include_router(images.router)
 
 
 @app.get("/")
@@ -37,3 +85,27 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/health/cache")
+def cache_health():
+    """Hit/miss counters of the in-process caches."""
+    return cache_stats()
+
+
+@app.get("/health/db")
+def db_health():
+    """Connection pool occupancy, checkout counters and wait times."""
+    return pool_stats()
+
+
+@app.get("/health/pubsub")
+def pubsub_health():
+    """Live-update hub: broker, subscriber counts and dropped events."""
+    return hub.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request latency, auction counters, pool, cache and pub/sub stats for Prometheus."""
+    return Response(render(), media_type=CONTENT_TYPE)
@@ -7,6 +7,9 @@ from app.models.bid import Bid, BidStatus
 from app.models.favorite import Favorite
 from app.models.order import Order, OrderStatus
 from app.models.payment import Payment, PaymentStatus
+from app.models.analytics import ProductFavoriteStats, RollupState, UserBidStats
+from app.models.refresh_token import RefreshToken
+from app.models.proxy_bid import ProxyBid
 
 __all__ = [
     "User",
@@ -22,4 +25,9 @@ __all__ = [
     "OrderStatus",
     "Payment",
     "PaymentStatus",
+    "ProductFavoriteStats",
+    "RollupState",
+    "UserBidStats",
+    "RefreshToken",
+    "ProxyBid",
 ]
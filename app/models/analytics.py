@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ProductFavoriteStats(Base):
+    """Favorite count per product; kept current by the favorites endpoints."""
+
+    __tablename__ = "product_favorite_stats"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    favorite_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_product_favorite_stats_count", "favorite_count", "product_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProductFavoriteStats(product_id={self.product_id}, favorite_count={self.favorite_count})>"
+
+
+class UserBidStats(Base):
+    """Bid count per bidder; kept current by bid placement."""
+
+    __tablename__ = "user_bid_stats"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        Index("ix_user_bid_stats_count", "bid_count", "user_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<UserBidStats(user_id={self.user_id}, bid_count={self.bid_count})>"
+
+
+class RollupState(Base):
+    """When each rollup table was last rebuilt from its source table."""
+
+    __tablename__ = "rollup_state"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RollupState(name={self.name}, refreshed_at={self.refreshed_at})>"
@@ -35,6 +35,9 @@ class Bid(Base):
     __table_args__ = (
         Index("ix_bids_product_amount", "product_id", "amount"),
         Index("ix_bids_product_bidder_created", "product_id", "bidder_id", "created_at"),
+        Index("ix_bids_bidder_created", "bidder_id", "created_at"),
+        Index("ix_bids_product_created", "product_id", "created_at"),
+        Index("ix_bids_created", "created_at"),
         CheckConstraint("amount > 0", name="ck_bids_amount_positive"),
     )
 
@@ -5,7 +5,7 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import String, Text, Enum, DateTime, ForeignKey, Numeric, Index, func
+from sqlalchemy import String, Text, Enum, DateTime, ForeignKey, Integer, Numeric, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -33,6 +33,11 @@ class Product(Base):
         Enum(ProductStatus), nullable=False, default=ProductStatus.ACTIVE, index=True
     )
     accepted_bid_id: Mapped[Optional[int]] = mapped_column(ForeignKey("bids.id"), nullable=True)
+    # Denormalized auction summary, maintained by place/accept/reject bid
+    current_price: Mapped[Optional[Decimal]] = mapped_column(Numeric(12, 2), nullable=True)
+    bid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    highest_bid_id: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    last_bid_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
 
     # Relationships
@@ -47,6 +52,10 @@ class Product(Base):
     # Composite indexes for common queries
     __table_args__ = (
         Index("ix_products_status_auction_end", "status", "auction_end_at"),
+        Index("ix_products_status_created", "status", "created_at"),
+        Index("ix_products_seller_created", "seller_id", "created_at"),
+        # Product search (app.core.search.FullTextSearch)
+        Index("ft_products_title_description", "title", "description", mysql_prefix="FULLTEXT"),
     )
 
     def __repr__(self) -> str:
@@ -0,0 +1,37 @@
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import CheckConstraint, DateTime, ForeignKey, Index, Numeric, PrimaryKeyConstraint, func
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class ProxyBid(Base):
+    """A bidder's standing maximum on a product; the proxy engine bids for them up to it."""
+
+    __tablename__ = "proxy_bids"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    bidder_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    max_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), nullable=False)
+    # When max_amount was last set: equal maximums go to whoever reached them first.
+    # Microsecond precision so proxies set within the same second still order correctly
+    max_set_at: Mapped[datetime] = mapped_column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), nullable=False, default=datetime.utcnow
+    )
+
+    __table_args__ = (
+        PrimaryKeyConstraint("product_id", "bidder_id"),
+        CheckConstraint("max_amount > 0", name="ck_proxy_bids_max_amount_positive"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<ProxyBid(product_id={self.product_id}, bidder_id={self.bidder_id}, max_amount={self.max_amount})>"
+
+
+# Highest maximum first, earliest set first on a tie: the top two entries of a
+# product are found with a short range scan however many proxies compete for it
+Index("ix_proxy_bids_rank", ProxyBid.product_id, ProxyBid.max_amount.desc(), ProxyBid.max_set_at)
@@ -1,10 +1,32 @@
-from app.schemas.token import Token, TokenPayload
+from app.schemas.token import Token, TokenPayload, TokenRefresh
 from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse, UserUpdate
 from app.schemas.address import AddressCreate, AddressResponse
 from app.schemas.category import CategoryCreate, CategoryResponse
-from app.schemas.product import ProductCreate, ProductResponse, ProductUpdate, ProductWithDetailsResponse, SellerInfo
+from app.schemas.product import (
+    CategoryFacet,
+    ProductBulkItem,
+    ProductBulkResponse,
+    ProductBulkResult,
+    ProductCreate,
+    ProductResponse,
+    ProductSearchHit,
+    ProductSearchResponse,
+    ProductUpdate,
+    ProductWithDetailsResponse,
+    SearchFacets,
+    SellerInfo,
+    StatusFacet,
+)
 from app.schemas.product_image import ProductImageCreate, ProductImageResponse
-from app.schemas.bid import BidCreate, BidResponse, BidWithBidderResponse, BidderInfo, MyBidResponse
+from app.schemas.bid import (
+    BidCreate,
+    BidResponse,
+    BidWithBidderResponse,
+    BidderInfo,
+    MyBidResponse,
+    ProxyBidCreate,
+    ProxyBidResponse,
+)
 from app.schemas.favorite import FavoriteCreate, FavoriteResponse
 from app.schemas.order import OrderResponse
 from app.schemas.payment import PaymentCreate, PaymentResponse
@@ -12,6 +34,7 @@ from app.schemas.payment import PaymentCreate, PaymentResponse
 __all__ = [
     "Token",
     "TokenPayload",
+    "TokenRefresh",
     "UserBase",
     "UserCreate",
     "UserLogin",
@@ -21,11 +44,19 @@ __all__ = [
     "AddressResponse",
     "CategoryCreate",
     "CategoryResponse",
+    "CategoryFacet",
+    "ProductBulkItem",
+    "ProductBulkResponse",
+    "ProductBulkResult",
     "ProductCreate",
     "ProductResponse",
+    "ProductSearchHit",
+    "ProductSearchResponse",
     "ProductUpdate",
     "ProductWithDetailsResponse",
+    "SearchFacets",
     "SellerInfo",
+    "StatusFacet",
     "ProductImageCreate",
     "ProductImageResponse",
     "BidCreate",
@@ -33,6 +64,8 @@ __all__ = [
     "BidWithBidderResponse",
     "BidderInfo",
     "MyBidResponse",
+    "ProxyBidCreate",
+    "ProxyBidResponse",
     "FavoriteCreate",
     "FavoriteResponse",
     "OrderResponse",
@@ -45,3 +45,19 @@ class MyBidResponse(BidResponse):
     product_title: Optional[str] = None
     seller: Optional[BidderInfo] = None  # Reusing BidderInfo structure for seller
     order_status: Optional[str] = None  # Order status if bid is accepted
+
+
+class ProxyBidCreate(BaseModel):
+    product_id: int
+    max_amount: Decimal = Field(..., gt=0)
+
+
+class ProxyBidResponse(BaseModel):
+    product_id: int
+    bidder_id: int
+    max_amount: Decimal
+    created_at: datetime
+    current_price: Optional[Decimal] = None
+    is_leading: bool = False
+
+    model_config = {"from_attributes": True}
@@ -28,5 +28,6 @@ class OrderResponse(BaseModel):
     created_at: datetime
     product_title: Optional[str] = None
     seller: Optional[SellerInfo] = None
+    buyer: Optional[SellerInfo] = None  # Reusing SellerInfo structure for the buyer
 
     model_config = {"from_attributes": True}
@@ -7,7 +7,7 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from app.models.product import ProductStatus
-from app.schemas.product_image import ProductImageResponse
+from app.schemas.product_image import ProductImageCreate, ProductImageResponse
 
 
 class SellerInfo(BaseModel):
@@ -31,6 +31,25 @@ class ProductCreate(ProductBase):
     pass
 
 
+class ProductBulkItem(ProductCreate):
+    images: list[ProductImageCreate] = Field(default_factory=list)
+
+
+class ProductBulkResult(BaseModel):
+    """Outcome of one item of a bulk import, by its position in the request."""
+    index: int
+    id: Optional[int] = None
+    errors: list[str] = Field(default_factory=list)
+
+
+class ProductBulkResponse(BaseModel):
+    created: int
+    failed: int
+    elapsed_ms: float
+    rows_per_second: float
+    results: list[ProductBulkResult]
+
+
 class ProductUpdate(BaseModel):
     category_id: Optional[int] = None
     title: Optional[str] = Field(None, min_length=1, max_length=255)
@@ -46,6 +65,9 @@ class ProductResponse(ProductBase):
     seller_id: int
     status: ProductStatus
     accepted_bid_id: Optional[int] = None
+    current_price: Optional[Decimal] = None
+    bid_count: int = 0
+    last_bid_at: Optional[datetime] = None
     created_at: datetime
     images: list[ProductImageResponse] = Field(default_factory=list)
 
@@ -56,6 +78,31 @@ class ProductWithDetailsResponse(ProductResponse):
     """Product with seller info, highest bid, and order status"""
     seller: Optional[SellerInfo] = None
     highest_bid: Optional[Decimal] = None
-    bid_count: int = 0
     is_favorited: bool = False
     order_status: Optional[str] = None
+
+
+class ProductSearchHit(ProductResponse):
+    relevance: float
+
+
+class CategoryFacet(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class StatusFacet(BaseModel):
+    status: ProductStatus
+    count: int
+
+
+class SearchFacets(BaseModel):
+    category: list[CategoryFacet] = Field(default_factory=list)
+    status: list[StatusFacet] = Field(default_factory=list)
+
+
+class ProductSearchResponse(BaseModel):
+    """Search results ordered by relevance; facets are only computed for the first page."""
+    items: list[ProductSearchHit]
+    facets: Optional[SearchFacets] = None
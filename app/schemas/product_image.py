@@ -1,10 +1,29 @@
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional
+
+from pydantic import AfterValidator, BaseModel, Field, computed_field
+
+from app.core.config import settings
+from app.core.image_store import IMAGE_URL_PREFIX
+
+
+# product_images.image_url and users.profile_image are VARCHAR(500)
+MAX_IMAGE_URL_LENGTH = 500
+
+
+def _check_image_url(value: str) -> str:
+    # Data URLs are stored under a short /images/ URL, so only other URLs are capped
+    if len(value) > MAX_IMAGE_URL_LENGTH and not value.startswith("data:"):
+        raise ValueError(f"Image URL must be at most {MAX_IMAGE_URL_LENGTH} characters")
+    return value
+
+
+ImageUrl = Annotated[str, AfterValidator(_check_image_url)]
 
 
 class ProductImageBase(BaseModel):
-    image_url: str = Field(..., min_length=1)  # No max_length for base64 data URLs
+    image_url: ImageUrl = Field(..., min_length=1)  # Base64 data URLs are moved to the image store
     position: int = Field(0, ge=0)
 
 
@@ -17,3 +36,10 @@ class ProductImageResponse(ProductImageBase):
     product_id: int
 
     model_config = {"from_attributes": True}
+
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        if self.image_url.startswith(IMAGE_URL_PREFIX):
+            return f"{self.image_url}?size={settings.IMAGE_THUMBNAIL_DEFAULT_SIZE}"
+        return None
@@ -5,12 +5,14 @@ from typing import Optional
 
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.product_image import ImageUrl
+
 
 class UserBase(BaseModel):
     email: EmailStr
     full_name: str = Field(..., min_length=1, max_length=255)
     phone_number: Optional[str] = Field(None, max_length=20)
-    profile_image: Optional[str] = Field(None)  # No max_length for base64 data URLs
+    profile_image: Optional[ImageUrl] = Field(None)  # Base64 data URLs are moved to the image store
 
 
 class UserCreate(UserBase):
@@ -32,4 +34,4 @@ class UserResponse(UserBase):
 class UserUpdate(BaseModel):
     full_name: Optional[str] = Field(None, min_length=1, max_length=255)
     phone_number: Optional[str] = Field(None, max_length=20)
-    profile_image: Optional[str] = Field(None)  # No max_length for base64 data URLs
+    profile_image: Optional[ImageUrl] = Field(None)  # Base64 data URLs are moved to the image store
@@ -1,8 +1,23 @@
 import { useState, useEffect } from 'react';
-import { bids } from '../services/api';
+import { bids, products } from '../services/api';
 import './ProductModal.css';
 
-function ProductModal({ product, onClose, onBidPlaced }) {
+function ProductModal({ product: initialProduct, onClose, onBidPlaced }) {
+  const [live, setLive] = useState(null);
+
+  // Follow price and status changes while the modal is open
+  useEffect(() => {
+    setLive(null);
+    return products.stream(initialProduct.id, setLive);
+  }, [initialProduct.id]);
+
+  const product = live ? {
+    ...initialProduct,
+    status: live.status,
+    highest_bid: live.current_price,
+    bid_count: live.bid_count,
+  } : initialProduct;
+
   // Calculate minimum required bid
   const minBidAmount = product.highest_bid
     ? parseFloat(product.highest_bid) + parseFloat(product.min_increment)
@@ -9,13 +9,16 @@ function Feed({ searchQuery }) {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [selectedProduct, setSelectedProduct] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const loadProducts = async () => {
     setLoading(true);
     setError('');
     try {
-      const data = await products.getFeed(searchQuery || null);
-      setProductList(data);
+      const page = await products.getFeed(searchQuery || null);
+      setProductList(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -23,6 +26,20 @@ function Feed({ searchQuery }) {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    setError('');
+    try {
+      const page = await products.getFeed(searchQuery || null, nextCursor);
+      setProductList(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadProducts();
   }, [searchQuery]);
@@ -78,6 +95,14 @@ function Feed({ searchQuery }) {
         </div>
       )}
 
+      {!loading && nextCursor && (
+        <div className="load-more">
+          <button className="btn-secondary" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {selectedProduct && (
         <ProductModal
           product={selectedProduct}
@@ -9,14 +9,17 @@ function Products({ user }) {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [selectedProduct, setSelectedProduct] = useState(null);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
 
   const loadProducts = async () => {
     setLoading(true);
     setError('');
     try {
-      const data = await products.list({ q: searchQuery || undefined });
-      setProductList(data);
+      const page = await products.list({ q: searchQuery || undefined });
+      setProductList(page.items);
+      setNextCursor(page.nextCursor);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -24,6 +27,20 @@ function Products({ user }) {
     }
   };
 
+  const loadMore = async () => {
+    setLoadingMore(true);
+    setError('');
+    try {
+      const page = await products.list({ q: searchQuery || undefined }, nextCursor);
+      setProductList(prev => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     loadProducts();
   }, []);
@@ -81,6 +98,14 @@ function Products({ user }) {
         </div>
       )}
 
+      {!loading && nextCursor && (
+        <div className="load-more">
+          <button className="btn-secondary" onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {selectedProduct && (
         <ProductModal
           product={selectedProduct}
@@ -1,4 +1,6 @@
 const API_BASE = '';
+// Largest page the API serves (MAX_PAGE_SIZE in app/core/pagination.py)
+const MAX_PAGE_SIZE = 200;
 
 function getToken() {
   return localStorage.getItem('bidbay_token');
@@ -17,6 +19,32 @@ async function handleResponse(response) {
   return data;
 }
 
+// A page of a keyset-paginated list: its items and the cursor of the next page (null on the last)
+async function handlePage(response) {
+  const items = await handleResponse(response);
+  return { items, nextCursor: response.headers.get('X-Next-Cursor') };
+}
+
+async function fetchPage(path, query = new URLSearchParams(), cursor = null) {
+  if (cursor) query.set('cursor', cursor);
+  const response = await fetch(API_BASE + path + '?' + query.toString(), {
+    headers: authHeaders(),
+  });
+  return handlePage(response);
+}
+
+// Follows X-Next-Cursor to the last page; for the user's own lists, which are shown whole
+async function fetchAllPages(path) {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await fetchPage(path, new URLSearchParams({ limit: MAX_PAGE_SIZE }), cursor);
+    items.push(...page.items);
+    cursor = page.nextCursor;
+  } while (cursor);
+  return items;
+}
+
 export const auth = {
   async login(email, password) {
     const form = new URLSearchParams();
@@ -76,40 +104,29 @@ export const auth = {
 };
 
 export const products = {
-  async list(params = {}) {
+  // Returns one page, { items, nextCursor }; pass nextCursor back to load the next one
+  async list(params = {}, cursor = null) {
     const query = new URLSearchParams();
     if (params.status) query.append('status', params.status);
     if (params.category_id) query.append('category_id', params.category_id);
     if (params.seller_id) query.append('seller_id', params.seller_id);
     if (params.q) query.append('q', params.q);
-
-    const response = await fetch(API_BASE + '/products/?' + query.toString(), {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchPage('/products/', query, cursor);
   },
 
-  async getFeed(q = null) {
+  // Returns one page, { items, nextCursor }
+  async getFeed(q = null, cursor = null) {
     const query = new URLSearchParams();
     if (q) query.append('q', q);
-    const response = await fetch(API_BASE + '/products/feed?' + query.toString(), {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchPage('/products/feed', query, cursor);
   },
 
   async getMyProducts() {
-    const response = await fetch(API_BASE + '/products/my-products', {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchAllPages('/products/my-products');
   },
 
   async getFavorites() {
-    const response = await fetch(API_BASE + '/products/favorites', {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchAllPages('/products/favorites');
   },
 
   async get(id) {
@@ -119,6 +136,13 @@ export const products = {
     return handleResponse(response);
   },
 
+  // Live price/bid count/status updates; returns a function that closes the stream
+  stream(id, onUpdate) {
+    const source = new EventSource(API_BASE + '/products/' + id + '/stream');
+    source.addEventListener('auction', (e) => onUpdate(JSON.parse(e.data)));
+    return () => source.close();
+  },
+
   async create(productData) {
     const response = await fetch(API_BASE + '/products/', {
       method: 'POST',
@@ -182,10 +206,7 @@ export const bids = {
   },
 
   async getMyBids() {
-    const response = await fetch(API_BASE + '/bids/me', {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchAllPages('/bids/me');
   },
 
   async getProductBids(productId) {
@@ -252,17 +273,11 @@ export const categories = {
 
 export const orders = {
   async getBuyerOrders() {
-    const response = await fetch(API_BASE + '/orders/me', {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchAllPages('/orders/me');
   },
 
   async getSellerOrders() {
-    const response = await fetch(API_BASE + '/orders/sales', {
-      headers: authHeaders(),
-    });
-    return handleResponse(response);
+    return fetchAllPages('/orders/sales');
   },
 
   async get(orderId) {
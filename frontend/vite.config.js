@@ -42,6 +42,10 @@ export default defineConfig({
         target: 'http://localhost:8000',
         changeOrigin: true,
       },
+      '/images': {
+        target: 'http://localhost:8000',
+        changeOrigin: true,
+      },
     }
   }
 })
@@ -0,0 +1,86 @@
+"""
+Consistency check for the denormalized auction columns on products
+(current_price, bid_count, highest_bid_id, last_bid_at).
+
+Recomputes them from the bids table in batches and reports any drift.
+
+Usage:
+    cd BidBay
+    conda run -n bidbay python -m scripts.check_auction_summary
+    conda run -n bidbay python -m scripts.check_auction_summary --repair
+"""
+
+import argparse
+
+from app.api.bids import compute_auction_summaries
+from app.core.database import SessionLocal
+from app.models import Product
+
+SUMMARY_FIELDS = ("current_price", "bid_count", "highest_bid_id", "last_bid_at")
+
+
+def check_batch(db, products: list, repair: bool) -> int:
+    """Compare a batch of products with their recomputed summaries. Returns the drift count."""
+    expected = compute_auction_summaries(db, [p.id for p in products])
+    drifted = 0
+
+    for product in products:
+        diffs = {
+            field: (getattr(product, field), value)
+            for field, value in expected[product.id].items()
+            if getattr(product, field) != value
+        }
+        if not diffs:
+            continue
+
+        drifted += 1
+        details = ", ".join(f"{field}: {stored} -> {actual}" for field, (stored, actual) in diffs.items())
+        print(f"  Product {product.id}: {details}")
+        if repair:
+            for field, (_, actual) in diffs.items():
+                setattr(product, field, actual)
+
+    if repair and drifted:
+        db.commit()
+    return drifted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect and repair drift in denormalized auction columns.")
+    parser.add_argument("--repair", action="store_true", help="Write recomputed values back to products")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    checked = 0
+    drifted = 0
+    last_id = 0
+
+    try:
+        while True:
+            products = (
+                db.query(Product)
+                .filter(Product.id > last_id)
+                .order_by(Product.id)
+                .limit(args.batch_size)
+                .all()
+            )
+            if not products:
+                break
+
+            drifted += check_batch(db, products, args.repair)
+            checked += len(products)
+            last_id = products[-1].id
+            db.expire_all()
+
+        action = "repaired" if args.repair else "found"
+        print(f"Checked {checked} products, {action} {drifted} with drift.")
+    finally:
+        db.close()
+
+    if drifted and not args.repair:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
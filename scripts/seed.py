@@ -5,17 +5,28 @@ Creates realistic sample data for testing and development.
 Usage:
     cd BidBay
     conda run -n bidbay python -m scripts.seed
+
+    # Synthetic dataset for load tests (see scripts/synthetic.py), appended
+    # to what is already there unless --clear is given
+    conda run -n bidbay python -m scripts.seed --users 100000 --products 1000000 --bids-per-product "~poisson(8)"
 """
 
+import argparse
+import os
 import random
+import time
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from app.api.analytics import refresh_rollups
+from app.api.bids import compute_auction_summaries
 from app.core.database import SessionLocal
+from scripts import synthetic
 from app.core.security import get_password_hash
 from app.models import (
     User, Address, Category, Product, ProductStatus,
-    ProductImage, Bid, BidStatus, Favorite, Order, OrderStatus, Payment, PaymentStatus
+    ProductImage, Bid, BidStatus, Favorite, Order, OrderStatus, Payment, PaymentStatus,
+    ProductFavoriteStats, ProxyBid, RefreshToken, UserBidStats,
 )
 
 
@@ -200,7 +211,10 @@ def clear_database(db):
     print("Clearing existing data...")
     db.query(Payment).delete()
     db.query(Order).delete()
+    db.query(ProductFavoriteStats).delete()
+    db.query(UserBidStats).delete()
     db.query(Favorite).delete()
+    db.query(ProxyBid).delete()
     # Clear accepted_bid_id FK before deleting bids (circular dependency)
     db.query(Product).update({Product.accepted_bid_id: None})
     db.query(Bid).delete()
@@ -208,6 +222,7 @@ def clear_database(db):
     db.query(Product).delete()
     db.query(Category).delete()
     db.query(Address).delete()
+    db.query(RefreshToken).delete()
     db.query(User).delete()
     db.commit()
     print("Database cleared.")
@@ -462,14 +477,79 @@ def seed_completed_auctions(db, users: dict, products: list):
     print(f"  Created {order_count} completed orders with payments.")
 
 
+def seed_auction_summaries(db, products: list):
+    """Fill the denormalized price/bid-count columns from the seeded bids."""
+    print("Computing auction summaries...")
+    summaries = compute_auction_summaries(db, [p.id for p in products])
+    for product in products:
+        for field, value in summaries[product.id].items():
+            setattr(product, field, value)
+
+    db.commit()
+    print(f"  Updated {len(products)} products.")
+
+
+def seed_synthetic(db, args):
+    """Generate a large synthetic dataset and print its timing report."""
+    print(f"Generating {args.users:,} users and {args.products:,} products "
+          f"({args.bids_per_product:g} bids/product on average, {args.workers} workers, seed {args.seed})...")
+    timings = synthetic.generate(
+        db,
+        users=args.users,
+        products=args.products,
+        bids_per_product=args.bids_per_product,
+        favorites_per_user=args.favorites_per_user,
+        categories=CATEGORIES,
+        workers=args.workers,
+        seed=args.seed,
+        chunk_size=args.chunk_size,
+    )
+
+    rollups = synthetic.PhaseTiming("rollups")
+    started = time.perf_counter()
+    with SessionLocal() as rollup_db:
+        refresh_rollups(rollup_db)
+        rollups.rows = {
+            model.__tablename__: rollup_db.query(model).count() for model in (ProductFavoriteStats, UserBidStats)
+        }
+    rollups.seconds = time.perf_counter() - started
+    synthetic.print_report([*timings, rollups])
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Seed the BidBay database")
+    parser.add_argument("--users", type=int, default=0, help="Generate this many synthetic users")
+    parser.add_argument("--products", type=int, default=0, help="Generate this many synthetic products")
+    parser.add_argument("--bids-per-product", type=synthetic.parse_mean, default=8.0,
+                        help='Mean bids per product, e.g. 8 or "~poisson(8)"')
+    parser.add_argument("--favorites-per-user", type=synthetic.parse_mean, default=5.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=42, help="Same seed, same dataset")
+    parser.add_argument("--chunk-size", type=int, default=synthetic.CHUNK_SIZE, help="Rows per insert transaction")
+    parser.add_argument("--clear", action="store_true", help="Clear the database before generating")
+    return parser.parse_args()
+
+
 def main():
     """Main seeding function."""
+    args = parse_args()
     print("\n" + "=" * 50)
     print("BidBay Database Seeding")
     print("=" * 50 + "\n")
 
     db = SessionLocal()
 
+    if args.users or args.products:
+        if args.products and not args.users:
+            raise SystemExit("--products needs --users to pick sellers and bidders from")
+        try:
+            if args.clear:
+                clear_database(db)
+            seed_synthetic(db, args)
+        finally:
+            db.close()
+        return
+
     try:
         # Clear existing data
         clear_database(db)
@@ -482,6 +562,9 @@ def main():
         seed_bids(db, users, products)
         seed_favorites(db, users, products)
         seed_completed_auctions(db, users, products)
+        seed_auction_summaries(db, products)
+        print("Building analytics rollups...")
+        refresh_rollups(db)
 
         print("\n" + "=" * 50)
         print("Seeding completed successfully!")
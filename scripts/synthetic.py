@@ -0,0 +1,351 @@
+"""
+High-volume synthetic data for load and scaling tests.
+
+Rows are generated in fixed-size chunks, each from its own deterministically
+seeded RNG, so a given --seed produces the same dataset whatever the number of
+workers. Chunks are written with Core executemany inserts (one transaction per
+chunk) by a pool of worker processes.
+
+Auctions that have already ended are closed the way the auction closer does
+it: with bids, the top one is accepted, the product is SOLD and an order
+awaits payment; without bids, the product is EXPIRED.
+
+Bids follow a Poisson count per product whose mean is scaled by a Pareto
+"popularity" weight: most products get a few bids, a handful get hundreds.
+Bidders and favorited products are skewed the same way, so a small set of
+heavy users accounts for most of the activity.
+
+Usage (through scripts.seed):
+    python -m scripts.seed --users 100000 --products 1000000 --bids-per-product "~poisson(8)"
+"""
+
+import math
+import multiprocessing
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import bindparam, create_engine, func, insert, select, update
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Favorite, Order, OrderStatus, Product, ProductStatus, User
+
+CHUNK_SIZE = 10_000
+ACTIVE_SHARE = 0.85
+MAX_POPULARITY = 250
+
+ADJECTIVES = ["Vintage", "Brass", "Leather", "Oak", "Walnut", "Ceramic", "Modern", "Antique", "Handmade", "Rustic",
+              "Compact", "Wireless", "Signed", "Rare", "Restored", "Painted", "Carved", "Folding", "Silver", "Copper"]
+NOUNS = ["Lamp", "Table", "Chair", "Camera", "Lens", "Vase", "Clock", "Mirror", "Guitar", "Watch",
+         "Bicycle", "Desk", "Radio", "Print", "Bowl", "Jacket", "Bag", "Record", "Speaker", "Rug"]
+DETAILS = ["in good condition", "from an estate sale", "with original box", "minor wear", "ships insured",
+           "collector item", "fully working", "some scratches", "recently serviced", "local pickup only"]
+
+
+def parse_mean(value: str) -> float:
+    """Accept ``8``, ``poisson(8)`` or ``~poisson(8)``."""
+    match = re.fullmatch(r"\s*~?\s*(?:poisson\((?P<inner>[^)]*)\)|(?P<plain>.*))\s*", value)
+    return float(match.group("inner") or match.group("plain"))
+
+
+def poisson(rng: random.Random, mean: float) -> int:
+    if mean <= 0:
+        return 0
+    if mean > 30:
+        # Normal approximation; Knuth's method gets slow for large means
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit = math.exp(-mean)
+    count, product = 0, rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def popularity(rng: random.Random) -> float:
+    """Heavy-tailed weight with mean ~1 (Pareto, alpha 1.5)."""
+    return min(rng.paretovariate(1.5) / 3, MAX_POPULARITY)
+
+
+def skewed_index(rng: random.Random, size: int, skew: float = 3.0) -> int:
+    """Index in [0, size) concentrated on the low end: index 0 is the busiest."""
+    return min(int(size * rng.random() ** skew), size - 1)
+
+
+def chunk_rng(seed: int, table: str, chunk: int) -> random.Random:
+    return random.Random(f"{seed}:{table}:{chunk}")
+
+
+def price_cents(rng: random.Random) -> int:
+    return max(100, min(round(rng.lognormvariate(4.5, 1.2) * 100), 10_000_000))
+
+
+def increment_cents(starting_cents: int) -> int:
+    for threshold, step in ((10_000, 100), (100_000, 500), (1_000_000, 2_500)):
+        if starting_cents < threshold:
+            return step
+    return 10_000
+
+
+def money(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+@dataclass
+class Plan:
+    """Everything a worker needs to generate its chunk without talking to the parent."""
+    seed: int
+    now: datetime
+    users: int
+    products: int
+    favorites_per_user: float
+    user_base: int
+    product_base: int
+    category_ids: list
+    password_hash: str
+
+
+@dataclass
+class PhaseTiming:
+    name: str
+    rows: dict = field(default_factory=dict)
+    seconds: float = 0.0
+
+
+_engine = None
+
+
+def _init_worker() -> None:
+    global _engine
+    connect_args = {"timeout": 60} if settings.DATABASE_URL.startswith("sqlite") else {}
+    _engine = create_engine(settings.DATABASE_URL, pool_size=1, max_overflow=0, connect_args=connect_args)
+
+
+def _insert(conn, model, rows: list) -> None:
+    if rows:
+        conn.execute(insert(model), rows)
+
+
+def _users_chunk(plan: Plan, chunk: int, start: int, stop: int) -> dict:
+    rng = chunk_rng(plan.seed, "users", chunk)
+    rows = []
+    for i in range(start, stop):
+        user_id = plan.user_base + i
+        rows.append({
+            "id": user_id,
+            "email": f"synthetic{user_id}@bidbay.com",
+            "password_hash": plan.password_hash,
+            "full_name": f"Synthetic User {user_id}",
+            "phone_number": f"+1-555-{rng.randrange(10_000):04d}",
+            "created_at": plan.now - timedelta(seconds=rng.randrange(365 * 86400)),
+        })
+    with _engine.begin() as conn:
+        _insert(conn, User, rows)
+    return {"users": len(rows)}
+
+
+def _products_chunk(plan: Plan, chunk: int, start: int, stop: int, bid_counts: list, bid_base: int) -> dict:
+    """Products ``start..stop`` with their bids (and orders for the sold ones); bid ids are pre-assigned from ``bid_base``."""
+    rng = chunk_rng(plan.seed, "products", chunk)
+    products, bids, orders, accepted = [], [], [], []
+    bid_id = bid_base
+    for i, bid_count in zip(range(start, stop), bid_counts):
+        product_id = plan.product_base + i
+        seller_id = plan.user_base + rng.randrange(plan.users)
+        created_at = plan.now - timedelta(seconds=rng.randrange(30 * 86400))
+        if rng.random() < ACTIVE_SHARE:
+            status = ProductStatus.ACTIVE
+            auction_end_at = plan.now + timedelta(seconds=rng.randrange(3600, 14 * 86400))
+        else:
+            status = ProductStatus.SOLD if bid_count else ProductStatus.EXPIRED
+            auction_end_at = created_at + (plan.now - created_at) * rng.random()
+        starting = price_cents(rng)
+        step = increment_cents(starting)
+
+        amount = starting
+        bidding_ends = min(auction_end_at, plan.now)
+        times = sorted(created_at + (bidding_ends - created_at) * rng.random() for _ in range(bid_count))
+        for n, bid_at in enumerate(times):
+            bidder_id = plan.user_base + skewed_index(rng, plan.users)
+            if bidder_id == seller_id:
+                bidder_id = plan.user_base + (bidder_id - plan.user_base + 1) % plan.users
+            if n:
+                amount += step * rng.randint(1, 3)
+            bids.append({
+                "id": bid_id,
+                "product_id": product_id,
+                "bidder_id": bidder_id,
+                "amount": money(amount),
+                "status": BidStatus.PENDING if n == bid_count - 1 else BidStatus.OUTBID,
+                "created_at": bid_at,
+            })
+            bid_id += 1
+        if status == ProductStatus.SOLD:
+            # As close_due_auctions: the top bid, the only PENDING one, wins; outbid bids stay OUTBID
+            winning_bid = bids[-1]
+            winning_bid["status"] = BidStatus.ACCEPTED
+            accepted.append({"product": product_id, "bid": winning_bid["id"]})
+            orders.append({
+                "product_id": product_id,
+                "buyer_id": winning_bid["bidder_id"],
+                "seller_id": seller_id,
+                "bid_id": winning_bid["id"],
+                "total_amount": winning_bid["amount"],
+                "status": OrderStatus.AWAITING_PAYMENT,
+                "created_at": auction_end_at,
+            })
+
+        title = f"{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}"
+        products.append({
+            "id": product_id,
+            "seller_id": seller_id,
+            "category_id": rng.choice(plan.category_ids),
+            "title": title,
+            "description": f"{title}, {', '.join(rng.sample(DETAILS, 2))}.",
+            "starting_price": money(starting),
+            "min_increment": money(step),
+            "auction_end_at": auction_end_at,
+            "status": status,
+            # Denormalized summary, consistent with compute_auction_summaries
+            "current_price": money(amount) if bid_count else None,
+            "bid_count": bid_count,
+            "highest_bid_id": bid_id - 1 if bid_count else None,
+            "last_bid_at": times[-1] if bid_count else None,
+            "created_at": created_at,
+        })
+    with _engine.begin() as conn:
+        _insert(conn, Product, products)
+        _insert(conn, Bid, bids)
+        if accepted:
+            # accepted_bid_id references bids, so it is set once they exist
+            conn.execute(
+                update(Product).where(Product.id == bindparam("product")).values(accepted_bid_id=bindparam("bid")),
+                accepted,
+            )
+        _insert(conn, Order, orders)
+    return {"products": len(products), "bids": len(bids), "orders": len(orders)}
+
+
+def _favorites_chunk(plan: Plan, chunk: int, start: int, stop: int) -> dict:
+    rng = chunk_rng(plan.seed, "favorites", chunk)
+    rows = []
+    for i in range(start, stop):
+        wanted = min(poisson(rng, plan.favorites_per_user), plan.products)
+        picked = set()
+        while len(picked) < wanted:
+            picked.add(plan.product_base + skewed_index(rng, plan.products, skew=2.0))
+        rows.extend(
+            {"user_id": plan.user_base + i, "product_id": product_id, "created_at": plan.now}
+            for product_id in sorted(picked)
+        )
+    with _engine.begin() as conn:
+        _insert(conn, Favorite, rows)
+    return {"favorites": len(rows)}
+
+
+def _run_task(task: tuple) -> dict:
+    function, args = task
+    return function(*args)
+
+
+def chunks(total: int, chunk_size: int):
+    for chunk, start in enumerate(range(0, total, chunk_size)):
+        yield chunk, start, min(start + chunk_size, total)
+
+
+def run_phase(pool, name: str, tasks: list) -> PhaseTiming:
+    timing = PhaseTiming(name)
+    started = time.perf_counter()
+    results = pool.imap_unordered(_run_task, tasks) if pool else map(_run_task, tasks)
+    for done, counts in enumerate(results, 1):
+        for table, rows in counts.items():
+            timing.rows[table] = timing.rows.get(table, 0) + rows
+        print(f"\r  {name}: {done}/{len(tasks)} chunks", end="", flush=True)
+    timing.seconds = time.perf_counter() - started
+    print()
+    return timing
+
+
+def ensure_categories(db, names: list) -> list:
+    existing = {category.name: category.id for category in db.query(Category)}
+    for name in names:
+        if name not in existing:
+            category = Category(name=name)
+            db.add(category)
+            db.flush()
+            existing[name] = category.id
+    db.commit()
+    return [existing[name] for name in names]
+
+
+def generate(
+    db,
+    users: int,
+    products: int,
+    bids_per_product: float,
+    favorites_per_user: float,
+    categories: list,
+    workers: int,
+    seed: int,
+    chunk_size: int = CHUNK_SIZE,
+) -> list:
+    """Append the synthetic dataset after the rows already in the database and return per-phase timings."""
+    def next_id(column) -> int:
+        return (db.scalar(select(func.max(column))) or 0) + 1
+
+    plan = Plan(
+        seed=seed,
+        now=datetime.utcnow().replace(microsecond=0),
+        users=users,
+        products=products,
+        favorites_per_user=favorites_per_user,
+        user_base=next_id(User.id),
+        product_base=next_id(Product.id),
+        category_ids=ensure_categories(db, categories),
+        password_hash=get_password_hash("password123"),
+    )
+    bid_base = next_id(Bid.id)
+    db.close()
+
+    # Bid counts are drawn up front so every product chunk knows its bid id range
+    counts_rng = chunk_rng(seed, "bid-counts", 0)
+    bid_counts = [poisson(counts_rng, bids_per_product * popularity(counts_rng)) for _ in range(products)]
+
+    product_tasks = []
+    for chunk, start, stop in chunks(products, chunk_size):
+        product_tasks.append((_products_chunk, (plan, chunk, start, stop, bid_counts[start:stop], bid_base)))
+        bid_base += sum(bid_counts[start:stop])
+
+    phases = [
+        ("users", [(_users_chunk, (plan, chunk, start, stop)) for chunk, start, stop in chunks(users, chunk_size)]),
+        ("products+bids", product_tasks),
+    ]
+    if favorites_per_user > 0:
+        phases.append(
+            ("favorites", [(_favorites_chunk, (plan, chunk, start, stop)) for chunk, start, stop in chunks(users, chunk_size)])
+        )
+
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            return [run_phase(pool, name, tasks) for name, tasks in phases]
+    _init_worker()
+    return [run_phase(None, name, tasks) for name, tasks in phases]
+
+
+def print_report(timings: list) -> None:
+    print("\nTiming report")
+    print(f"  {'phase':<15} {'rows':>12} {'seconds':>9} {'rows/s':>10}  tables")
+    total_rows = total_seconds = 0
+    for timing in timings:
+        rows = sum(timing.rows.values())
+        rate = rows / timing.seconds if timing.seconds else 0
+        tables = ", ".join(f"{table}={count:,}" for table, count in timing.rows.items())
+        print(f"  {timing.name:<15} {rows:>12,} {timing.seconds:>9.1f} {rate:>10,.0f}  {tables}")
+        total_rows += rows
+        total_seconds += timing.seconds
+    rate = total_rows / total_seconds if total_seconds else 0
+    print(f"  {'total':<15} {total_rows:>12,} {total_seconds:>9.1f} {rate:>10,.0f}")
@@ -0,0 +1,218 @@
+"""
+Analytics benchmark: GROUP BY over favorites/bids vs the rollup tables.
+
+Grows a dedicated set of benchmark users, products, favorites and bids to each
+requested size, rebuilds the rollups, then times the previous aggregate queries
+of /analytics/trending-products and /analytics/top-bidders against the rollup
+reads that replaced them, and checks both return the same leaderboard.
+
+Usage:
+    cd BidBay
+    python tests/analytics_benchmark.py --sizes 100000 1000000
+    python tests/analytics_benchmark.py --sizes 100000 --cleanup    # drop the rows afterwards
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import func, insert, select
+
+from app.api.analytics import refresh_rollups
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import (
+    Bid, Category, Favorite, Product, ProductFavoriteStats, ProductStatus, User, UserBidStats,
+)
+
+CATEGORY_NAME = "Analytics Benchmark"
+EMAIL_PREFIX = "analytics_benchmark"
+USERS = 2_000
+PRODUCTS = 20_000
+BATCH_SIZE = 10_000
+RESULT_LIMIT = 50
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def ensure_fixtures(db) -> tuple[list[int], list[int], int]:
+    category = db.query(Category).filter(Category.name == CATEGORY_NAME).first()
+    if category is None:
+        category = Category(name=CATEGORY_NAME)
+        db.add(category)
+        db.commit()
+
+    user_ids = [row.id for row in db.query(User.id).filter(User.email.like(f"{EMAIL_PREFIX}_%")).order_by(User.id)]
+    if len(user_ids) < USERS:
+        password_hash = get_password_hash("password123")
+        db.execute(insert(User), [
+            {"email": f"{EMAIL_PREFIX}_{i}@bidbay.com", "password_hash": password_hash, "full_name": f"Benchmark {i}"}
+            for i in range(len(user_ids), USERS)
+        ])
+        db.commit()
+        user_ids = [row.id for row in db.query(User.id).filter(User.email.like(f"{EMAIL_PREFIX}_%")).order_by(User.id)]
+
+    product_ids = [row.id for row in db.query(Product.id).filter(Product.category_id == category.id).order_by(Product.id)]
+    if len(product_ids) < PRODUCTS:
+        ends_at = datetime.utcnow() + timedelta(days=30)
+        for start in range(len(product_ids), PRODUCTS, BATCH_SIZE):
+            db.execute(insert(Product), [
+                {
+                    "seller_id": user_ids[i % len(user_ids)],
+                    "category_id": category.id,
+                    "title": f"Analytics Benchmark Product {i}",
+                    "starting_price": 10,
+                    "min_increment": 1,
+                    "auction_end_at": ends_at,
+                    "status": ProductStatus.ACTIVE,
+                }
+                for i in range(start, min(start + BATCH_SIZE, PRODUCTS))
+            ])
+            db.commit()
+        product_ids = [row.id for row in db.query(Product.id).filter(Product.category_id == category.id).order_by(Product.id)]
+    return user_ids, product_ids, category.id
+
+
+def grow_to(db, size: int, user_ids: list[int], product_ids: list[int]) -> None:
+    """Bring both favorites and bids on the benchmark products up to ``size`` rows each."""
+    started = time.perf_counter()
+    favorites = db.query(func.count()).select_from(Favorite).filter(Favorite.product_id.in_(product_ids)).scalar()
+    # Favorites are unique per (user, product): walk the pairs deterministically
+    while favorites < size:
+        batch = min(BATCH_SIZE, size - favorites)
+        db.execute(insert(Favorite), [
+            {"user_id": user_ids[n % len(user_ids)], "product_id": product_ids[(n // len(user_ids)) % len(product_ids)]}
+            for n in range(favorites, favorites + batch)
+        ])
+        db.commit()
+        favorites += batch
+
+    bids = db.query(func.count(Bid.id)).filter(Bid.product_id.in_(product_ids)).scalar()
+    rng = random.Random(bids)
+    while bids < size:
+        batch = min(BATCH_SIZE, size - bids)
+        db.execute(insert(Bid), [
+            {
+                # Skewed towards a few heavy bidders, like a real leaderboard
+                "bidder_id": user_ids[min(int(rng.expovariate(1 / 200)), len(user_ids) - 1)],
+                "product_id": rng.choice(product_ids),
+                "amount": rng.randint(10, 1000),
+            }
+            for _ in range(batch)
+        ])
+        db.commit()
+        bids += batch
+    print(f"[INFO] {size} favorites and bids ready ({time.perf_counter() - started:.1f}s spent inserting)")
+
+
+def legacy_trending():
+    favorite_count = func.count(Favorite.product_id)
+    return (
+        select(Product.id, favorite_count.label("favorite_count"))
+        .join(Favorite, Favorite.product_id == Product.id)
+        .group_by(Product.id)
+        .order_by(favorite_count.desc(), Product.id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def rollup_trending():
+    return (
+        select(ProductFavoriteStats.product_id, ProductFavoriteStats.favorite_count)
+        .order_by(ProductFavoriteStats.favorite_count.desc(), ProductFavoriteStats.product_id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def legacy_top_bidders():
+    bid_count = func.count(Bid.id)
+    return (
+        select(User.id, bid_count.label("bid_count"))
+        .join(Bid, Bid.bidder_id == User.id)
+        .group_by(User.id)
+        .order_by(bid_count.desc(), User.id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def rollup_top_bidders():
+    return (
+        select(UserBidStats.user_id, UserBidStats.bid_count)
+        .order_by(UserBidStats.bid_count.desc(), UserBidStats.user_id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def measure(db, build, rounds: int) -> tuple[dict, list]:
+    latencies = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        rows = db.execute(build()).all()
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+    }, [tuple(row) for row in rows]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark rows when done")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    category_id = None
+    try:
+        print_step("Create benchmark users and products")
+        user_ids, product_ids, category_id = ensure_fixtures(db)
+        for size in sorted(args.sizes):
+            print_step(f"Grow favorites and bids to {size} rows each")
+            grow_to(db, size, user_ids, product_ids)
+
+            started = time.perf_counter()
+            refresh_rollups(db)
+            print(f"[INFO] size={size} full rollup rebuild took {time.perf_counter() - started:.2f}s")
+
+            for endpoint, legacy, rollup in [
+                ("trending-products", legacy_trending, rollup_trending),
+                ("top-bidders", legacy_top_bidders, rollup_top_bidders),
+            ]:
+                measure(db, legacy, 1)  # warm up caches
+                legacy_result, legacy_rows = measure(db, legacy, args.rounds)
+                rollup_result, rollup_rows = measure(db, rollup, args.rounds)
+                assert legacy_rows == rollup_rows, f"{endpoint}: rollup leaderboard differs from GROUP BY"
+                print(f"[INFO] size={size} {endpoint:<17} group-by p50={legacy_result['p50_ms']:.2f}ms "
+                      f"p95={legacy_result['p95_ms']:.2f}ms | rollup p50={rollup_result['p50_ms']:.2f}ms "
+                      f"p95={rollup_result['p95_ms']:.2f}ms")
+    finally:
+        if args.cleanup and category_id is not None:
+            print_step("Cleaning up benchmark rows")
+            db.rollback()
+            product_ids = select(Product.id).where(Product.category_id == category_id)
+            user_ids = select(User.id).where(User.email.like(f"{EMAIL_PREFIX}_%"))
+            db.query(Bid).filter(Bid.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Favorite).filter(Favorite.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.category_id == category_id).delete(synchronize_session=False)
+            db.query(Category).filter(Category.id == category_id).delete(synchronize_session=False)
+            db.query(User).filter(User.id.in_(user_ids)).delete(synchronize_session=False)
+            db.commit()
+            refresh_rollups(db)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,414 @@
+"""
+API benchmark suite with JSON baselines.
+
+Creates its own seller, bidders, category and products, then has CONCURRENCY
+simulated clients run a weighted mix of scenarios:
+
+    browse    feed pages (following the cursor) and the category list
+    detail    product detail polling, skewed towards the hot items
+    bid       bid storms on a few hot items
+    checkout  list an item, bid, accept and pay
+
+Each client draws its scenarios from its own seeded RNG, so two runs with the
+same options send the same requests. Per endpoint it reports throughput,
+p50/p95/p99 latency and SQL queries per request. In-process they are counted
+directly; a server only reports them (through Server-Timing) when started with
+SQL_PROFILE_SAMPLE_RATE=1.
+
+The app runs in-process through httpx's ASGI transport by default; pass
+--base-url to drive a local uvicorn instead (same DATABASE_URL, since the
+fixtures are written directly to the database).
+
+Usage:
+    cd BidBay
+    python tests/benchmark.py --save-baseline tests/baselines/local.json
+    # ... change something ...
+    python tests/benchmark.py --baseline tests/baselines/local.json --threshold 0.25   # exits 1 on regression
+    python tests/benchmark.py --base-url http://localhost:8000 --mix browse=1,bid=3
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timedelta
+from decimal import Decimal
+import json
+from pathlib import Path
+import random
+import re
+import statistics
+import sys
+import time
+from typing import Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+from sqlalchemy import event, or_
+
+from app.core import database
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models import Bid, Category, Order, Payment, Product, ProductStatus, User
+
+DEFAULT_MIX = "browse=40,detail=35,bid=20,checkout=5"
+CATALOG_PRODUCTS = 200
+HOT_PRODUCTS = 3
+BIDDERS = 20
+PASSWORD = "password123"
+# Bid outcomes that are part of a storm, not failures
+EXPECTED_REJECTIONS = {400, 409}
+# Latency differences below this are treated as noise when comparing to a baseline
+NOISE_FLOOR_MS = 2.0
+SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+_request_queries: ContextVar[Optional[list]] = ContextVar("request_queries", default=None)
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def count_queries(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _request_queries.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def instrumented_engines() -> list:
+    engines = [database.engine, database.replica_engine]
+    engines += [e.sync_engine for e in (database.async_engine, database.async_replica_engine) if e is not None]
+    return [e for e in engines if e is not None]
+
+
+class Recorder:
+    def __init__(self, client: httpx.AsyncClient, count_sql: bool):
+        self.client = client
+        self.count_sql = count_sql
+        self.results: dict = defaultdict(lambda: {"latencies": [], "queries": [], "errors": 0, "rejected": 0})
+
+    async def request(self, label: str, method: str, url: str, token: str, expected: tuple = (), **kwargs):
+        """Send one request and record it under ``label`` (the route template)."""
+        counter = [0]
+        reset = _request_queries.set(counter)
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+        except httpx.HTTPError:
+            response = None
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_queries.reset(reset)
+
+        result = self.results[label]
+        result["latencies"].append(elapsed)
+        if self.count_sql:
+            result["queries"].append(counter[0])
+        elif response is not None:
+            match = SERVER_TIMING_QUERIES.search(response.headers.get("Server-Timing", ""))
+            if match:
+                result["queries"].append(int(match.group(1)))
+        if response is None or (response.status_code >= 400 and response.status_code not in expected):
+            result["errors"] += 1
+            return None
+        if response.status_code >= 400:
+            result["rejected"] += 1
+            return None
+        return response
+
+
+class Fixtures:
+    def __init__(self, seller: dict, bidders: list, category_id: int, product_ids: list, hot: dict):
+        self.seller = seller
+        self.bidders = bidders
+        self.category_id = category_id
+        self.product_ids = product_ids
+        # Hot product id -> last price seen, shared by all clients
+        self.hot = hot
+
+
+def create_fixtures(db, suffix: int) -> tuple[dict, list, int, list, dict]:
+    password_hash = get_password_hash(PASSWORD)
+    seller = User(email=f"bench_seller_{suffix}@bidbay.com", password_hash=password_hash, full_name="Bench Seller")
+    bidders = [
+        User(email=f"bench_bidder_{suffix}_{i}@bidbay.com", password_hash=password_hash, full_name=f"Bench Bidder {i}")
+        for i in range(BIDDERS)
+    ]
+    category = Category(name=f"Bench Category {suffix}")
+    db.add_all([seller, *bidders, category])
+    db.commit()
+
+    ends_at = datetime.utcnow() + timedelta(days=1)
+    products = [
+        Product(
+            seller_id=seller.id,
+            category_id=category.id,
+            title=f"Bench Product {suffix}-{i}",
+            description="Benchmark item",
+            starting_price=Decimal("10.00"),
+            min_increment=Decimal("1.00"),
+            auction_end_at=ends_at,
+            status=ProductStatus.ACTIVE,
+        )
+        for i in range(CATALOG_PRODUCTS)
+    ]
+    db.add_all(products)
+    db.commit()
+    product_ids = [p.id for p in products]
+    return (
+        {"id": seller.id, "email": seller.email},
+        [{"id": b.id, "email": b.email} for b in bidders],
+        category.id,
+        product_ids,
+        {product_id: Decimal("10.00") for product_id in product_ids[:HOT_PRODUCTS]},
+    )
+
+
+def cleanup_fixtures(db, suffix: int) -> None:
+    users = db.query(User.id).filter(User.email.like(f"bench_%_{suffix}%@bidbay.com"))
+    products = db.query(Product.id).filter(Product.seller_id.in_(users))
+    orders = db.query(Order.id).filter(Order.product_id.in_(products))
+    db.query(Payment).filter(Payment.order_id.in_(orders)).delete(synchronize_session=False)
+    db.query(Order).filter(Order.id.in_(orders)).delete(synchronize_session=False)
+    db.query(Product).filter(Product.id.in_(products)).update({Product.accepted_bid_id: None}, synchronize_session=False)
+    db.query(Bid).filter(or_(Bid.product_id.in_(products), Bid.bidder_id.in_(users))).delete(synchronize_session=False)
+    db.query(Product).filter(Product.id.in_(products)).delete(synchronize_session=False)
+    db.query(Category).filter(Category.name == f"Bench Category {suffix}").delete(synchronize_session=False)
+    db.query(User).filter(User.id.in_(users)).delete(synchronize_session=False)
+    db.commit()
+
+
+async def browse(rec: Recorder, fx: Fixtures, rng: random.Random, token: str) -> None:
+    await rec.request("GET /categories/", "GET", "/categories/", token)
+    cursor = None
+    for _ in range(rng.randint(1, 3)):
+        params = {"limit": 20, **({"cursor": cursor} if cursor else {})}
+        response = await rec.request("GET /products/feed", "GET", "/products/feed", token, params=params)
+        cursor = response.headers.get("X-Next-Cursor") if response is not None else None
+        if not cursor:
+            break
+
+
+async def detail(rec: Recorder, fx: Fixtures, rng: random.Random, token: str) -> None:
+    hot = list(fx.hot)
+    product_id = rng.choice(hot) if rng.random() < 0.5 else rng.choice(fx.product_ids)
+    for _ in range(rng.randint(1, 4)):
+        await rec.request("GET /products/{id}/details", "GET", f"/products/{product_id}/details", token)
+
+
+async def bid(rec: Recorder, fx: Fixtures, rng: random.Random, token: str) -> None:
+    product_id = rng.choice(list(fx.hot))
+    for _ in range(rng.randint(1, 3)):
+        amount = fx.hot[product_id] + rng.randint(1, 3)
+        response = await rec.request(
+            "POST /bids/", "POST", "/bids/", token, expected=EXPECTED_REJECTIONS,
+            json={"product_id": product_id, "amount": str(amount)},
+        )
+        if response is not None:
+            fx.hot[product_id] = max(fx.hot[product_id], amount)
+            continue
+        # Outbid in the meantime: refresh the price like a client would
+        response = await rec.request("GET /products/{id}", "GET", f"/products/{product_id}", token)
+        if response is not None and response.json().get("current_price"):
+            fx.hot[product_id] = max(fx.hot[product_id], Decimal(response.json()["current_price"]))
+
+
+async def checkout(rec: Recorder, fx: Fixtures, rng: random.Random, token: str, seller_token: str) -> None:
+    ends_at = (datetime.utcnow() + timedelta(hours=1)).isoformat() + "Z"
+    response = await rec.request("POST /products/", "POST", "/products/", seller_token, json={
+        "category_id": fx.category_id, "title": f"Bench Checkout {rng.random():.8f}",
+        "starting_price": "5.00", "auction_end_at": ends_at,
+    })
+    if response is None:
+        return
+    product_id = response.json()["id"]
+    response = await rec.request("POST /bids/", "POST", "/bids/", token, expected=EXPECTED_REJECTIONS,
+                                 json={"product_id": product_id, "amount": "5.00"})
+    if response is None:
+        return
+    response = await rec.request("POST /bids/{id}/accept", "POST", f"/bids/{response.json()['id']}/accept", seller_token)
+    if response is None:
+        return
+    await rec.request("POST /payments/", "POST", "/payments/", token, json={"order_id": response.json()["id"]})
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r}, expected one of {', '.join(SCENARIOS)}")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+SCENARIOS = {"browse": browse, "detail": detail, "bid": bid, "checkout": checkout}
+
+
+async def client_loop(rec: Recorder, fx: Fixtures, tokens: dict, mix: dict, seed: int, index: int,
+                      iterations: int) -> None:
+    rng = random.Random(f"{seed}:{index}")
+    names, weights = list(mix), list(mix.values())
+    bidder = fx.bidders[index % len(fx.bidders)]
+    for _ in range(iterations):
+        name = rng.choices(names, weights)[0]
+        if name == "checkout":
+            await checkout(rec, fx, rng, tokens[bidder["email"]], tokens[fx.seller["email"]])
+        else:
+            await SCENARIOS[name](rec, fx, rng, tokens[bidder["email"]])
+
+
+async def login(client: httpx.AsyncClient, email: str) -> str:
+    response = await client.post("/auth/login", data={"username": email, "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+def summarize(result: dict, elapsed: float) -> dict:
+    latencies = result["latencies"]
+    summary = {
+        "requests": len(latencies),
+        "errors": result["errors"],
+        "rejected": result["rejected"],
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    if result["queries"]:
+        summary["queries_per_request"] = round(statistics.mean(result["queries"]), 2)
+    return summary
+
+
+async def run(args: argparse.Namespace, fx: Fixtures) -> dict:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app.main import app
+
+        transport, base_url = httpx.ASGITransport(app=app), "http://benchmark"
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        emails = [fx.seller["email"], *(b["email"] for b in fx.bidders)]
+        tokens = dict(zip(emails, await asyncio.gather(*(login(client, email) for email in emails))))
+
+        rec = Recorder(client, count_sql=transport is not None)
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            client_loop(rec, fx, tokens, args.mix, args.seed, i, args.iterations) for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    everything = {"latencies": [], "queries": [], "errors": 0, "rejected": 0}
+    for result in rec.results.values():
+        for key in everything:
+            everything[key] += result[key]
+    return {
+        "target": args.base_url or "in-process",
+        "database": database.engine.dialect.name,
+        "db_mode": settings.DB_MODE,
+        "concurrency": args.concurrency,
+        "iterations": args.iterations,
+        "mix": args.mix,
+        "seed": args.seed,
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "duration": round(elapsed, 2),
+        "endpoints": {label: summarize(result, elapsed) for label, result in sorted(rec.results.items())},
+        "total": summarize(everything, elapsed),
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return the regressions of ``report`` against ``baseline``."""
+    regressions = []
+    if report["total"]["rps"] < baseline["total"]["rps"] * (1 - threshold):
+        regressions.append(f"total throughput {report['total']['rps']} < baseline {baseline['total']['rps']} rps")
+    for label, base in baseline["endpoints"].items():
+        current = report["endpoints"].get(label)
+        if current is None:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            limit = base[metric] * (1 + threshold)
+            if current[metric] > limit and current[metric] - base[metric] > NOISE_FLOOR_MS:
+                regressions.append(f"{label}: {metric} {current[metric]} > {limit:.2f} (baseline {base[metric]})")
+        if "queries_per_request" in base and "queries_per_request" in current:
+            # Query counts are deterministic: any growth is a real change
+            if current["queries_per_request"] > base["queries_per_request"] + 0.05:
+                regressions.append(f"{label}: {current['queries_per_request']} queries/request "
+                                   f"(baseline {base['queries_per_request']})")
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{label}: {current['errors']} errors (baseline {base['errors']})")
+    return regressions
+
+
+def print_report(report: dict) -> None:
+    print(f"\n  {'endpoint':<28} {'reqs':>6} {'err':>4} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'sql/req':>8}")
+    for label, summary in [*report["endpoints"].items(), ("total", report["total"])]:
+        print(f"  {label:<28} {summary['requests']:>6} {summary['errors']:>4} {summary['rps']:>8} "
+              f"{summary['p50_ms']:>8} {summary['p95_ms']:>8} {summary['p99_ms']:>8} "
+              f"{summary.get('queries_per_request', '-'):>8}")
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=25, help="Scenarios run by each client")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Default: {DEFAULT_MIX}")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--save-baseline", help="Write the JSON report here as the new baseline")
+    parser.add_argument("--baseline", help="Compare against this baseline and exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    for engine in instrumented_engines():
+        event.listen(engine, "before_cursor_execute", count_queries)
+
+    db = database.SessionLocal()
+    suffix = int(datetime.utcnow().timestamp())
+    regressions: list[str] = []
+    try:
+        print_step("Create benchmark fixtures")
+        fx = Fixtures(*create_fixtures(db, suffix))
+
+        print_step(f"Run {args.concurrency} clients x {args.iterations} scenarios ({args.base_url or 'in-process'})")
+        report = asyncio.run(run(args, fx))
+        print_report(report)
+
+        for path in filter(None, [args.output, args.save_baseline]):
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            Path(path).write_text(json.dumps(report, indent=2) + "\n")
+            print(f"[INFO] Report written to {path}")
+
+        if args.baseline:
+            print_step(f"Compare with {args.baseline} (threshold {args.threshold:.0%})")
+            regressions = compare(report, json.loads(Path(args.baseline).read_text()), args.threshold)
+            for regression in regressions:
+                print(f"[FAIL] {regression}")
+            if not regressions:
+                print("[INFO] No regressions")
+    finally:
+        print_step("Cleaning up benchmark data")
+        db.rollback()
+        cleanup_fixtures(db, suffix)
+        db.close()
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Concurrent bid placement stress test.
+
+Fires waves of simultaneous bids at several products: in every wave each
+product gets BIDDERS_PER_LEVEL bids at the same price level. Exactly one of
+them may win each level, and the product's denormalized summary must match.
+
+Usage:
+    cd BidBay
+    DATABASE_URL=mysql+pymysql://... python tests/bid_stress_test.py
+    DATABASE_URL=sqlite:///stress.db python tests/bid_stress_test.py   # local stand-in
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+import threading
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.bids import submit_bid
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Product, ProductStatus, User
+
+PRODUCTS = 20
+PRICE_LEVELS = 10
+BIDDERS_PER_LEVEL = 10
+MAX_RETRIES = 20
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def make_session_factory():
+    connect_args = {}
+    if settings.DATABASE_URL.startswith("sqlite"):
+        # SQLite serializes writers; give them time to wait on each other
+        connect_args = {"timeout": 60, "check_same_thread": False}
+    engine = create_engine(
+        settings.DATABASE_URL,
+        pool_size=PRODUCTS * BIDDERS_PER_LEVEL,
+        max_overflow=0,
+        connect_args=connect_args,
+    )
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def main() -> None:
+    Session = make_session_factory()
+    db = Session()
+    created = {"product_ids": [], "user_ids": [], "category_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    stats = {"won": 0, "rejected": 0, "retries": 0}
+    stats_lock = threading.Lock()
+
+    def fire(product_id: int, bidder_id: int, amount: Decimal, barrier: threading.Barrier) -> None:
+        barrier.wait()
+        session = Session()
+        try:
+            for _ in range(MAX_RETRIES):
+                try:
+                    submit_bid(session, product_id, bidder_id, amount)
+                    outcome = "won"
+                    break
+                except HTTPException:
+                    outcome = "rejected"
+                    break
+                except OperationalError:
+                    # Lock wait timeout / deadlock victim: retry like a client would
+                    session.rollback()
+                    with stats_lock:
+                        stats["retries"] += 1
+            else:
+                outcome = "rejected"
+            with stats_lock:
+                stats[outcome] += 1
+        finally:
+            session.close()
+
+    try:
+        print_step("Create seller, bidders, category and products")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"stress_seller_{suffix}@bidbay.com", password_hash=password_hash, full_name="Stress Seller")
+        bidders = [
+            User(email=f"stress_bidder_{suffix}_{i}@bidbay.com", password_hash=password_hash, full_name=f"Stress Bidder {i}")
+            for i in range(BIDDERS_PER_LEVEL)
+        ]
+        db.add_all([seller, *bidders])
+        db.commit()
+        created["user_ids"] = [seller.id] + [b.id for b in bidders]
+
+        category = Category(name=f"Stress Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["category_id"] = category.id
+
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Stress Product {suffix}-{i}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+            for i in range(PRODUCTS)
+        ]
+        db.add_all(products)
+        db.commit()
+        created["product_ids"] = [p.id for p in products]
+
+        total = PRODUCTS * PRICE_LEVELS * BIDDERS_PER_LEVEL
+        print_step(f"Fire {total} bids in {PRICE_LEVELS} waves of {PRODUCTS * BIDDERS_PER_LEVEL} concurrent bids")
+        levels = [Decimal("10.00") + Decimal(level) for level in range(PRICE_LEVELS)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=PRODUCTS * BIDDERS_PER_LEVEL) as pool:
+            for amount in levels:
+                barrier = threading.Barrier(PRODUCTS * BIDDERS_PER_LEVEL)
+                futures = [
+                    pool.submit(fire, product_id, bidder.id, amount, barrier)
+                    for product_id in created["product_ids"]
+                    for bidder in bidders
+                ]
+                for future in futures:
+                    future.result()
+        elapsed = time.perf_counter() - started
+
+        print(f"[INFO] {total} bids in {elapsed:.2f}s -> {total / elapsed:.0f} bids/s")
+        print(f"[INFO] won={stats['won']} rejected={stats['rejected']} retries={stats['retries']}")
+
+        print_step("Verify exactly one winner per price level")
+        assert stats["won"] == PRODUCTS * PRICE_LEVELS
+        db.expire_all()
+        for product_id in created["product_ids"]:
+            bids = db.query(Bid).filter(Bid.product_id == product_id).order_by(Bid.amount).all()
+            assert [b.amount for b in bids] == levels, f"product {product_id}: {[b.amount for b in bids]}"
+            assert [b.status for b in bids].count(BidStatus.PENDING) == 1
+            assert bids[-1].status == BidStatus.PENDING
+
+            product = db.query(Product).filter(Product.id == product_id).one()
+            assert product.current_price == levels[-1]
+            assert product.bid_count == PRICE_LEVELS
+            assert product.highest_bid_id == bids[-1].id
+
+        print_step("Bid stress test completed successfully")
+    finally:
+        print_step("Cleaning up stress test data")
+        db.rollback()
+        if created["product_ids"]:
+            db.query(Bid).filter(Bid.product_id.in_(created["product_ids"])).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(created["product_ids"])).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
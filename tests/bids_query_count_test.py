@@ -0,0 +1,169 @@
+"""
+Query count regression test for GET /bids/me and GET /bids/product/{id}.
+
+Each page must cost a fixed number of queries however many bids it holds:
+one for a bidder's own bids, two (ownership check + page) for a product's bids.
+
+Usage:
+    cd BidBay
+    python tests/bids_query_count_test.py
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import Response
+from sqlalchemy import event
+
+from app.api.bids import list_my_bids, list_product_bids
+from app.api.deps import Principal
+from app.core.database import SessionLocal, engine
+from app.core.pagination import MAX_PAGE_SIZE, PageParams
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Order, OrderStatus, Product, ProductStatus, User
+
+MY_BIDS_QUERIES = 1
+PRODUCT_BIDS_QUERIES = 2
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+@contextmanager
+def count_queries():
+    counter = {"count": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"product_ids": [], "user_ids": [], "category_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create a seller, three bidders and 50 products")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"bidcount_seller_{suffix}@bidbay.com", password_hash=password_hash,
+                      full_name="Bid Count Seller", phone_number="+1-555-7771")
+        small_bidder = User(email=f"bidcount_small_{suffix}@bidbay.com", password_hash=password_hash,
+                            full_name="Small Bidder")
+        large_bidder = User(email=f"bidcount_large_{suffix}@bidbay.com", password_hash=password_hash,
+                            full_name="Large Bidder")
+        crowd_bidder = User(email=f"bidcount_crowd_{suffix}@bidbay.com", password_hash=password_hash,
+                            full_name="Crowd Bidder")
+        db.add_all([seller, small_bidder, large_bidder, crowd_bidder])
+        db.commit()
+        created["user_ids"] = [seller.id, small_bidder.id, large_bidder.id, crowd_bidder.id]
+
+        category = Category(name=f"Bid Count Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["category_id"] = category.id
+
+        products = [
+            Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Bid Count Product {suffix}-{i}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+            for i in range(50)
+        ]
+        db.add_all(products)
+        db.flush()
+        created["product_ids"] = [p.id for p in products]
+
+        print_step("Place 5 bids for one bidder and 50 for the other; accept one of them")
+        for product in products[:5]:
+            db.add(Bid(product_id=product.id, bidder_id=small_bidder.id, amount=Decimal("10.00")))
+        large_bids = [
+            Bid(product_id=product.id, bidder_id=large_bidder.id, amount=Decimal("11.00") + i)
+            for i, product in enumerate(products)
+        ]
+        db.add_all(large_bids)
+        db.flush()
+        large_bids[0].status = BidStatus.ACCEPTED
+        db.add(Order(
+            product_id=products[0].id,
+            buyer_id=large_bidder.id,
+            seller_id=seller.id,
+            bid_id=large_bids[0].id,
+            total_amount=large_bids[0].amount,
+            status=OrderStatus.AWAITING_PAYMENT,
+        ))
+        # 45 more bids on the first product, for the product-bids page
+        for i in range(45):
+            db.add(Bid(product_id=products[0].id, bidder_id=crowd_bidder.id, amount=Decimal("100.00") + i))
+        db.commit()
+
+        page = PageParams(limit=MAX_PAGE_SIZE, cursor=None)
+        small_principal, large_principal, seller_principal = [
+            Principal(user.id, user.email, user.full_name) for user in (small_bidder, large_bidder, seller)
+        ]
+        first_bid_id = large_bids[0].id
+        product_ids = created["product_ids"]
+
+        print_step("Count queries for /bids/me with 5 vs 50 bids")
+        with count_queries() as small_counter:
+            small_result = list_my_bids(db, small_principal, Response(), page)
+        with count_queries() as large_counter:
+            large_result = list_my_bids(db, large_principal, Response(), page)
+        print(f"[INFO] /bids/me: 5 bids -> {small_counter['count']} queries, 50 bids -> {large_counter['count']} queries")
+        assert len(small_result) == 5 and len(large_result) == 50
+        assert small_counter["count"] == large_counter["count"] == MY_BIDS_QUERIES
+
+        accepted = next(b for b in large_result if b.id == first_bid_id)
+        assert accepted.order_status == OrderStatus.AWAITING_PAYMENT.value
+        assert accepted.seller.phone_number == "+1-555-7771"
+        assert all(b.seller.phone_number is None and b.order_status is None for b in large_result if b is not accepted)
+        assert all(b.product_title.startswith("Bid Count Product") for b in large_result)
+
+        print_step("Count queries for /bids/product/{id} with 2 vs 47 bids")
+        with count_queries() as small_counter:
+            small_result = list_product_bids(product_ids[1], db, seller_principal, Response(), page)
+        with count_queries() as large_counter:
+            large_result = list_product_bids(product_ids[0], db, seller_principal, Response(), page)
+        print(f"[INFO] /bids/product: 2 bids -> {small_counter['count']} queries, 47 bids -> {large_counter['count']} queries")
+        assert len(small_result) == 2 and len(large_result) == 47
+        assert small_counter["count"] == large_counter["count"] == PRODUCT_BIDS_QUERIES
+        assert [b.amount for b in large_result] == sorted((b.amount for b in large_result), reverse=True)
+        assert all(b.bidder.full_name in ("Small Bidder", "Large Bidder", "Crowd Bidder") for b in large_result)
+
+        print_step("Bid listing query count test completed successfully")
+    finally:
+        print_step("Cleaning up bid listing test data")
+        db.rollback()
+        product_ids = created["product_ids"]
+        if product_ids:
+            db.query(Order).filter(Order.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Bid).filter(Bid.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(product_ids)).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created["user_ids"]:
+            db.query(User).filter(User.id.in_(created["user_ids"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
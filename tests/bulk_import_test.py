@@ -0,0 +1,117 @@
+"""
+Bulk product import test: 10k items through POST /products/bulk's import path.
+
+Imports 10,000 products (every tenth with two images) from NDJSON lines, mixed
+with invalid items that must be reported by index without blocking the rest,
+then checks every created product and image landed and reports throughput.
+
+Usage:
+    cd BidBay
+    python tests/bulk_import_test.py
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import func
+
+from app.api.products import import_products, parse_bulk_item
+from app.core.database import SessionLocal
+from app.core.security import get_password_hash
+from app.models import Category, Product, ProductImage, User
+
+ITEMS = 10_000
+INVALID_EVERY = 1_000
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {"user_id": None, "category_id": None}
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller and category")
+        seller = User(email=f"bulk_seller_{suffix}@bidbay.com", password_hash=get_password_hash("password123"),
+                      full_name="Bulk Seller")
+        category = Category(name=f"Bulk Category {suffix}")
+        db.add_all([seller, category])
+        db.commit()
+        created["user_id"], created["category_id"] = seller.id, category.id
+
+        print_step(f"Build {ITEMS} NDJSON items, every {INVALID_EVERY}th one invalid")
+        ends_at = (datetime.utcnow() + timedelta(days=7)).isoformat() + "Z"
+        lines = []
+        for i in range(ITEMS):
+            item = {
+                "category_id": category.id,
+                "title": f"Bulk Product {suffix}-{i}",
+                "starting_price": "10.00",
+                "auction_end_at": ends_at,
+                "images": [
+                    {"image_url": f"https://example.com/{i}/{n}.jpg", "position": n} for n in range(2)
+                ] if i % 10 == 0 else [],
+            }
+            if i % INVALID_EVERY == 1:
+                item["starting_price"] = "-1"
+            elif i % INVALID_EVERY == 2:
+                item["category_id"] = 0
+            lines.append(json.dumps(item).encode())
+        lines.append(b"{not json")
+        invalid = {i for i in range(ITEMS) if i % INVALID_EVERY in (1, 2)} | {ITEMS}
+
+        print_step("Import")
+        response = import_products(db, seller.id, [parse_bulk_item(line, from_json=True) for line in lines])
+        print(f"[INFO] created={response.created} failed={response.failed} "
+              f"in {response.elapsed_ms:.0f}ms -> {response.rows_per_second:.0f} rows/s")
+
+        print_step("Verify per-row results")
+        assert response.created == ITEMS - len(invalid) + 1
+        assert response.failed == len(invalid)
+        for result in response.results:
+            if result.index in invalid:
+                assert result.id is None and result.errors, result
+            else:
+                assert result.id is not None and not result.errors, result
+        assert any("starting_price" in error for error in response.results[1].errors)
+        assert "category_id: Category not found" in response.results[2].errors
+
+        print_step("Verify products and images were stored")
+        product_count = db.query(func.count(Product.id)).filter(Product.seller_id == seller.id).scalar()
+        assert product_count == response.created
+        image_count = (
+            db.query(func.count(ProductImage.id))
+            .join(Product, Product.id == ProductImage.product_id)
+            .filter(Product.seller_id == seller.id)
+            .scalar()
+        )
+        assert image_count == 2 * len([i for i in range(0, ITEMS, 10) if i not in invalid])
+        first = db.get(Product, response.results[0].id)
+        assert first.title == f"Bulk Product {suffix}-0" and len(first.images) == 2
+
+        print_step("Bulk import test completed successfully")
+    finally:
+        print_step("Cleaning up bulk import test data")
+        db.rollback()
+        if created["user_id"]:
+            product_ids = db.query(Product.id).filter(Product.seller_id == created["user_id"])
+            db.query(ProductImage).filter(ProductImage.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.seller_id == created["user_id"]).delete(synchronize_session=False)
+            db.query(User).filter(User.id == created["user_id"]).delete(synchronize_session=False)
+        if created["category_id"]:
+            db.query(Category).filter(Category.id == created["category_id"]).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
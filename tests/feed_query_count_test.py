@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import event
+
+from app.api.bids import compute_auction_summaries
+from app.api.products import enrich_products_with_details
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models import Bid, Category, Favorite, Product, ProductImage, ProductStatus, User
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+@contextmanager
+def count_queries():
+    counter = {"count": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter["count"] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def main() -> None:
+    db = SessionLocal()
+    created = {
+        "product_ids": [],
+        "category_id": None,
+        "buyer_id": None,
+        "seller_id": None,
+    }
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller and buyer for enrichment query count test")
+        seller = User(
+            email=f"enrich_seller_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Enrichment Seller",
+            phone_number="+1-555-6661",
+        )
+        buyer = User(
+            email=f"enrich_buyer_{suffix}@bidbay.com",
+            password_hash=get_password_hash("password123"),
+            full_name="Enrichment Buyer",
+            phone_number="+1-555-6662",
+        )
+        db.add_all([seller, buyer])
+        db.commit()
+        created["seller_id"] = seller.id
+        created["buyer_id"] = buyer.id
+
+        print_step("Create 50 products with images, bids and favorites")
+        category = Category(name=f"Enrichment Category {suffix}")
+        db.add(category)
+        db.commit()
+        created["category_id"] = category.id
+
+        products = []
+        for i in range(50):
+            product = Product(
+                seller_id=seller.id,
+                category_id=category.id,
+                title=f"Enrichment Product {suffix}-{i}",
+                starting_price=Decimal("10.00"),
+                min_increment=Decimal("1.00"),
+                auction_end_at=datetime.utcnow() + timedelta(days=1),
+                status=ProductStatus.ACTIVE,
+            )
+            db.add(product)
+            products.append(product)
+        db.flush()
+        created["product_ids"] = [p.id for p in products]
+
+        for i, product in enumerate(products):
+            db.add(ProductImage(product_id=product.id, image_url="https://placehold.co/600x400", position=0))
+            db.add(Bid(product_id=product.id, bidder_id=buyer.id, amount=Decimal("10.00") + i))
+            if i % 2 == 0:
+                db.add(Favorite(user_id=buyer.id, product_id=product.id))
+        db.flush()
+        # Bids were inserted directly, so bring the denormalized auction summary up to date
+        summaries = compute_auction_summaries(db, created["product_ids"])
+        for product in products:
+            for field, value in summaries[product.id].items():
+                setattr(product, field, value)
+        db.commit()
+
+        print_step("Count queries for 5 products vs 50 products")
+        small = db.query(Product).filter(Product.id.in_(created["product_ids"][:5])).all()
+        with count_queries() as small_counter:
+            small_result = enrich_products_with_details(db, small, buyer.id)
+        db.expire_all()
+
+        large = db.query(Product).filter(Product.id.in_(created["product_ids"])).all()
+        with count_queries() as large_counter:
+            large_result = enrich_products_with_details(db, large, buyer.id)
+        print(f"[INFO] 5 products: {small_counter['count']} queries, 50 products: {large_counter['count']} queries")
+
+        assert len(small_result) == 5
+        assert len(large_result) == 50
+        assert small_counter["count"] == large_counter["count"]
+        assert all(p["bid_count"] == 1 and len(p["images"]) == 1 for p in large_result)
+        assert all(p["highest_bid"] == p["starting_price"] + i for i, p in enumerate(
+            sorted(large_result, key=lambda p: p["id"])
+        ))
+        assert sum(1 for p in large_result if p["is_favorited"]) == 25
+
+        print_step("Enrichment query count test completed successfully")
+    finally:
+        print_step("Cleaning up enrichment test data")
+        db.rollback()
+        product_ids = created["product_ids"]
+        if product_ids:
+            db.query(Favorite).filter(Favorite.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(product_ids)).update(
+                {Product.highest_bid_id: None}, synchronize_session=False
+            )
+            db.query(Bid).filter(Bid.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(ProductImage).filter(ProductImage.product_id.in_(product_ids)).delete(synchronize_session=False)
+            db.query(Product).filter(Product.id.in_(product_ids)).delete(synchronize_session=False)
+        if created.get("category_id"):
+            db.query(Category).filter(Category.id == created["category_id"]).delete()
+        if created.get("buyer_id"):
+            db.query(User).filter(User.id == created["buyer_id"]).delete()
+        if created.get("seller_id"):
+            db.query(User).filter(User.id == created["seller_id"]).delete()
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
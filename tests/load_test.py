@@ -0,0 +1,123 @@
+"""
+HTTP load test for comparing DB_MODE=sync and DB_MODE=async.
+
+Logs in as a seeded user and has CONCURRENCY clients hit the hot read
+endpoints for DURATION seconds, then reports requests/s and latency
+percentiles per endpoint. Run it once against a server started with each
+mode and compare the two reports.
+
+Usage:
+    cd BidBay
+    DB_MODE=sync uvicorn app.main:app --port 8000     # then, in another shell:
+    python tests/load_test.py --concurrency 300 --duration 30 --label sync
+    DB_MODE=async uvicorn app.main:app --port 8000
+    python tests/load_test.py --concurrency 300 --duration 30 --label async
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from collections import defaultdict
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/products/?limit=20",
+    "/products/feed?limit=20",
+    "/categories/",
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def worker(client: httpx.AsyncClient, paths: list[str], offset: int, deadline: float, results: dict) -> None:
+    i = offset
+    while time.perf_counter() < deadline:
+        path = paths[i % len(paths)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - started
+        results[path]["latencies"].append(elapsed)
+        if not ok:
+            results[path]["errors"] += 1
+
+
+async def run(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        token = await login(client, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        results: dict = defaultdict(lambda: {"latencies": [], "errors": 0})
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            worker(client, args.paths, i, deadline, results) for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    report = {"label": args.label, "concurrency": args.concurrency, "duration": round(elapsed, 2), "endpoints": {}}
+    everything: list[float] = []
+    errors = 0
+    for path, result in results.items():
+        latencies = result["latencies"]
+        everything.extend(latencies)
+        errors += result["errors"]
+        report["endpoints"][path] = summarize(latencies, result["errors"], elapsed)
+    report["total"] = summarize(everything, errors, elapsed)
+    return report
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    if not latencies:
+        return {"requests": 0, "errors": errors}
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "max_ms": round(max(latencies) * 1000, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=300)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--email", default="user1@bidbay.com")
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--label", default="", help="Name of the run in the report, e.g. sync or async")
+    parser.add_argument("--path", dest="paths", action="append", help="Endpoint to hit (repeatable)")
+    args = parser.parse_args()
+    args.paths = args.paths or DEFAULT_PATHS
+
+    report = asyncio.run(run(args))
+    total = report["total"]
+    print(f"[INFO] {args.label or 'run'}: {total.get('rps', 0)} req/s, "
+          f"p50={total.get('p50_ms')}ms p99={total.get('p99_ms')}ms errors={total['errors']}")
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Login storm benchmark.
+
+Measures how many logins per second the API sustains and what a storm of
+them does to unrelated requests: a prober polls GET /categories/ before and
+during the storm, and the report compares its latency. Half of the users get
+a hash made with a lower bcrypt cost than PASSWORD_HASH_ROUNDS, and the test
+checks that logging in upgraded them.
+
+Usage:
+    cd BidBay
+    python tests/login_benchmark.py
+    PASSWORD_HASH_WORKERS=2 python tests/login_benchmark.py --concurrency 50 --duration 20
+    python tests/login_benchmark.py --base-url http://localhost:8000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import datetime
+from pathlib import Path
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import bcrypt
+import httpx
+
+from app.core import database
+from app.core.config import settings
+from app.core.security import get_password_hash, password_needs_rehash
+from app.models import User
+
+PASSWORD = "password123"
+PROBE_PATH = "/categories/"
+PROBE_INTERVAL = 0.01
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def describe(label: str, latencies: list[float], errors: int = 0) -> None:
+    if not latencies:
+        print(f"  {label:<32} no samples")
+        return
+    print(f"  {label:<32} n={len(latencies):<6} err={errors:<4} "
+          f"p50={statistics.median(latencies) * 1000:8.2f}ms p99={percentile(latencies, 99) * 1000:8.2f}ms")
+
+
+def create_users(db, suffix: int, count: int) -> list[str]:
+    current = get_password_hash(PASSWORD)
+    legacy_rounds = max(4, settings.PASSWORD_HASH_ROUNDS - 2)
+    legacy = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(legacy_rounds)).decode("utf-8")
+    users = [
+        User(
+            email=f"login_bench_{suffix}_{i}@bidbay.com",
+            password_hash=legacy if i % 2 else current,
+            full_name=f"Login Bench {i}",
+        )
+        for i in range(count)
+    ]
+    db.add_all(users)
+    db.commit()
+    return [user.email for user in users]
+
+
+async def probe(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list[float]) -> int:
+    """Poll an unrelated endpoint until ``stop`` is set; return the number of errors."""
+    errors = 0
+    while not stop.is_set():
+        started = time.perf_counter()
+        try:
+            response = await client.get(PROBE_PATH)
+            if response.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+        await asyncio.sleep(PROBE_INTERVAL)
+    return errors
+
+
+async def login_loop(client: httpx.AsyncClient, emails: list[str], offset: int, deadline: float,
+                     latencies: list[float]) -> int:
+    errors = 0
+    i = offset
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/auth/login", data={"username": emails[i % len(emails)], "password": PASSWORD})
+            if response.status_code != 200:
+                errors += 1
+        except httpx.HTTPError:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+        i += 1
+    return errors
+
+
+async def run(args: argparse.Namespace, emails: list[str]) -> None:
+    if args.base_url:
+        transport, base_url = None, args.base_url
+    else:
+        from app.main import app
+
+        transport, base_url = httpx.ASGITransport(app=app), "http://benchmark"
+    limits = httpx.Limits(max_connections=args.concurrency + 1, max_keepalive_connections=args.concurrency + 1)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, limits=limits, timeout=args.timeout) as client:
+        print_step(f"Probe {PROBE_PATH} for {args.warmup}s without load")
+        idle: list[float] = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, stop, idle))
+        await asyncio.sleep(args.warmup)
+        stop.set()
+        idle_errors = await prober
+
+        print_step(f"Login storm: {args.concurrency} clients for {args.duration}s")
+        during: list[float] = []
+        logins: list[float] = []
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe(client, stop, during))
+        started = time.perf_counter()
+        deadline = started + args.duration
+        login_errors = sum(await asyncio.gather(*(
+            login_loop(client, emails, i, deadline, logins) for i in range(args.concurrency)
+        )))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        storm_errors = await prober
+
+    print(f"\n  bcrypt cost {settings.PASSWORD_HASH_ROUNDS}, {settings.PASSWORD_HASH_WORKERS} hashing threads"
+          f" ({args.base_url or 'in-process'})")
+    print(f"  logins/s {len(logins) / elapsed:.1f}")
+    describe("POST /auth/login", logins, login_errors)
+    describe(f"GET {PROBE_PATH} (idle)", idle, idle_errors)
+    describe(f"GET {PROBE_PATH} (during storm)", during, storm_errors)
+    print()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Benchmark a running server instead of the in-process app")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds of login storm")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds of probing before the storm")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    db = database.SessionLocal()
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step(f"Create {args.users} users (every other one with a legacy bcrypt cost)")
+        emails = create_users(db, suffix, args.users)
+
+        asyncio.run(run(args, emails))
+
+        print_step("Check that legacy hashes were upgraded on login")
+        db.expire_all()
+        stale = [
+            user.email for user in db.query(User).filter(User.email.in_(emails))
+            if password_needs_rehash(user.password_hash)
+        ]
+        assert not stale, f"{len(stale)} users still have a legacy hash: {stale[:3]}"
+        print("[INFO] All hashes use the current cost")
+    finally:
+        print_step("Cleaning up benchmark data")
+        db.rollback()
+        db.query(User).filter(User.email.like(f"login_bench_{suffix}_%@bidbay.com")).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
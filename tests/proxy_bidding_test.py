@@ -0,0 +1,206 @@
+"""
+Proxy bidding (maximum bid) engine test.
+
+Walks one auction through competing proxies, a manual bid answered by a proxy
+and a tie between equal maximums, then checks that raising a maximum to a
+rival's does not win the tie, checking price, leader and the denormalized
+summary after every step. Then registers many proxies on a second product and
+checks that resolving them costs the same number of queries and at most two
+bid rows, however many proxies compete.
+
+Usage:
+    cd BidBay
+    python tests/proxy_bidding_test.py
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+import random
+import sys
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.api.bids import compute_auction_summaries, leading_bidder_id, place_proxy_bid, submit_bid
+from app.api.deps import Principal
+from app.core.database import SessionLocal, engine
+from app.core.security import get_password_hash
+from app.models import Bid, BidStatus, Category, Product, ProductStatus, ProxyBid, User
+from app.schemas import ProxyBidCreate
+
+STORM_PROXIES = 200
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+@contextmanager
+def count_queries():
+    counter = [0]
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter[0] += 1
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def principal(user: User) -> Principal:
+    return Principal(id=user.id, email=user.email, full_name=user.full_name)
+
+
+def proxy(db, user: User, product: Product, max_amount: str):
+    return place_proxy_bid(ProxyBidCreate(product_id=product.id, max_amount=Decimal(max_amount)), db, principal(user))
+
+
+def check_state(db, product: Product, price: str, leader: User, bid_count: int) -> None:
+    db.expire_all()
+    assert product.current_price == Decimal(price), f"price {product.current_price}, expected {price}"
+    assert leading_bidder_id(db, product) == leader.id, f"leader {leading_bidder_id(db, product)}, expected {leader.id}"
+    assert product.bid_count == bid_count, f"bid_count {product.bid_count}, expected {bid_count}"
+    pending = db.query(Bid).filter(Bid.product_id == product.id, Bid.status == BidStatus.PENDING).all()
+    assert [bid.id for bid in pending] == [product.highest_bid_id], "only the leading bid may be PENDING"
+    summary = compute_auction_summaries(db, [product.id])[product.id]
+    for field in ("current_price", "bid_count", "highest_bid_id"):
+        assert summary[field] == getattr(product, field), f"{field}: summary {summary[field]} != {getattr(product, field)}"
+    print(f"[INFO] price {product.current_price}, leader {leader.full_name}, {product.bid_count} bids")
+
+
+def make_product(db, seller: User, category: Category, title: str) -> Product:
+    product = Product(
+        seller_id=seller.id,
+        category_id=category.id,
+        title=title,
+        starting_price=Decimal("10.00"),
+        min_increment=Decimal("1.00"),
+        auction_end_at=datetime.utcnow() + timedelta(days=1),
+        status=ProductStatus.ACTIVE,
+    )
+    db.add(product)
+    db.commit()
+    return product
+
+
+def main() -> None:
+    db = SessionLocal()
+    suffix = int(datetime.utcnow().timestamp())
+    try:
+        print_step("Create seller, bidders, category and products")
+        password_hash = get_password_hash("password123")
+        seller = User(email=f"proxy_seller_{suffix}@bidbay.com", password_hash=password_hash, full_name="Proxy Seller")
+        bidders = [
+            User(email=f"proxy_bidder_{suffix}_{i}@bidbay.com", password_hash=password_hash, full_name=f"Bidder {name}")
+            for i, name in enumerate("ABCDE")
+        ]
+        category = Category(name=f"Proxy Category {suffix}")
+        db.add_all([seller, *bidders, category])
+        db.commit()
+        a, b, c, d, e = bidders
+        product = make_product(db, seller, category, f"Proxy Product {suffix}")
+
+        print_step("A sets a maximum of 50: bids the starting price")
+        response = proxy(db, a, product, "50")
+        assert response.is_leading
+        check_state(db, product, "10.00", a, 1)
+
+        print_step("B sets 30: B is recorded at 30, A answers at 31")
+        response = proxy(db, b, product, "30")
+        assert not response.is_leading
+        check_state(db, product, "31.00", a, 3)
+
+        print_step("C sets 100: A is recorded at 50, C leads at 51")
+        proxy(db, c, product, "100")
+        check_state(db, product, "51.00", c, 5)
+
+        print_step("D bids 60 by hand: C's proxy answers at 61")
+        manual = submit_bid(db, product.id, d.id, Decimal("60.00"))
+        assert manual.status == BidStatus.OUTBID, manual.status
+        check_state(db, product, "61.00", c, 7)
+
+        print_step("E sets 100 too: the earlier maximum wins the tie at 100")
+        proxy(db, e, product, "100")
+        check_state(db, product, "100.00", c, 9)
+
+        print_step("D bids 101 by hand: no proxy can go higher")
+        submit_bid(db, product.id, d.id, Decimal("101.00"))
+        check_state(db, product, "101.00", d, 10)
+
+        print_step("A cannot lower its maximum")
+        try:
+            proxy(db, a, product, "40")
+        except HTTPException as exc:
+            print(f"[INFO] Rejected: {exc.detail}")
+        else:
+            raise AssertionError("lowering a maximum must be rejected")
+        db.rollback()
+
+        print_step("A sets 50, B sets 100, A raises to 100: B reached 100 first and keeps the lead")
+        rematch = make_product(db, seller, category, f"Proxy Rematch {suffix}")
+        proxy(db, a, rematch, "50")
+        proxy(db, b, rematch, "100")
+        check_state(db, rematch, "51.00", b, 3)
+        response = proxy(db, a, rematch, "100")
+        assert not response.is_leading
+        check_state(db, rematch, "100.00", b, 5)
+
+        print_step(f"Register {STORM_PROXIES} competing proxies on another product")
+        storm = make_product(db, seller, category, f"Proxy Storm {suffix}")
+        storm_bidders = [
+            User(email=f"proxy_storm_{suffix}_{i}@bidbay.com", password_hash=password_hash, full_name=f"Storm {i}")
+            for i in range(STORM_PROXIES)
+        ]
+        db.add_all(storm_bidders)
+        db.commit()
+        submit_bid(db, storm.id, c.id, Decimal("10.00"))
+        # Proxies placed straight into the table, as if registered earlier without competition
+        rng = random.Random(suffix)
+        db.add_all(
+            ProxyBid(product_id=storm.id, bidder_id=user.id, max_amount=Decimal(rng.randint(20, 5000)))
+            for user in storm_bidders[:10]
+        )
+        db.commit()
+        with count_queries() as few:
+            proxy(db, a, storm, "5001")
+        db.add_all(
+            ProxyBid(product_id=storm.id, bidder_id=user.id, max_amount=Decimal(rng.randint(20, 5000)))
+            for user in storm_bidders[10:]
+        )
+        db.commit()
+        with count_queries() as many:
+            proxy(db, b, storm, "6000")
+        print(f"[INFO] Queries to resolve: {few[0]} with 11 proxies, {many[0]} with {STORM_PROXIES + 2}")
+        assert few[0] == many[0], "resolving must not depend on the number of proxies"
+
+        db.expire_all()
+        top_max = max(p.max_amount for p in db.query(ProxyBid).filter(ProxyBid.product_id == storm.id,
+                                                                      ProxyBid.bidder_id != b.id))
+        check_state(db, storm, str(top_max + 1), b, 5)
+        print("[INFO] Proxy bidding OK")
+    finally:
+        print_step("Cleaning up test data")
+        db.rollback()
+        users = db.query(User.id).filter(User.email.like(f"proxy_%_{suffix}%@bidbay.com"))
+        products = db.query(Product.id).filter(Product.seller_id.in_(users))
+        db.query(ProxyBid).filter(ProxyBid.product_id.in_(products)).delete(synchronize_session=False)
+        db.query(Product).filter(Product.id.in_(products)).update({Product.highest_bid_id: None}, synchronize_session=False)
+        db.query(Bid).filter(Bid.product_id.in_(products)).delete(synchronize_session=False)
+        db.query(Product).filter(Product.id.in_(products)).delete(synchronize_session=False)
+        db.query(Category).filter(Category.name == f"Proxy Category {suffix}").delete(synchronize_session=False)
+        db.query(User).filter(User.id.in_(users)).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
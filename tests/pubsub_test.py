@@ -0,0 +1,80 @@
+"""
+Pub/sub hub test with the in-process broker.
+
+Checks topic fan-out, publishing from other threads, the bounded per-subscriber
+queue (oldest events are dropped) and unsubscribing.
+
+Usage:
+    cd BidBay
+    python tests/pubsub_test.py
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+import sys
+import threading
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "pubsub-test")
+
+from app.core.pubsub import LocalBroker, PubSubHub
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+async def drain(subscription, count: int) -> list[dict]:
+    return [await asyncio.wait_for(subscription.get(), 1) for _ in range(count)]
+
+
+async def run() -> None:
+    hub = PubSubHub(LocalBroker(), queue_size=3)
+    hub.start()
+
+    print_step("Fan out to every subscriber of a topic, and only that topic")
+    first = hub.subscribe("product:1")
+    second = hub.subscribe("product:1")
+    other = hub.subscribe("product:2")
+    hub.publish("product:1", {"bid_count": 1})
+    assert await drain(first, 1) == [{"bid_count": 1}]
+    assert await drain(second, 1) == [{"bid_count": 1}]
+    await asyncio.sleep(0.05)
+    assert other._queue.empty()
+
+    print_step("Publish from worker threads")
+    threads = [threading.Thread(target=hub.publish, args=("product:2", {"bid_count": i})) for i in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    received = await drain(other, 3)
+    assert sorted(e["bid_count"] for e in received) == [0, 1, 2]
+
+    print_step("Slow consumer keeps only the newest events")
+    for i in range(10):
+        hub.publish("product:1", {"bid_count": i})
+    await asyncio.sleep(0.05)
+    assert await drain(first, 3) == [{"bid_count": 7}, {"bid_count": 8}, {"bid_count": 9}]
+    assert first.dropped == 7
+
+    print_step("Unsubscribed listeners get nothing")
+    for subscription in (first, second, other):
+        hub.unsubscribe(subscription)
+    hub.publish("product:1", {"bid_count": 99})
+    await asyncio.sleep(0.05)
+    assert first._queue.empty()
+    assert hub.stats()["subscribers"] == 0
+
+    hub.stop()
+    print_step("Pub/sub test completed successfully")
+
+
+if __name__ == "__main__":
+    asyncio.run(run())
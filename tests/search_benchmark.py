@@ -0,0 +1,164 @@
+"""
+Product search benchmark: the old ``title ILIKE '%q%'`` filter vs app.core.search.
+
+Grows a dedicated benchmark category to each requested size, then runs the same
+set of queries through both paths and reports p50/p95 latency. The FULLTEXT
+path needs MySQL with the ``ft_products_title_description`` index (alembic
+upgrade head); on other databases the portable LIKE backend is measured instead.
+
+Usage:
+    cd BidBay
+    python tests/search_benchmark.py --sizes 100000 1000000
+    python tests/search_benchmark.py --sizes 100000 --cleanup    # drop the rows afterwards
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+import random
+import statistics
+import sys
+import time
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import func, insert
+
+from app.api.products import product_search
+from app.core.database import SessionLocal
+from app.core.search import parse_query
+from app.core.security import get_password_hash
+from app.models import Category, Product, ProductStatus, User
+
+CATEGORY_NAME = "Search Benchmark"
+SELLER_EMAIL = "search_benchmark@bidbay.com"
+BATCH_SIZE = 10_000
+RESULT_LIMIT = 50
+QUERIES = ["lamp", "vintage", "brass lamp", "leather", "oak table", "camera lens", "walnut", "ceramic vase"]
+
+ADJECTIVES = ["vintage", "brass", "leather", "oak", "walnut", "ceramic", "modern", "antique", "handmade", "rustic",
+              "compact", "wireless", "signed", "rare", "restored", "painted", "carved", "folding", "silver", "copper"]
+NOUNS = ["lamp", "table", "chair", "camera", "lens", "vase", "clock", "mirror", "guitar", "watch",
+         "bicycle", "desk", "radio", "print", "bowl", "jacket", "bag", "record", "speaker", "rug"]
+FILLER = ["in good condition", "from an estate sale", "with original box", "minor wear", "ships insured",
+          "collector item", "fully working", "some scratches", "recently serviced", "local pickup only"]
+
+
+def print_step(message: str) -> None:
+    print(f"[STEP] {message}")
+
+
+def fake_product(rng: random.Random, seller_id: int, category_id: int, ends_at: datetime) -> dict:
+    title = " ".join([rng.choice(ADJECTIVES), rng.choice(ADJECTIVES), rng.choice(NOUNS)]).title()
+    description = ", ".join(rng.sample(FILLER, 3)) + f". {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}."
+    return {
+        "seller_id": seller_id,
+        "category_id": category_id,
+        "title": title,
+        "description": description,
+        "starting_price": rng.randint(5, 500),
+        "min_increment": 1,
+        "auction_end_at": ends_at,
+        "status": ProductStatus.ACTIVE,
+    }
+
+
+def ensure_fixtures(db) -> tuple[int, int]:
+    seller = db.query(User).filter(User.email == SELLER_EMAIL).first()
+    if seller is None:
+        seller = User(email=SELLER_EMAIL, password_hash=get_password_hash("password123"), full_name="Search Benchmark")
+        db.add(seller)
+    category = db.query(Category).filter(Category.name == CATEGORY_NAME).first()
+    if category is None:
+        category = Category(name=CATEGORY_NAME)
+        db.add(category)
+    db.commit()
+    return seller.id, category.id
+
+
+def grow_to(db, size: int, seller_id: int, category_id: int) -> None:
+    existing = db.query(func.count(Product.id)).filter(Product.category_id == category_id).scalar()
+    rng = random.Random(existing)
+    ends_at = datetime.utcnow() + timedelta(days=30)
+    started = time.perf_counter()
+    while existing < size:
+        batch = min(BATCH_SIZE, size - existing)
+        db.execute(insert(Product), [fake_product(rng, seller_id, category_id, ends_at) for _ in range(batch)])
+        db.commit()
+        existing += batch
+    print(f"[INFO] {existing} benchmark products ready ({time.perf_counter() - started:.1f}s spent inserting)")
+
+
+def ilike_query(db, q: str, category_id: int):
+    # The previous list_products/get_feed filter
+    return (
+        db.query(Product.id)
+        .filter(Product.category_id == category_id, Product.title.ilike(f"%{q}%"))
+        .order_by(Product.created_at.desc(), Product.id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def search_query(db, q: str, category_id: int):
+    terms = parse_query(q)
+    relevance = product_search.relevance(terms)
+    return (
+        db.query(Product.id, relevance.label("relevance"))
+        .filter(Product.category_id == category_id, product_search.condition(terms))
+        .order_by(relevance.desc(), Product.id.desc())
+        .limit(RESULT_LIMIT)
+    )
+
+
+def measure(db, build, category_id: int, rounds: int) -> dict:
+    latencies = []
+    hits = 0
+    for _ in range(rounds):
+        for q in QUERIES:
+            started = time.perf_counter()
+            hits += len(build(db, q, category_id).all())
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "hits": hits // rounds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--cleanup", action="store_true", help="Delete the benchmark products when done")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    category_id = None
+    try:
+        seller_id, category_id = ensure_fixtures(db)
+        print_step(f"Search backend: {type(product_search).__name__}")
+        for size in sorted(args.sizes):
+            print_step(f"Grow benchmark catalog to {size} products")
+            grow_to(db, size, seller_id, category_id)
+            for name, build in [("ilike", ilike_query), ("search", search_query)]:
+                measure(db, build, category_id, 1)  # warm up caches
+                result = measure(db, build, category_id, args.rounds)
+                print(f"[INFO] size={size} path={name:<6} p50={result['p50_ms']:.2f}ms "
+                      f"p95={result['p95_ms']:.2f}ms rows/query-set={result['hits']}")
+    finally:
+        if args.cleanup and category_id is not None:
+            print_step("Cleaning up benchmark products")
+            db.rollback()
+            db.query(Product).filter(Product.category_id == category_id).delete(synchronize_session=False)
+            db.query(Category).filter(Category.id == category_id).delete(synchronize_session=False)
+            db.query(User).filter(User.email == SELLER_EMAIL).delete(synchronize_session=False)
+            db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()